@@ -9,9 +9,23 @@ from config.utils import prepare_headers
 
 AUTH_SERVICE_URL = settings.AUTH_SERVICE_URL
 
+access_verifier = None
+if settings.AUTH_MODE == 'local':
+    from auth_client import AccessFeed, AccessVerifier, InvalidTokenError
+
+    access_verifier = AccessVerifier(settings.AUTH_JWT_SECRET_KEY, settings.AUTH_JWT_ALGORITHM,
+                                     settings.AUTH_MAX_STALENESS, settings.AUTH_SNAPSHOT_SECRET_KEY)
+    AccessFeed(access_verifier, AUTH_SERVICE_URL, settings.AUTH_FEED_TOKEN).start_thread(settings.AUTH_REFRESH_INTERVAL)
+
 
 def check_permission(request: HttpRequest, access_token: str, resource: str, http_method: str) -> bool:
     """Проверяет разрешение пользователя через auth-сервис."""
+    if access_verifier is not None and access_verifier.ready:
+        try:
+            return access_verifier.check_permission(access_token, resource, http_method)
+        except InvalidTokenError:
+            return False
+
     response = requests.get(
         f'{AUTH_SERVICE_URL}/users/check-permission',
         params={'resource': resource, 'http_method': http_method},
@@ -144,4 +144,12 @@ REST_FRAMEWORK = {
 AUTHENTICATION_BACKENDS = ['config.authentication.auth_backend.AuthServiceBackend',]
 
 AUTH_SERVICE_URL = os.getenv('AUTH_SERVICE_URL', 'http://auth_service:8001/api/v1/auth')
+AUTH_MODE = os.getenv('AUTH_MODE', 'remote')
+AUTH_JWT_SECRET_KEY = os.getenv('AUTH_JWT_SECRET_KEY', '')
+AUTH_JWT_ALGORITHM = os.getenv('AUTH_JWT_ALGORITHM', 'HS256')
+AUTH_SNAPSHOT_SECRET_KEY = os.getenv('AUTH_SNAPSHOT_SECRET_KEY', '')
+AUTH_FEED_TOKEN = os.getenv('AUTH_FEED_TOKEN', '')
+AUTH_REFRESH_INTERVAL = float(os.getenv('AUTH_REFRESH_INTERVAL', 5))
+AUTH_MAX_STALENESS = float(os.getenv('AUTH_MAX_STALENESS', 60))
+CONTENT_CHANGES_CHANNEL = os.getenv('CONTENT_CHANGES_CHANNEL', 'content_changes')
 NOTIFICATION_SERVICE_URL = os.getenv('NOTIFICATION_SERVICE_URL', 'http://notifications_service:8004/api/v1/')
@@ -0,0 +1,25 @@
+import json
+
+from django.conf import settings
+from django.db import connections
+from django.db.models.signals import post_delete, post_save
+
+from movies.models import FilmWork, Genre, GenreFilmWork, Person, PersonFilmWork
+
+CONTENT_MODELS = (FilmWork, Genre, Person, GenreFilmWork, PersonFilmWork)
+
+
+def notify_content_change(sender, instance, using, **kwargs):
+    """Tell the ETL that content changed so it syncs the indexes right away.
+
+    NOTIFY is transactional: the event is delivered on commit, dropped on rollback,
+    and identical events raised inside one transaction (e.g. inline saves) arrive once.
+    """
+    payload = json.dumps({'table': sender._meta.db_table.rsplit('"."', 1)[-1], 'id': str(instance.pk)})
+    with connections[using].cursor() as cursor:
+        cursor.execute('SELECT pg_notify(%s, %s)', [settings.CONTENT_CHANGES_CHANNEL, payload])
+
+
+for model in CONTENT_MODELS:
+    post_save.connect(notify_content_change, sender=model, dispatch_uid=f'notify_{model.__name__}_save')
+    post_delete.connect(notify_content_change, sender=model, dispatch_uid=f'notify_{model.__name__}_delete')
@@ -0,0 +1,4 @@
+from auth_client.feed import AccessFeed
+from auth_client.verifier import AccessVerifier, InvalidSnapshotError, InvalidTokenError
+
+__all__ = ['AccessFeed', 'AccessVerifier', 'InvalidSnapshotError', 'InvalidTokenError']
@@ -0,0 +1,81 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+import uuid
+from urllib.parse import urlencode
+from urllib.request import Request, urlopen
+
+from auth_client.verifier import AccessVerifier, InvalidSnapshotError
+
+logger = logging.getLogger(__name__)
+
+
+class AccessFeed:
+    """
+    Keeps an AccessVerifier in sync with auth_service: reloads the snapshot when its version moves
+    and reads the blacklist feed from the last cursor. Revocations reach the verifier within one refresh interval.
+    """
+    BLACKLIST_PAGE_SIZE = 1000
+    REFRESH_ERRORS = (OSError, ValueError, KeyError, InvalidSnapshotError)
+
+    def __init__(self, verifier: AccessVerifier, auth_service_url: str, service_token: str, timeout: float = 5.0):
+        self.verifier = verifier
+        self.auth_service_url = auth_service_url.rstrip('/')
+        self.service_token = service_token
+        self.timeout = timeout
+
+    def refresh(self) -> None:
+        response = self._get('/access/snapshot', {'version': self.verifier.version} if self.verifier.ready else {})
+        if response['snapshot']:
+            self.verifier.load_snapshot(response['snapshot'])
+
+        while True:
+            response = self._get(
+                '/access/blacklist', {'since': self.verifier.cursor, 'count': self.BLACKLIST_PAGE_SIZE}
+            )
+            self.verifier.apply_blacklist(response['entries'], response['cursor'])
+            if len(response['entries']) < self.BLACKLIST_PAGE_SIZE:
+                break
+
+        self.verifier.mark_refreshed()
+
+    async def run(self, interval: float) -> None:
+        """
+        Refresh forever from an asyncio application, the blocking HTTP calls run in a worker thread.
+        """
+        while True:
+            try:
+                await asyncio.to_thread(self.refresh)
+            except self.REFRESH_ERRORS as e:
+                logger.warning('Failed to refresh access snapshot: %s', e)
+            await asyncio.sleep(interval)
+
+    def start_thread(self, interval: float) -> threading.Thread:
+        """
+        Refresh forever from a daemon thread, for WSGI applications.
+        """
+        def loop() -> None:
+            while True:
+                try:
+                    self.refresh()
+                except self.REFRESH_ERRORS as e:
+                    logger.warning('Failed to refresh access snapshot: %s', e)
+                time.sleep(interval)
+
+        thread = threading.Thread(target=loop, name='access-feed', daemon=True)
+        thread.start()
+        return thread
+
+    def _get(self, path: str, params: dict) -> dict:
+        url = f'{self.auth_service_url}{path}'
+        if params:
+            url = f'{url}?{urlencode(params)}'
+        request = Request(url, headers={
+            'X-Request-Id': str(uuid.uuid4()),
+            'X-Service-Token': self.service_token,
+            'Accept': 'application/json',
+        })
+        with urlopen(request, timeout=self.timeout) as response:
+            return json.loads(response.read())
@@ -0,0 +1,86 @@
+import hashlib
+import time
+
+from jose import JWTError, jwt
+
+
+class InvalidTokenError(Exception):
+    pass
+
+
+class InvalidSnapshotError(Exception):
+    pass
+
+
+class AccessVerifier:
+    """
+    Checks permissions in-process with the same rules as auth_service /users/check-permission:
+    the access token signature, type and exp are verified locally, revoked tokens are looked up
+    in the blacklist feed and the token roles are matched against the signed role -> permissions snapshot.
+    The snapshot is signed with its own key, so it can not pass for an access token.
+    """
+    SNAPSHOT_TYPE = 'access_snapshot'
+    ACCESS_TOKEN_TYPE = 'access'
+
+    def __init__(self, secret_key: str, algorithm: str, max_staleness: float, snapshot_secret_key: str):
+        self.secret_key = secret_key
+        self.snapshot_secret_key = snapshot_secret_key
+        self.algorithm = algorithm
+        self.max_staleness = max_staleness
+        self.version: int | None = None
+        self.cursor = '0'
+        self.refreshed_at = 0.0
+        self._permissions: dict[str, frozenset[tuple[str, str]]] = {}
+        self._blacklist: dict[str, int] = {}
+
+    @property
+    def ready(self) -> bool:
+        """
+        Local decisions are only made while the snapshot and the blacklist are fresh enough,
+        otherwise the caller falls back to asking auth_service.
+        """
+        return self.version is not None and time.monotonic() - self.refreshed_at <= self.max_staleness
+
+    def load_snapshot(self, snapshot: str) -> None:
+        try:
+            claims = jwt.decode(snapshot, self.snapshot_secret_key, algorithms=[self.algorithm])
+        except JWTError as e:
+            raise InvalidSnapshotError('Access snapshot signature is invalid') from e
+        if claims.get('typ') != self.SNAPSHOT_TYPE:
+            raise InvalidSnapshotError('Token is not an access snapshot')
+
+        self._permissions = {
+            role: frozenset((resource, http_method) for resource, http_method in permissions)
+            for role, permissions in claims['roles'].items()
+        }
+        self.version = claims['ver']
+
+    def apply_blacklist(self, entries: list[dict], cursor: str) -> None:
+        now = time.time()
+        blacklist = {token_hash: exp for token_hash, exp in self._blacklist.items() if exp > now}
+        blacklist.update((entry['token_hash'], entry['exp']) for entry in entries if entry['exp'] > now)
+        self._blacklist = blacklist
+        self.cursor = cursor
+
+    def mark_refreshed(self) -> None:
+        self.refreshed_at = time.monotonic()
+
+    def verify_token(self, token: str) -> dict:
+        token = token.removeprefix('Bearer ')
+        try:
+            claims = jwt.decode(token, self.secret_key, algorithms=[self.algorithm], options={'require_exp': True})
+        except JWTError as e:
+            raise InvalidTokenError('Invalid token') from e
+        if claims.get('typ') != self.ACCESS_TOKEN_TYPE:
+            raise InvalidTokenError('Token is not an access token')
+        if hashlib.sha256(token.encode('utf-8')).hexdigest() in self._blacklist:
+            raise InvalidTokenError('Token has been revoked')
+        return claims
+
+    def check_permission(self, token: str, resource: str, http_method: str) -> bool:
+        claims = self.verify_token(token)
+        if claims.get('is_superuser'):
+            return True
+
+        permission = (resource, http_method)
+        return any(permission in self._permissions.get(role, ()) for role in claims.get('roles') or [])
@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends, Query
+
+from auth_service.src.core.security import is_internal_service
+from auth_service.src.models.dto.access import AccessSnapshotResponse, BlacklistFeedResponse
+from auth_service.src.services.access_snapshot import AccessSnapshotService, get_access_snapshot_service
+from auth_service.src.services.token import TokenService, get_token_service
+
+# the snapshot and the revoked token hashes are only served to services holding ACCESS_FEED_TOKEN
+router = APIRouter(dependencies=[Depends(is_internal_service)])
+
+
+@router.get('/snapshot', response_model=AccessSnapshotResponse)
+async def get_access_snapshot(
+        version: int | None = Query(None, description='Snapshot version already held by the caller'),
+        access_snapshot_service: AccessSnapshotService = Depends(get_access_snapshot_service)
+):
+    current_version = await access_snapshot_service.get_version()
+    if version == current_version:
+        return AccessSnapshotResponse(version=current_version)
+
+    snapshot = await access_snapshot_service.create_snapshot(current_version)
+    return AccessSnapshotResponse(version=current_version, snapshot=snapshot)
+
+
+@router.get('/blacklist', response_model=BlacklistFeedResponse)
+async def get_blacklist_feed(
+        since: str = Query('0', description='Cursor returned by the previous call, 0 to read from the start'),
+        count: int = Query(1000, gt=0, le=10000, description='Maximum number of entries to return'),
+        token_service: TokenService = Depends(get_token_service)
+):
+    entries, cursor = await token_service.get_blacklist_feed(since, count)
+    return BlacklistFeedResponse(cursor=cursor, entries=entries)
@@ -6,6 +6,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from auth_service.src.core.security import has_permission
 from auth_service.src.models.dto.common import BaseResponse, Messages, ErrorMessages, paginated_response, Pagination
 from auth_service.src.models.dto.permission import PermissionCreate, PermissionDto, PermissionUpdate
+from auth_service.src.services.access_snapshot import AccessSnapshotService, get_access_snapshot_service
 from auth_service.src.services.permission import PermissionService, get_permission_service
 
 router = APIRouter(dependencies=[Depends(has_permission)])
@@ -24,9 +25,12 @@ async def get_roles(
 @router.post('/', response_model=PermissionDto)
 async def create_permission(
         permission_create: PermissionCreate,
-        permission_service: PermissionService = Depends(get_permission_service)
+        permission_service: PermissionService = Depends(get_permission_service),
+        access_snapshot_service: AccessSnapshotService = Depends(get_access_snapshot_service)
 ):
-    return await permission_service.create(permission_create)
+    permission = await permission_service.create(permission_create)
+    await access_snapshot_service.bump_version()
+    return permission
 
 
 @router.get('/{permission_id}', response_model=PermissionDto)
@@ -46,16 +50,21 @@ async def get_permission(
 async def update_permission(
         permission_id: UUID,
         permission_dto: PermissionCreate,
-        permission_service: PermissionService = Depends(get_permission_service)
+        permission_service: PermissionService = Depends(get_permission_service),
+        access_snapshot_service: AccessSnapshotService = Depends(get_access_snapshot_service)
 ):
     permission_update = PermissionUpdate(id=permission_id, **permission_dto.dict())
-    return await permission_service.update(permission_update)
+    permission = await permission_service.update(permission_update)
+    await access_snapshot_service.bump_version()
+    return permission
 
 
 @router.delete('/{permission_id}')
 async def delete_permission(
         permission_id: UUID,
-        permission_service: PermissionService = Depends(get_permission_service)
+        permission_service: PermissionService = Depends(get_permission_service),
+        access_snapshot_service: AccessSnapshotService = Depends(get_access_snapshot_service)
 ):
     await permission_service.delete(permission_id)
+    await access_snapshot_service.bump_version()
     return BaseResponse(message=Messages.DELETED)
@@ -6,6 +6,7 @@ from fastapi import APIRouter, Depends, Query, Body
 from auth_service.src.core.security import has_permission
 from auth_service.src.models.dto.common import BaseResponse, Messages, paginated_response, Pagination
 from auth_service.src.models.dto.role import RoleCreate, RoleDto, RoleUpdate
+from auth_service.src.services.access_snapshot import AccessSnapshotService, get_access_snapshot_service
 from auth_service.src.services.role import RoleService, get_role_service
 from auth_service.src.services.role_permission import get_role_permission_service, RolePermissionService
 
@@ -25,9 +26,12 @@ async def get_roles(
 @router.post('/', response_model=RoleDto)
 async def create_role(
         role_create: RoleCreate,
-        role_service: RoleService = Depends(get_role_service)
+        role_service: RoleService = Depends(get_role_service),
+        access_snapshot_service: AccessSnapshotService = Depends(get_access_snapshot_service)
 ):
-    return await role_service.create(role_create)
+    role = await role_service.create(role_create)
+    await access_snapshot_service.bump_version()
+    return role
 
 
 @router.get('/{role_id}', response_model=RoleDto)
@@ -42,18 +46,23 @@ async def get_role(
 async def update_role(
         role_id: UUID,
         role_create: RoleCreate,
-        role_service: RoleService = Depends(get_role_service)
+        role_service: RoleService = Depends(get_role_service),
+        access_snapshot_service: AccessSnapshotService = Depends(get_access_snapshot_service)
 ):
     role_update = RoleUpdate(id=role_id, **role_create.dict())
-    return await role_service.update(role_update)
+    role = await role_service.update(role_update)
+    await access_snapshot_service.bump_version()
+    return role
 
 
 @router.delete('/{role_id}')
 async def delete_role(
         role_id: UUID,
-        role_service: RoleService = Depends(get_role_service)
+        role_service: RoleService = Depends(get_role_service),
+        access_snapshot_service: AccessSnapshotService = Depends(get_access_snapshot_service)
 ):
     await role_service.delete(role_id)
+    await access_snapshot_service.bump_version()
     return BaseResponse(message=Messages.DELETED)
 
 
@@ -61,6 +70,9 @@ async def delete_role(
 async def set_permissions_for_role(
     role_id: UUID,
     permission_ids: List[UUID] = Body(..., embed=True),
-    role_permission_service: RolePermissionService = Depends(get_role_permission_service)
+    role_permission_service: RolePermissionService = Depends(get_role_permission_service),
+    access_snapshot_service: AccessSnapshotService = Depends(get_access_snapshot_service)
 ):
-    return await role_permission_service.set_permissions(role_id, permission_ids)
+    role = await role_permission_service.set_permissions(role_id, permission_ids)
+    await access_snapshot_service.bump_version()
+    return role
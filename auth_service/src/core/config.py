@@ -28,6 +28,7 @@ class GlobalSettings(CommonSettings):
     project_name: str = Field(alias='PROJECT_NAME', default='auth')
     rate_limit: str = Field(alias='RATE_LIMIT', default='10/minute')
     env: str = Field(alias='ENV', default='development')
+    access_feed_token: str = Field(alias='ACCESS_FEED_TOKEN')
 
 
 class JWTSettings(CommonSettings):
@@ -35,13 +36,15 @@ class JWTSettings(CommonSettings):
     algorithm: str
     access_token_expire_minutes: int
     refresh_token_expire_minutes: int
+    access_snapshot_secret_key: str
 
     def __hash__(self):
         return hash(
             (
                 self.secret_key, self.algorithm,
                 self.access_token_expire_minutes,
-                self.refresh_token_expire_minutes
+                self.refresh_token_expire_minutes,
+                self.access_snapshot_secret_key
             )
         )
 
@@ -1,8 +1,10 @@
+import secrets
 from http import HTTPStatus
 
-from fastapi import Request, HTTPException, Depends
+from fastapi import Request, HTTPException, Depends, Header
 from fastapi.security import OAuth2PasswordBearer
 
+from auth_service.src.core.config import GlobalSettings, get_global_settings
 from auth_service.src.models.dto.common import ErrorMessages
 from auth_service.src.services.access_control import AccessControlService, \
     get_access_control_service
@@ -30,3 +32,14 @@ async def has_permission(
             status_code=HTTPStatus.FORBIDDEN,
             detail=ErrorMessages.PERMISSION_DENIED
         )
+
+
+async def is_internal_service(
+    service_token: str | None = Header(None, alias='X-Service-Token'),
+    settings: GlobalSettings = Depends(get_global_settings),
+):
+    if service_token is None or not secrets.compare_digest(service_token, settings.access_feed_token):
+        raise HTTPException(
+            status_code=HTTPStatus.UNAUTHORIZED,
+            detail=ErrorMessages.INVALID_SERVICE_TOKEN
+        )
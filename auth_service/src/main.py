@@ -13,7 +13,7 @@ from slowapi.util import get_remote_address
 from starlette.middleware.sessions import SessionMiddleware
 from starlette.requests import Request
 
-from auth_service.src.api.v1 import auth, user, role, permission
+from auth_service.src.api.v1 import auth, user, role, permission, access
 from auth_service.src.core.oauth import register_providers
 from auth_service.src.core.config import (get_global_settings,
                                           get_redis_settings)
@@ -84,3 +84,4 @@ app.include_router(auth.router, tags=['auth'])
 app.include_router(user.router, prefix='/users', tags=['users'])
 app.include_router(role.router, prefix='/roles', tags=['roles'])
 app.include_router(permission.router, prefix='/permissions', tags=['permissions'])
+app.include_router(access.router, prefix='/access', tags=['access'])
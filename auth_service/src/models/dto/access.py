@@ -0,0 +1,18 @@
+from typing import List
+
+from pydantic import BaseModel
+
+
+class AccessSnapshotResponse(BaseModel):
+    version: int
+    snapshot: str | None = None
+
+
+class BlacklistEntry(BaseModel):
+    token_hash: str
+    exp: int
+
+
+class BlacklistFeedResponse(BaseModel):
+    cursor: str
+    entries: List[BlacklistEntry]
@@ -48,6 +48,8 @@ class ErrorMessages:
     INVALID_TOKEN = 'Invalid token'
     INVALID_REFRESH_TOKEN = 'Invalid refresh token'
     INVALID_ACCESS_TOKEN = 'Invalid access token'
+    INVALID_CURSOR = 'Invalid cursor'
+    INVALID_SERVICE_TOKEN = 'Invalid service token'
     TOKEN_EXPIRED = 'Token expired'
     TOKEN_REVOKED = 'Token has been revoked'
     TOKEN_IS_MISSING = 'Authorization header missing or malformed'
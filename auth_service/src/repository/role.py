@@ -1,5 +1,5 @@
 from functools import lru_cache
-from typing import Type
+from typing import List, Type
 
 from fastapi import Depends
 from sqlalchemy import select
@@ -20,6 +20,11 @@ class RoleRepository(BaseRepository[Role]):
         result = await self.session.execute(query)
         return result.scalars().first()
 
+    async def get_all_with_permissions(self) -> List[Role]:
+        query = select(Role).options(selectinload(Role.permissions))
+        result = await self.session.execute(query)
+        return result.scalars().all()
+
 
 @lru_cache()
 def get_role_repository(
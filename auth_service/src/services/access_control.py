@@ -2,15 +2,17 @@ from functools import lru_cache
 
 from fastapi import Depends, HTTPException
 
+from auth_service.src.services.access_snapshot import AccessSnapshotService, get_access_snapshot_service
+from auth_service.src.services.permission_index import PermissionIndex, get_permission_index
 from auth_service.src.services.token import TokenService, get_token_service
-from auth_service.src.models.entities.role import Role
-from auth_service.src.repository.role import RoleRepository, get_role_repository
 
 
 class AccessControlService:
-    def __init__(self, role_repository: RoleRepository, token_service: TokenService):
-        self.role_repository = role_repository
+    def __init__(self, access_snapshot_service: AccessSnapshotService, token_service: TokenService,
+                 permission_index: PermissionIndex):
+        self.access_snapshot_service = access_snapshot_service
         self.token_service = token_service
+        self.permission_index = permission_index
 
     async def check_permission(self, token: str, resource: str, http_method: str) -> bool:
         token_data = await self.token_service.check_access_token(token)
@@ -21,25 +23,16 @@ class AccessControlService:
         if token_data.is_superuser:
             return True
 
-        roles = str(token_data.roles)
+        version = await self.access_snapshot_service.get_version()
+        await self.permission_index.refresh(version, self.access_snapshot_service.get_permissions_by_role)
 
-        for role_name in roles:
-            role = await self.role_repository.get_by_name(role_name)
-            if role and await self._has_permission(role, resource, http_method):
-                return True
-
-        return False
-
-    async def _has_permission(self, role: Role, resource: str, http_method: str) -> bool:
-        for permission in role.permissions:
-            if permission.resource == resource and permission.http_method == http_method:
-                return True
-        return False
+        return self.permission_index.has_permission(token_data.roles or [], resource, http_method)
 
 
 @lru_cache()
 def get_access_control_service(
-        role_repository: RoleRepository = Depends(get_role_repository),
-        token_service: TokenService = Depends(get_token_service)
+        access_snapshot_service: AccessSnapshotService = Depends(get_access_snapshot_service),
+        token_service: TokenService = Depends(get_token_service),
+        permission_index: PermissionIndex = Depends(get_permission_index)
 ) -> AccessControlService:
-    return AccessControlService(role_repository, token_service)
+    return AccessControlService(access_snapshot_service, token_service, permission_index)
@@ -0,0 +1,66 @@
+import time
+from datetime import datetime
+from functools import lru_cache
+
+from fastapi import Depends
+from jose import jwt
+from redis.asyncio import Redis
+
+from auth_service.src.core.config import JWTSettings, get_jwt_settings
+from auth_service.src.db.redis import get_redis
+from auth_service.src.repository.role import RoleRepository, get_role_repository
+
+
+class AccessSnapshotService:
+    """
+    Signed role -> permissions snapshot for services that check permissions locally.
+    The version is bumped on every role or permission change, so clients only reload it when it moves.
+    It is signed with its own key, so it never verifies as an access token.
+    """
+    VERSION_KEY = 'access:version'
+    TOKEN_TYPE = 'access_snapshot'
+
+    def __init__(self, settings: JWTSettings, role_repository: RoleRepository, redis: Redis):
+        self.settings = settings
+        self.role_repository = role_repository
+        self.redis = redis
+
+    async def get_version(self) -> int:
+        """
+        Current access version. A missing key (fresh or flushed Redis) gets a new unique version,
+        so nobody keeps serving permissions indexed before it disappeared.
+        """
+        version = await self.redis.get(self.VERSION_KEY)
+        if version is None:
+            await self.redis.set(self.VERSION_KEY, time.time_ns(), nx=True)
+            version = await self.redis.get(self.VERSION_KEY)
+        return int(version)
+
+    async def bump_version(self) -> int:
+        await self.get_version()
+        return await self.redis.incr(self.VERSION_KEY)
+
+    async def get_permissions_by_role(self) -> dict[str, list[list[str]]]:
+        roles = await self.role_repository.get_all_with_permissions()
+        return {
+            role.name: sorted([permission.resource, permission.http_method] for permission in role.permissions)
+            for role in roles
+        }
+
+    async def create_snapshot(self, version: int) -> str:
+        to_encode = {
+            'typ': self.TOKEN_TYPE,
+            'ver': version,
+            'iat': datetime.utcnow(),
+            'roles': await self.get_permissions_by_role(),
+        }
+        return jwt.encode(to_encode, self.settings.access_snapshot_secret_key, algorithm=self.settings.algorithm)
+
+
+@lru_cache()
+def get_access_snapshot_service(
+        jwt_settings: JWTSettings = Depends(get_jwt_settings),
+        role_repository: RoleRepository = Depends(get_role_repository),
+        redis: Redis = Depends(get_redis)
+) -> AccessSnapshotService:
+    return AccessSnapshotService(jwt_settings, role_repository, redis)
@@ -0,0 +1,37 @@
+import asyncio
+from functools import lru_cache
+from typing import Awaitable, Callable, Iterable
+
+
+class PermissionIndex:
+    """
+    Process-wide role -> {(resource, http_method)} index.
+    It is tagged with the access version, so it is rebuilt only after a role or permission change.
+    """
+
+    def __init__(self):
+        self.version: int | None = None
+        self._permissions: dict[str, frozenset[tuple[str, str]]] = {}
+        self._lock = asyncio.Lock()
+
+    async def refresh(self, version: int, load: Callable[[], Awaitable[dict[str, list[list[str]]]]]) -> None:
+        if version == self.version:
+            return
+        async with self._lock:
+            if version == self.version:
+                return
+            permissions_by_role = await load()
+            self._permissions = {
+                role: frozenset((resource, http_method) for resource, http_method in permissions)
+                for role, permissions in permissions_by_role.items()
+            }
+            self.version = version
+
+    def has_permission(self, roles: Iterable[str], resource: str, http_method: str) -> bool:
+        permission = (resource, http_method)
+        return any(permission in self._permissions.get(role, ()) for role in roles)
+
+
+@lru_cache()
+def get_permission_index() -> PermissionIndex:
+    return PermissionIndex()
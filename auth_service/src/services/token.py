@@ -1,14 +1,16 @@
 import hashlib
+import time
 import uuid
 from datetime import timedelta, datetime
 from functools import lru_cache
 from http import HTTPStatus
 
-from typing import Tuple
+from typing import List, Tuple
 
 from fastapi import HTTPException, Depends
 from jose import JWTError, jwt
 from redis.asyncio import Redis
+from redis.exceptions import ResponseError
 
 from auth_service.src.core.config import JWTSettings, get_jwt_settings
 from auth_service.src.db.redis import get_redis
@@ -19,6 +21,9 @@ from auth_service.src.repository.token import TokenRepository, get_token_reposit
 
 
 class TokenService:
+    BLACKLIST_FEED_KEY = 'blacklist:feed'
+    ACCESS_TOKEN_TYPE = 'access'
+
     def __init__(self, settings: JWTSettings, token_repository: TokenRepository, redis: Redis):
         self.settings = settings
         self.token_repository = token_repository
@@ -43,6 +48,7 @@ class TokenService:
         is_superuser = 'superadmin' in token_data.roles if token_data.roles else False
 
         to_encode = {
+            'typ': self.ACCESS_TOKEN_TYPE,
             'sub': token_data.user_id,
             'email': token_data.email,
             'roles': token_data.roles,
@@ -147,6 +153,36 @@ class TokenService:
         blacklist_key = f'blacklist:{access_token}'
         ttl = self._get_ttl(payload)
         await self.redis.set(blacklist_key, 'true', ex=int(ttl if ttl > 0 else 0))
+        await self._publish_blacklisted(access_token, payload)
+
+    async def _publish_blacklisted(self, access_token: str, payload: dict) -> None:
+        """
+        Append the revoked token hash to the blacklist feed read by services that verify tokens locally.
+        Entries older than the access token lifetime are trimmed: every token they refer to has already expired.
+        """
+        min_id = int((time.time() - self.settings.access_token_expire_minutes * 60) * 1000)
+        await self.redis.xadd(
+            self.BLACKLIST_FEED_KEY,
+            {'token_hash': self._hash_token(access_token), 'exp': int(float(payload['exp']))},
+            minid=min_id,
+            approximate=True
+        )
+
+    async def get_blacklist_feed(self, since: str, count: int) -> Tuple[List[dict], str]:
+        """
+        Tokens revoked after the since stream id and the id to continue from.
+        """
+        try:
+            response = await self.redis.xread({self.BLACKLIST_FEED_KEY: since}, count=count)
+        except ResponseError:
+            raise HTTPException(status_code=HTTPStatus.BAD_REQUEST,
+                                detail=ErrorMessages.INVALID_CURSOR)
+        entries, cursor = [], since
+        for _, messages in response:
+            for message_id, fields in messages:
+                entries.append({'token_hash': fields['token_hash'], 'exp': int(fields['exp'])})
+                cursor = message_id
+        return entries, cursor
 
 
 @lru_cache()
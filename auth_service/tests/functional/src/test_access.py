@@ -0,0 +1,87 @@
+import hashlib
+from http import HTTPStatus
+
+import pytest
+
+from auth_service.tests.functional.settings import test_settings
+from auth_service.tests.functional.testdata.authentication import valid_login
+from auth_service.tests.functional.testdata.authorization import role, already_exist_superuser
+
+pytestmark = pytest.mark.asyncio
+ENDPOINT = '/api/v1/auth/access'
+
+
+def service_headers() -> dict:
+    return {'X-Service-Token': test_settings.access_feed_token}
+
+
+@pytest.mark.parametrize('setup_superuser', [already_exist_superuser], indirect=True)
+async def test_access_snapshot_version(make_get_request, make_post_request, setup_superuser, get_tokens):
+    access_token, _ = await get_tokens(already_exist_superuser['email'], already_exist_superuser['password'])
+
+    response_body, _, status = await make_get_request(f'{ENDPOINT}/snapshot', headers=service_headers())
+    assert status == HTTPStatus.OK
+    assert response_body['snapshot']
+    version = response_body['version']
+
+    response_body, _, status = await make_get_request(f'{ENDPOINT}/snapshot', params={'version': version}, headers=service_headers())
+    assert status == HTTPStatus.OK
+    assert response_body['snapshot'] is None
+
+    _, _, status = await make_post_request(
+        '/api/v1/auth/roles',
+        json=role,
+        headers={'Authorization': f'Bearer {access_token}'}
+    )
+    assert status == HTTPStatus.OK
+
+    response_body, _, status = await make_get_request(f'{ENDPOINT}/snapshot', params={'version': version}, headers=service_headers())
+    assert status == HTTPStatus.OK
+    assert response_body['version'] != version
+    assert response_body['snapshot']
+
+
+async def test_blacklist_feed_after_logout(make_get_request, make_post_request, get_tokens):
+    access_token, refresh_token = await get_tokens(valid_login['email'], valid_login['password'])
+
+    _, _, status = await make_post_request(
+        '/api/v1/auth/logout',
+        json={'refresh_token': refresh_token},
+        headers={'Authorization': f'Bearer {access_token}'}
+    )
+    assert status == HTTPStatus.OK
+
+    response_body, _, status = await make_get_request(f'{ENDPOINT}/blacklist', params={'since': '0'}, headers=service_headers())
+
+    assert status == HTTPStatus.OK
+    token_hash = hashlib.sha256(access_token.encode('utf-8')).hexdigest()
+    assert token_hash in [entry['token_hash'] for entry in response_body['entries']]
+    assert response_body['cursor'] != '0'
+
+
+async def test_blacklist_feed_invalid_cursor(make_get_request):
+    _, _, status = await make_get_request(f'{ENDPOINT}/blacklist', params={'since': 'not-a-stream-id'},
+                                        headers=service_headers())
+
+    assert status == HTTPStatus.BAD_REQUEST
+
+
+@pytest.mark.parametrize('endpoint', ['snapshot', 'blacklist'])
+async def test_access_feed_requires_service_token(make_get_request, endpoint):
+    _, _, status = await make_get_request(f'{ENDPOINT}/{endpoint}')
+    assert status == HTTPStatus.UNAUTHORIZED
+
+    _, _, status = await make_get_request(f'{ENDPOINT}/{endpoint}', headers={'X-Service-Token': 'wrong'})
+    assert status == HTTPStatus.UNAUTHORIZED
+
+
+async def test_access_snapshot_is_not_an_access_token(make_get_request):
+    response_body, _, status = await make_get_request(f'{ENDPOINT}/snapshot', headers=service_headers())
+    assert status == HTTPStatus.OK
+
+    _, _, status = await make_get_request(
+        '/api/v1/auth/users/check-permission',
+        params={'resource': 'roles', 'http_method': 'GET'},
+        headers={'Authorization': f'Bearer {response_body["snapshot"]}'}
+    )
+    assert status == HTTPStatus.UNAUTHORIZED
@@ -191,6 +191,39 @@ async def test_check_permission(make_get_request, make_post_request, make_put_re
     assert status == HTTPStatus.OK
 
 
+@pytest.mark.parametrize('setup_superuser', [already_exist_superuser], indirect=True)
+@pytest.mark.parametrize('setup_user', [already_exist_user], indirect=True)
+@pytest.mark.parametrize('setup_roles', [[already_exist_role]], indirect=True)
+@pytest.mark.parametrize('setup_permissions', [[permission]], indirect=True)
+async def test_check_permission_after_role_change(make_get_request, make_put_request, setup_superuser, setup_user,
+                                                  setup_roles, setup_permissions, get_tokens):
+    superuser_access_token, _ = await get_tokens(already_exist_superuser['email'], already_exist_superuser['password'])
+    superuser_headers = {'Authorization': f'Bearer {superuser_access_token}'}
+
+    await make_put_request(
+        f'/api/v1/auth/roles/{setup_roles[0]}/permissions',
+        json={'permission_ids': setup_permissions},
+        headers=superuser_headers
+    )
+    await make_put_request(f'{ENDPOINT}/{setup_user}/roles', json={'role_ids': setup_roles}, headers=superuser_headers)
+
+    user_access_token, _ = await get_tokens(already_exist_user['email'], already_exist_user['password'])
+    params = {'resource': 'test_resource', 'http_method': 'post'}
+    user_headers = {'Authorization': f'Bearer {user_access_token}'}
+
+    _, _, status = await make_get_request(f'{ENDPOINT}/check-permission', params=params, headers=user_headers)
+    assert status == HTTPStatus.OK
+
+    await make_put_request(
+        f'/api/v1/auth/roles/{setup_roles[0]}/permissions',
+        json={'permission_ids': []},
+        headers=superuser_headers
+    )
+
+    _, _, status = await make_get_request(f'{ENDPOINT}/check-permission', params=params, headers=user_headers)
+    assert status == HTTPStatus.FORBIDDEN
+
+
 @pytest.mark.parametrize('setup_superuser', [already_exist_superuser], indirect=True)
 @pytest.mark.parametrize('setup_roles', [roles], indirect=True)
 @pytest.mark.parametrize('setup_user', [already_exist_user], indirect=True)
@@ -0,0 +1,98 @@
+"""
+Compare the cost of turning Postgres rows into a bulk request body for the movies index:
+elasticsearch_dsl documents serialized with json (the old path) against plain dict actions
+serialized with orjson. Rows are generated in pipeline-sized batches, only the transformation
+and serialization are timed.
+
+Run from the etl directory (needs the settings from .env.etl):
+    python -m benchmarks.transform_benchmark [rows]
+"""
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from elasticsearch.helpers import expand_action
+from elasticsearch.serializer import JsonSerializer, OrjsonSerializer
+
+from documents.movie import Movie
+from pipeline import get_index_actions
+
+ROWS = 1_000_000
+BATCH_SIZE = 500
+
+
+def make_row(number: int, started: datetime) -> dict:
+    directors = [{'id': str(uuid.uuid4()), 'full_name': 'Director Name'}]
+    actors = [{'id': str(uuid.uuid4()), 'full_name': f'Actor {i}'} for i in range(8)]
+    writers = [{'id': str(uuid.uuid4()), 'full_name': f'Writer {i}'} for i in range(2)]
+    return {
+        'id': str(uuid.uuid4()),
+        'title': f'Film {number}',
+        'description': 'A long description of the plot, repeated to look like a real one. ' * 5,
+        'imdb_rating': 7.5,
+        'permission': 'public',
+        'genres': [{'id': str(uuid.uuid4()), 'name': name, 'description': f'{name} films'} for name in ('Action', 'Drama')],
+        'directors_names': [person['full_name'] for person in directors],
+        'actors_names': [person['full_name'] for person in actors],
+        'writers_names': [person['full_name'] for person in writers],
+        'directors': directors,
+        'actors': actors,
+        'writers': writers,
+        'last_change_date': started + timedelta(microseconds=number),
+    }
+
+
+def legacy_actions(rows: list[dict]) -> list[dict]:
+    # psycopg class_row(Movie) и to_dict в пайплайне до перехода на словари
+    movies = [Movie(**row) for row in rows]
+    return [dict(movie.to_dict(True, skip_empty=False), **{'_id': movie.id}) for movie in movies]
+
+
+def fast_actions(rows: list[dict]) -> list[dict]:
+    return get_index_actions(rows, Movie._index._name)
+
+
+def serialize(actions: list[dict], serializer) -> int:
+    # то же, что делает streaming_bulk при нарезке чанков
+    size = 0
+    for action in actions:
+        header, data = expand_action(action)
+        size += len(serializer.dumps(header)) + len(serializer.dumps(data)) + 2
+    return size
+
+
+def measure(name: str, transform, serializer, rows_total: int) -> None:
+    started = datetime(2024, 1, 1)
+    transform_seconds = serialize_seconds = 0.0
+    size = 0
+    for offset in range(0, rows_total, BATCH_SIZE):
+        rows = [make_row(number, started) for number in range(offset, min(offset + BATCH_SIZE, rows_total))]
+
+        clock = time.perf_counter()
+        actions = transform(rows)
+        transform_seconds += time.perf_counter() - clock
+
+        clock = time.perf_counter()
+        size += serialize(actions, serializer)
+        serialize_seconds += time.perf_counter() - clock
+
+    total = transform_seconds + serialize_seconds
+    print(
+        f'{name:<22}{transform_seconds:>12.2f}{serialize_seconds:>14.2f}{total:>10.2f}'
+        f'{rows_total / total:>14.0f}{size / 2 ** 20:>10.0f}'
+    )
+
+
+def main() -> None:
+    rows_total = int(sys.argv[1]) if len(sys.argv) > 1 else ROWS
+
+    print(f'{rows_total} movie rows in batches of {BATCH_SIZE}')
+    print(f'{"path":<22}{"transform, s":>12}{"serialize, s":>14}{"total, s":>10}{"rows/s":>14}{"MiB":>10}')
+    measure('Document + json', legacy_actions, JsonSerializer(), rows_total)
+    measure('dict + json', fast_actions, JsonSerializer(), rows_total)
+    measure('dict + orjson', fast_actions, OrjsonSerializer(), rows_total)
+
+
+if __name__ == '__main__':
+    main()
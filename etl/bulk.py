@@ -0,0 +1,155 @@
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from functools import lru_cache
+from http import HTTPStatus
+from typing import Any, Collection
+
+import pytz
+from elasticsearch import TransportError
+from elasticsearch.helpers import BulkIndexError, streaming_bulk
+from elasticsearch_dsl import connections
+
+from logger import logger
+from settings import settings
+
+
+class AdaptiveChunkSize:
+    """Размер чанка bulk-запроса: уменьшается вдвое, когда ES отвечает 429, и плавно растёт обратно."""
+
+    GROWTH = 1.1
+
+    def __init__(self, initial: int, minimum: int) -> None:
+        self.maximum = initial
+        self.minimum = min(minimum, initial)
+        self._value = initial
+        self._lock = threading.Lock()
+
+    @property
+    def value(self) -> int:
+        return int(self._value)
+
+    def throttled(self) -> None:
+        with self._lock:
+            self._value = max(self._value / 2, self.minimum)
+        logger.warning(f'Elasticsearch is throttling bulk requests, chunk size reduced to {self.value}')
+
+    def succeeded(self) -> None:
+        with self._lock:
+            self._value = min(self._value * self.GROWTH, self.maximum)
+
+
+class DeadLetterFile:
+    """Документы, которые ES отклонил окончательно, построчно в формате JSON."""
+
+    def __init__(self, file_path: str) -> None:
+        self.file_path = file_path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(file_path) or '.', exist_ok=True)
+
+    def write(self, action: dict[str, Any], error: dict[str, Any]) -> None:
+        record = {
+            'failed_at': datetime.now(pytz.UTC).isoformat(),
+            'index': error.get('_index', action.get('_index')),
+            'id': error.get('_id', action.get('_id')),
+            'status': error.get('status'),
+            'error': error.get('error'),
+            'action': action,
+        }
+        with self._lock, open(self.file_path, mode='a', encoding='utf-8') as dead_letter:
+            dead_letter.write(json.dumps(record, default=str) + '\n')
+        logger.error(f'Document {record["id"]} of {record["index"]} moved to {self.file_path}: {record["error"]}')
+
+
+class BulkSender:
+    """Загрузка пачки документов через streaming_bulk с разбором ответа по каждому документу.
+
+    Повторно отправляются только документы, получившие 429, 5xx или ошибку соединения.
+    Статусы из ignore_status (например, 404 при удалении уже удалённого документа) считаются успехом.
+    Документ, отклонённый с другой ошибкой (например, не подходящий под маппинг),
+    уходит в dead-letter файл и больше не задерживает синхронизацию индекса.
+    """
+
+    def __init__(
+        self,
+        chunk_size: AdaptiveChunkSize,
+        max_chunk_bytes: int,
+        retries: int,
+        dead_letter: DeadLetterFile,
+        initial_backoff: float = 0.5,
+        max_backoff: float = 30,
+    ) -> None:
+        self.chunk_size = chunk_size
+        self.max_chunk_bytes = max_chunk_bytes
+        self.retries = retries
+        self.dead_letter = dead_letter
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+
+    def send(self, actions: list[dict[str, Any]], ignore_status: Collection[int] = ()) -> int:
+        """Отправить документы, вернуть число успешно записанных."""
+        pending = actions
+        succeeded = 0
+        for attempt in range(self.retries + 1):
+            if attempt:
+                time.sleep(min(self.initial_backoff * 2 ** (attempt - 1), self.max_backoff))
+
+            try:
+                results = self._stream(pending, ignore_status)
+            except TransportError as e:
+                logger.warning(f'Bulk request of {len(pending)} documents failed with {e}, attempt {attempt + 1}')
+                continue
+
+            retry, throttled = [], False
+            for action, (ok, result) in zip(pending, results):
+                error = next(iter(result.values()))
+                status = error.get('status')
+                # streaming_bulk с raise_on_error=False возвращает игнорируемые статусы как ошибки
+                if ok or status in ignore_status:
+                    succeeded += 1
+                elif status == HTTPStatus.TOO_MANY_REQUESTS:
+                    throttled = True
+                    retry.append(action)
+                elif not isinstance(status, int) or status >= HTTPStatus.INTERNAL_SERVER_ERROR:
+                    retry.append(action)
+                else:
+                    self.dead_letter.write(action, error)
+
+            if throttled:
+                self.chunk_size.throttled()
+            else:
+                self.chunk_size.succeeded()
+            if not retry:
+                return succeeded
+            pending = retry
+
+        raise BulkIndexError(f'{len(pending)} document(s) failed to index after {self.retries} retries', pending)
+
+    def _stream(self, actions: list[dict[str, Any]], ignore_status: Collection[int]) -> list[tuple[bool, dict]]:
+        # без внутренних повторов streaming_bulk отдаёт результаты в порядке действий
+        return list(streaming_bulk(
+            connections.get_connection(),
+            actions,
+            chunk_size=self.chunk_size.value,
+            max_chunk_bytes=self.max_chunk_bytes,
+            raise_on_error=False,
+            raise_on_exception=False,
+            ignore_status=ignore_status,
+        ))
+
+
+@lru_cache()
+def get_bulk_sender() -> BulkSender:
+    etl_settings = settings.etl_settings
+    return BulkSender(
+        AdaptiveChunkSize(etl_settings.bulk_chunk_size, etl_settings.bulk_min_chunk_size),
+        max_chunk_bytes=etl_settings.bulk_max_chunk_bytes,
+        retries=etl_settings.bulk_retries,
+        dead_letter=DeadLetterFile(etl_settings.dead_letter_path),
+    )
+
+
+def send_to_es(actions: list[dict[str, Any]], ignore_status: Collection[int] = ()) -> int:
+    return get_bulk_sender().send(actions, ignore_status)
@@ -0,0 +1,136 @@
+import json
+from collections import defaultdict
+from datetime import datetime
+from http import HTTPStatus
+from typing import Callable, Type
+
+import psycopg
+import pytz
+from elasticsearch_dsl import Document
+from psycopg.conninfo import make_conninfo
+
+from bulk import send_to_es
+from logger import logger
+from pipeline import DataLoader, bump_index_cache_generation, get_index_actions, invalidate_cached_documents
+
+# таблица -> [(индекс, колонка с id документа)]
+DIRECT_DEPENDENCIES = {
+    'film_work': [('movies', 'id')],
+    'genre': [('genres', 'id')],
+    'person': [('persons', 'id')],
+    'genre_film_work': [('movies', 'film_work_id')],
+    'person_film_work': [('movies', 'film_work_id'), ('persons', 'person_id')],
+}
+
+# таблицы сущностей, копии которых встроены в документы фильмов
+EMBEDDED_ENTITIES = ('person', 'genre')
+
+
+class LogicalReplicationSource:
+    """Источник изменений схемы content из слота логической репликации с плагином wal2json.
+
+    Изменения читаются без подтверждения (peek), слот сдвигается только после того,
+    как затронутые документы переиндексированы, поэтому при сбое изменения не теряются.
+    """
+
+    PLUGIN = 'wal2json'
+    PLUGIN_OPTIONS = ('format-version', '2', 'add-tables', 'content.*', 'include-transaction', 'true')
+    TRANSACTION_ACTIONS = ('B', 'C')
+
+    def __init__(self, database_settings: dict, slot_name: str, max_changes: int) -> None:
+        self.dsn = make_conninfo(**database_settings)
+        self.slot_name = slot_name
+        self.max_changes = max_changes
+
+    def ensure_slot(self) -> None:
+        with psycopg.connect(self.dsn, autocommit=True) as conn:
+            exists = conn.execute(
+                'SELECT 1 FROM pg_replication_slots WHERE slot_name = %s', (self.slot_name,)
+            ).fetchone()
+            if not exists:
+                conn.execute(
+                    'SELECT pg_create_logical_replication_slot(%s, %s)', (self.slot_name, self.PLUGIN)
+                )
+                logger.info(f'Created logical replication slot {self.slot_name}')
+
+    def peek(self) -> tuple[list[dict], str | None]:
+        """Вернуть изменения очередных транзакций и LSN конца последней из них.
+
+        Слот сдвигается до LSN записи COMMIT: сдвиг до LSN отдельного изменения
+        заставил бы PostgreSQL заново декодировать всю транзакцию.
+        """
+        with psycopg.connect(self.dsn, autocommit=True) as conn:
+            rows = conn.execute(
+                'SELECT lsn::text, data FROM pg_logical_slot_peek_changes(%s, NULL, %s, VARIADIC %s::text[])',
+                (self.slot_name, self.max_changes, list(self.PLUGIN_OPTIONS)),
+            ).fetchall()
+
+        changes, commit_lsn = [], None
+        for lsn, data in rows:
+            change = json.loads(data)
+            if change['action'] == 'C':
+                commit_lsn = lsn
+            elif change['action'] not in self.TRANSACTION_ACTIONS:
+                changes.append(change)
+        return changes, commit_lsn
+
+    def advance(self, lsn: str) -> None:
+        with psycopg.connect(self.dsn, autocommit=True) as conn:
+            conn.execute('SELECT pg_replication_slot_advance(%s, %s::pg_lsn)', (self.slot_name, lsn))
+
+    @staticmethod
+    def get_affected_ids(changes: list[dict]) -> tuple[dict[str, set[str]], dict[str, set[str]]]:
+        """Определить id документов каждого индекса, которые нужно переиндексировать,
+        и id изменённых персон и жанров, копии которых нужно обновить в фильмах.
+        """
+        affected: dict[str, set[str]] = defaultdict(set)
+        embedded: dict[str, set[str]] = defaultdict(set)
+        for change in changes:
+            if change.get('action') == 'T':
+                logger.warning(f'Truncate of content.{change.get("table")} is not replicated, run a full sync')
+                continue
+
+            dependencies = DIRECT_DEPENDENCIES.get(change.get('table'), [])
+            # для UPDATE и DELETE в identity лежат старые значения, в columns - новые
+            values = {}
+            for column in change.get('identity', []) + change.get('columns', []):
+                values.setdefault(column['name'], set()).add(column['value'])
+
+            for index_name, column_name in dependencies:
+                affected[index_name].update(str(value) for value in values.get(column_name, ()) if value)
+
+            if change.get('table') in EMBEDDED_ENTITIES and change.get('action') == 'U':
+                embedded[change['table']].update(str(value) for value in values.get('id', ()) if value)
+
+        return dict(affected), dict(embedded)
+
+
+def reindex_documents(
+    database_settings: dict,
+    es_model: Type[Document],
+    get_data_function: DataLoader,
+    ids: set[str],
+    batch_size: int,
+    on_batch: Callable[[list[dict]], None] | None = None,
+) -> int:
+    """Переиндексировать документы по id, удалив из индекса те, которых больше нет в Postgres."""
+    index_name = es_model._index._name
+    since = pytz.UTC.localize(datetime.min)
+    found_ids = set()
+
+    for rows in get_data_function(database_settings, since, batch_size, ids=list(ids)):
+        if on_batch is not None:
+            on_batch(rows)
+        send_to_es(get_index_actions(rows, index_name))
+        found_ids.update(row['id'] for row in rows)
+
+    removed_ids = ids - found_ids
+    if removed_ids:
+        send_to_es(
+            [{'_op_type': 'delete', '_index': index_name, '_id': _id} for _id in removed_ids],
+            ignore_status=(HTTPStatus.NOT_FOUND,),
+        )
+
+    invalidate_cached_documents(index_name, list(ids))
+    bump_index_cache_generation(index_name, len(ids))
+    return len(ids)
@@ -0,0 +1,184 @@
+from datetime import datetime
+from http import HTTPStatus
+from typing import Any, Callable, Generator
+
+from redis import Redis
+
+from bulk import send_to_es
+from logger import logger
+from pipeline import Checkpoint, bump_index_cache_generation, invalidate_cached_documents
+from state_manager.state_manager import StateManager
+
+MOVIES_INDEX = 'movies'
+PERSON_ROLES = ('actors', 'directors', 'writers')
+
+UPDATE_PERSON_SCRIPT = """
+for (String role : params.roles) {
+    def persons = ctx._source[role];
+    if (persons == null) {
+        continue;
+    }
+    def names = [];
+    for (def person : persons) {
+        if (person.id == params.id) {
+            person.full_name = params.full_name;
+        }
+        names.add(person.full_name);
+    }
+    ctx._source[role + '_names'] = names;
+}
+"""
+
+UPDATE_GENRE_SCRIPT = """
+if (ctx._source.genres != null) {
+    for (def genre : ctx._source.genres) {
+        if (genre.id == params.id) {
+            genre.name = params.name;
+            genre.description = params.description;
+        }
+    }
+}
+"""
+
+ChangedEntitiesLoader = Callable[..., Generator[list[dict], None, None]]
+
+
+class DependencyIndex:
+    """Индекс зависимостей person_id/genre_id -> id фильмов, в документы которых они встроены.
+
+    Хранится в Redis множествами и обновляется при каждой загрузке документов фильмов:
+    связи фильма перечитываются целиком, устаревшие удаляются.
+    """
+
+    KEY = 'etl:deps:{kind}:{id}'
+    FILM_KEY = 'etl:deps:film:{id}'
+    BUILT_KEY = 'etl:deps:built'
+
+    def __init__(self, redis: Redis) -> None:
+        self.redis = redis
+
+    def is_built(self) -> bool:
+        """Индекс построен, если хотя бы раз через него прошли все документы фильмов."""
+        return bool(self.redis.exists(self.BUILT_KEY))
+
+    def mark_built(self) -> None:
+        self.redis.set(self.BUILT_KEY, 1)
+
+    def update_movies(self, movies: list[dict[str, Any]]) -> None:
+        edges = {movie['id']: self._get_movie_edges(movie) for movie in movies}
+
+        with self.redis.pipeline(transaction=False) as pipe:
+            for film_id in edges:
+                pipe.smembers(self.FILM_KEY.format(id=film_id))
+            previous_edges = dict(zip(edges, pipe.execute()))
+
+        with self.redis.pipeline(transaction=False) as pipe:
+            for film_id, current in edges.items():
+                previous = {edge.decode() for edge in previous_edges[film_id]}
+                for edge in previous - current:
+                    pipe.srem(self._edge_key(edge), film_id)
+                for edge in current - previous:
+                    pipe.sadd(self._edge_key(edge), film_id)
+                film_key = self.FILM_KEY.format(id=film_id)
+                pipe.delete(film_key)
+                if current:
+                    pipe.sadd(film_key, *current)
+            pipe.execute()
+
+    def get_films(self, kind: str, ids: list[str]) -> dict[str, set[str]]:
+        with self.redis.pipeline(transaction=False) as pipe:
+            for _id in ids:
+                pipe.smembers(self.KEY.format(kind=kind, id=_id))
+            return {
+                _id: {film_id.decode() for film_id in film_ids}
+                for _id, film_ids in zip(ids, pipe.execute())
+            }
+
+    @staticmethod
+    def _get_movie_edges(movie: dict[str, Any]) -> set[str]:
+        edges = {f'genre:{genre["id"]}' for genre in movie['genres'] or []}
+        for role in PERSON_ROLES:
+            edges.update(f'person:{person["id"]}' for person in movie[role] or [])
+        return edges
+
+    def _edge_key(self, edge: str) -> str:
+        kind, _id = edge.split(':', 1)
+        return self.KEY.format(kind=kind, id=_id)
+
+
+def get_person_update_actions(person: dict[str, Any], film_ids: set[str]) -> list[dict[str, Any]]:
+    params = {'id': str(person['id']), 'full_name': person['full_name'], 'roles': list(PERSON_ROLES)}
+    return [_script_update(film_id, UPDATE_PERSON_SCRIPT, params) for film_id in film_ids]
+
+
+def get_genre_update_actions(genre: dict[str, Any], film_ids: set[str]) -> list[dict[str, Any]]:
+    params = {'id': str(genre['id']), 'name': genre['name'], 'description': genre['description']}
+    return [_script_update(film_id, UPDATE_GENRE_SCRIPT, params) for film_id in film_ids]
+
+
+def _script_update(film_id: str, source: str, params: dict[str, Any]) -> dict[str, Any]:
+    return {
+        '_op_type': 'update',
+        '_index': MOVIES_INDEX,
+        '_id': film_id,
+        'script': {'source': source, 'lang': 'painless', 'params': params},
+    }
+
+
+ENTITY_UPDATES = {
+    'person': get_person_update_actions,
+    'genre': get_genre_update_actions,
+}
+
+
+def propagate_changes(
+    dependency_index: DependencyIndex,
+    kind: str,
+    entities: list[dict[str, Any]],
+) -> int:
+    """Обновить встроенные копии сущностей только в затронутых документах фильмов."""
+    films_by_entity = dependency_index.get_films(kind, [str(entity['id']) for entity in entities])
+    actions = []
+    for entity in entities:
+        actions += ENTITY_UPDATES[kind](entity, films_by_entity[str(entity['id'])])
+
+    if actions:
+        send_to_es(actions, ignore_status=(HTTPStatus.NOT_FOUND,))
+        invalidate_cached_documents(MOVIES_INDEX, [action['_id'] for action in actions])
+    return len(actions)
+
+
+def sync_entity_changes(
+    dependency_index: DependencyIndex,
+    state_manager: StateManager,
+    kind: str,
+    get_changed_entities: ChangedEntitiesLoader,
+    database_settings: dict,
+    batch_size: int,
+    started_at: datetime,
+) -> None:
+    """Найти персоны или жанры, изменённые после прошлой синхронизации, и частично обновить их фильмы.
+
+    Курсор, как и у индексов, - пара (updated_at, id): строки с одинаковым updated_at
+    на границе пачки не теряются. При первом запуске отсчёт начинается с started_at:
+    полная синхронизация фильмов, идущая в том же цикле, уже содержит актуальные имена.
+    """
+    state_name = f'{kind}_dependency_last_sync_state'
+    state = state_manager.get_state(state_name)
+    if state is None:
+        state_manager.set_state(state_name, Checkpoint(started_at).to_state())
+        return
+    checkpoint = Checkpoint.from_state(state)
+
+    updated_movies = 0
+    for entities in get_changed_entities(
+        database_settings, checkpoint.last_change_date, batch_size, last_id=checkpoint.id or None
+    ):
+        updated_movies += propagate_changes(dependency_index, kind, entities)
+        # строки отсортированы по курсору
+        checkpoint = Checkpoint.from_row(entities[-1])
+
+    state_manager.set_state(state_name, checkpoint.to_state())
+    if updated_movies:
+        logger.info(f'Updated {kind} copies in {updated_movies} movies')
+        bump_index_cache_generation(MOVIES_INDEX, updated_movies)
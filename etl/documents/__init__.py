@@ -0,0 +1,3 @@
+# id, с которого начинается курсор (last_change_date, id), если он ещё не сохранён
+MIN_UUID = '00000000-0000-0000-0000-000000000000'
+MAX_UUID = 'ffffffff-ffff-ffff-ffff-ffffffffffff'
@@ -0,0 +1,130 @@
+import threading
+from datetime import datetime
+from queue import Queue
+from typing import Any, Generator
+
+import orjson
+import psycopg
+from psycopg import ServerCursor, sql
+from psycopg.conninfo import make_conninfo
+from psycopg.rows import dict_row
+
+from documents import MAX_UUID, MIN_UUID
+
+_DONE = object()
+
+
+def get_id_ranges(parts: int) -> list[tuple[str, str]]:
+    """Разбить пространство uuid на parts равных диапазонов: id документов - случайные uuid4."""
+    step = 2 ** 128 // parts
+    bounds = [number * step for number in range(parts)] + [2 ** 128]
+    return [(_to_uuid(bounds[i]), _to_uuid(bounds[i + 1] - 1)) for i in range(parts)]
+
+
+def _to_uuid(number: int) -> str:
+    value = f'{number:032x}'
+    return f'{value[:8]}-{value[8:12]}-{value[12:16]}-{value[16:20]}-{value[20:]}'
+
+
+def extract_documents(
+    database_settings: dict,
+    query: str,
+    params: dict[str, Any],
+    batch_size: int,
+    cursor_name: str,
+    copy_workers: int = 0,
+) -> Generator[list[dict], None, None]:
+    """Прочитать документы пачками по batch_size.
+
+    По умолчанию строки читаются серверным курсором в порядке запроса. С copy_workers > 0
+    пространство id делится на диапазоны, и каждый выгружается своим соединением через
+    COPY ... TO STDOUT - так быстрее всего загрузить индекс с нуля. Порядок строк между
+    диапазонами при этом не сохраняется.
+    """
+    if copy_workers:
+        yield from _copy_parallel(database_settings, query, params, batch_size, copy_workers)
+        return
+
+    dsn = make_conninfo(**database_settings)
+    with psycopg.connect(dsn, row_factory=dict_row) as conn, ServerCursor(conn, cursor_name) as cursor:
+        cursor.execute(query, {**params, 'id_from': MIN_UUID, 'id_to': MAX_UUID})
+        while results := cursor.fetchmany(size=batch_size):
+            yield results
+
+
+def copy_documents(
+    database_settings: dict,
+    query: str,
+    params: dict[str, Any],
+    batch_size: int,
+) -> Generator[list[dict], None, None]:
+    """Выгрузить строки запроса одним COPY: каждая строка приходит JSON-документом в бинарном формате."""
+    dsn = make_conninfo(**database_settings)
+    statement = sql.SQL('COPY (SELECT row_to_json(d)::text FROM ({}) d) TO STDOUT (FORMAT BINARY)').format(
+        sql.SQL(query)
+    )
+    with psycopg.connect(dsn) as conn, conn.cursor() as cursor:
+        with cursor.copy(statement, params) as copy:
+            copy.set_types(['text'])
+            batch = []
+            for (document,) in copy.rows():
+                document = orjson.loads(document)
+                document['last_change_date'] = datetime.fromisoformat(document['last_change_date'])
+                batch.append(document)
+                if len(batch) == batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+
+
+def _copy_parallel(
+    database_settings: dict,
+    query: str,
+    params: dict[str, Any],
+    batch_size: int,
+    workers: int,
+) -> Generator[list[dict], None, None]:
+    batches: Queue = Queue(maxsize=workers * 2)
+    stopped = threading.Event()
+    errors: list[Exception] = []
+
+    def copy_range(id_from: str, id_to: str) -> None:
+        try:
+            range_params = {**params, 'id_from': id_from, 'id_to': id_to}
+            for batch in copy_documents(database_settings, query, range_params, batch_size):
+                if stopped.is_set():
+                    return
+                batches.put(batch)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            batches.put(_DONE)
+
+    threads = [
+        threading.Thread(target=copy_range, args=id_range, name=f'copy-{number}', daemon=True)
+        for number, id_range in enumerate(get_id_ranges(workers))
+    ]
+    for thread in threads:
+        thread.start()
+
+    try:
+        finished = 0
+        while finished < len(threads):
+            batch = batches.get()
+            if batch is _DONE:
+                finished += 1
+                continue
+            if errors:
+                break
+            yield batch
+        if errors:
+            raise errors[0]
+    finally:
+        # потребитель мог остановиться раньше: освобождаем потоки, ждущие места в очереди
+        stopped.set()
+        while any(thread.is_alive() for thread in threads):
+            while not batches.empty():
+                batches.get_nowait()
+            for thread in threads:
+                thread.join(timeout=0.1)
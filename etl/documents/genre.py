@@ -12,6 +12,9 @@ from psycopg import ServerCursor
 from psycopg.conninfo import make_conninfo
 from psycopg.rows import dict_row
 
+from documents import MIN_UUID
+from documents.extract import extract_documents
+
 
 class Genre(Document):
     id = Keyword()
@@ -55,33 +58,51 @@ class Genre(Document):
 
 
 def get_genre_index_data(
-        database_settings: dict, last_sync_state: datetime, batch_size: int = 100
-) -> Generator[list[Genre], None, None]:
+        database_settings: dict,
+        last_sync_state: datetime,
+        batch_size: int = 100,
+        ids: list[str] | None = None,
+        last_id: str | None = None,
+        copy_workers: int = 0,
+) -> Generator[list[dict], None, None]:
+    """Документы жанров в виде словарей, готовых к отправке в ES."""
+    raw_sql = """
+    SELECT
+        g.id::text AS id,
+        g.name,
+        g.description,
+        max(g.updated_at) as last_change_date
+    FROM content.genre g
+    WHERE (%(ids)s::uuid[] IS NULL OR g.id = ANY(%(ids)s::uuid[]))
+        AND g.id BETWEEN %(id_from)s::uuid AND %(id_to)s::uuid
+    GROUP BY g.id
+    HAVING (max(g.updated_at), g.id) > (%(last_change_date)s, %(last_id)s::uuid)
+    ORDER BY max(g.updated_at), g.id
+    """
+    params = {'ids': ids, 'last_change_date': last_sync_state, 'last_id': last_id or MIN_UUID}
+    yield from extract_documents(database_settings, raw_sql, params, batch_size, 'fetcher', copy_workers)
+
+
+def get_changed_genres(
+        database_settings: dict,
+        last_sync_state: datetime,
+        batch_size: int = 100,
+        ids: list[str] | None = None,
+        last_id: str | None = None,
+) -> Generator[list[dict], None, None]:
+    """Жанры, изменённые после курсора (last_sync_state, last_id): они встроены в документы фильмов."""
     dsn = make_conninfo(**database_settings)
 
-    with psycopg.connect(dsn, row_factory=dict_row) as conn, ServerCursor(conn, 'fetcher') as cursor:
+    with psycopg.connect(dsn, row_factory=dict_row) as conn, ServerCursor(conn, 'changed_genres') as cursor:
         raw_sql = """
-        SELECT
-            g.id,
-            g.name,
-            g.description,
-            max(g.updated_at) as last_change_date
-        FROM content.genre g
-        GROUP BY g.id
-        HAVING max(g.updated_at) > %s
-        ORDER BY g.updated_at
+        SELECT id::text AS id, name, description, updated_at AS last_change_date
+        FROM content.genre
+        WHERE (%(ids)s::uuid[] IS NULL OR id = ANY(%(ids)s::uuid[]))
+            AND (updated_at, id) > (%(last_change_date)s, %(last_id)s::uuid)
+        ORDER BY updated_at, id
         """
-        cursor.execute(raw_sql, (last_sync_state,))
+        params = {'ids': ids, 'last_change_date': last_sync_state, 'last_id': last_id or MIN_UUID}
+        cursor.execute(raw_sql, params)
 
         while results := cursor.fetchmany(size=batch_size):
-            genres = []
-            for result in results:
-                genre = Genre(
-                    id=result['id'],
-                    name=result['name'],
-                    description=result.get('description', None),
-                    last_change_date=result['last_change_date']
-                )
-                genres.append(genre)
-
-            yield genres
+            yield results
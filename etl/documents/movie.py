@@ -1,7 +1,6 @@
 from datetime import datetime
 from typing import Generator
 
-import psycopg
 from elasticsearch_dsl import (
     Document,
     Float,
@@ -11,9 +10,9 @@ from elasticsearch_dsl import (
     Nested,
     Text,
 )
-from psycopg import ServerCursor
-from psycopg.conninfo import make_conninfo
-from psycopg.rows import class_row
+
+from documents import MIN_UUID
+from documents.extract import extract_documents
 
 
 class Director(InnerDoc):
@@ -53,7 +52,14 @@ class Movie(Document):
     id = Keyword()
     imdb_rating = Float()
     genres = Nested(Genre)
-    title = Text(analyzer='ru_en', fields={'raw': Keyword()})
+    # title.suggest - префиксы слов для поиска по мере ввода: автодополнению не нужны нечёткие запросы
+    title = Text(
+        analyzer='ru_en',
+        fields={
+            'raw': Keyword(),
+            'suggest': Text(analyzer='autocomplete', search_analyzer='autocomplete_search'),
+        },
+    )
     description = Text(analyzer='ru_en')
     directors_names = Text(analyzer='ru_en')
     actors_names = Text(analyzer='ru_en')
@@ -78,6 +84,7 @@ class Movie(Document):
                     },
                     'russian_stop': {'type': 'stop', 'stopwords': '_russian_'},
                     'russian_stemmer': {'type': 'stemmer', 'language': 'russian'},
+                    'autocomplete_edge_ngram': {'type': 'edge_ngram', 'min_gram': 1, 'max_gram': 20},
                 },
                 'analyzer': {
                     'ru_en': {
@@ -90,7 +97,15 @@ class Movie(Document):
                             'russian_stop',
                             'russian_stemmer',
                         ],
-                    }
+                    },
+                    'autocomplete': {
+                        'tokenizer': 'standard',
+                        'filter': ['lowercase', 'autocomplete_edge_ngram'],
+                    },
+                    'autocomplete_search': {
+                        'tokenizer': 'standard',
+                        'filter': ['lowercase'],
+                    },
                 },
             },
         }
@@ -100,74 +115,77 @@ class Movie(Document):
 
 
 def get_movie_index_data(
-    database_settings: dict, last_sync_state: datetime, batch_size: int = 100
-) -> Generator[list[Movie], None, None]:
-
-    dsn = make_conninfo(**database_settings)
-
-    with psycopg.connect(dsn, row_factory=class_row(Movie)) as conn, ServerCursor(conn, 'fetcher') as cursor:
-        raw_sql = """
-        SELECT
-            fw.id,
-            fw.title,
-            fw.description,
-            fw.rating as imdb_rating,
-            fw.permission,
+    database_settings: dict,
+    last_sync_state: datetime,
+    batch_size: int = 100,
+    ids: list[str] | None = None,
+    last_id: str | None = None,
+    copy_workers: int = 0,
+) -> Generator[list[dict], None, None]:
+    """Документы фильмов в виде словарей, готовых к отправке в ES: вложенные списки собирает Postgres."""
+    raw_sql = """
+    SELECT
+        fw.id::text AS id,
+        fw.title,
+        fw.description,
+        fw.rating as imdb_rating,
+        fw.permission,
+        COALESCE (
+            json_agg(
+                DISTINCT jsonb_build_object(
+                    'id', g.id,
+                    'name', g.name,
+                    'description', g.description
+                )
+            ) FILTER (WHERE g.id is not null),
+            '[]'
+        ) as genres,
+        COALESCE (array_agg(DISTINCT p.full_name) FILTER (WHERE pfw.role='director'),'{}') as directors_names,
+        COALESCE (array_agg(DISTINCT p.full_name) FILTER (WHERE pfw.role='actor'),'{}') as actors_names, 
+        COALESCE (array_agg(DISTINCT p.full_name) FILTER (WHERE pfw.role='writer'),'{}') as writers_names,  
+        COALESCE (
+            json_agg(
+                DISTINCT jsonb_build_object(
+                    'id', p.id,
+                    'full_name', p.full_name
+                )
+            ) FILTER (WHERE p.id is not null and pfw.role='director'),
+            '[]'
+        ) as directors,
+
             COALESCE (
-                json_agg(
-                    DISTINCT jsonb_build_object(
-                        'id', g.id,
-                        'name', g.name,
-                        'description', g.description
-                    )
-                ) FILTER (WHERE g.id is not null),
-                '[]'
-            ) as genres,
-            COALESCE (array_agg(DISTINCT p.full_name) FILTER (WHERE pfw.role='director'),'{}') as directors_names,
-            COALESCE (array_agg(DISTINCT p.full_name) FILTER (WHERE pfw.role='actor'),'{}') as actors_names, 
-            COALESCE (array_agg(DISTINCT p.full_name) FILTER (WHERE pfw.role='writer'),'{}') as writers_names,  
+            json_agg(
+                DISTINCT jsonb_build_object(
+                    'id', p.id,
+                    'full_name', p.full_name
+                )
+            ) FILTER (WHERE p.id is not null and pfw.role='actor'),
+            '[]'
+        ) as actors,
+
             COALESCE (
-                json_agg(
-                    DISTINCT jsonb_build_object(
-                        'id', p.id,
-                        'full_name', p.full_name
-                    )
-                ) FILTER (WHERE p.id is not null and pfw.role='director'),
-                '[]'
-            ) as directors,
-
-                COALESCE (
-                json_agg(
-                    DISTINCT jsonb_build_object(
-                        'id', p.id,
-                        'full_name', p.full_name
-                    )
-                ) FILTER (WHERE p.id is not null and pfw.role='actor'),
-                '[]'
-            ) as actors,
-
-                COALESCE (
-                json_agg(
-                    DISTINCT jsonb_build_object(
-                        'id', p.id,
-                        'full_name', p.full_name
-                    )
-                ) FILTER (WHERE p.id is not null and pfw.role='writer'),
-                '[]'
-            ) as writers
-            ,max(v.last_change_date) last_change_date
-
-            FROM content.film_work fw
-            LEFT JOIN content.person_film_work pfw ON pfw.film_work_id = fw.id
-            LEFT JOIN content.person p ON p.id = pfw.person_id
-            LEFT JOIN content.genre_film_work gfw ON gfw.film_work_id = fw.id
-            LEFT JOIN content.genre g ON g.id = gfw.genre_id
-            cross join lateral (values (fw.updated_at), (pfw.created_at), (p.updated_at), (gfw.created_at), (g.updated_at)) v(last_change_date)
-            GROUP BY fw.id
-            having max(v.last_change_date) > %s
-            ORDER BY fw.updated_at
-        """
-
-        cursor.execute(raw_sql, (last_sync_state, ))
-        while results := cursor.fetchmany(size=batch_size):
-            yield results
+            json_agg(
+                DISTINCT jsonb_build_object(
+                    'id', p.id,
+                    'full_name', p.full_name
+                )
+            ) FILTER (WHERE p.id is not null and pfw.role='writer'),
+            '[]'
+        ) as writers
+        ,max(v.last_change_date) last_change_date
+
+        FROM content.film_work fw
+        LEFT JOIN content.person_film_work pfw ON pfw.film_work_id = fw.id
+        LEFT JOIN content.person p ON p.id = pfw.person_id
+        LEFT JOIN content.genre_film_work gfw ON gfw.film_work_id = fw.id
+        LEFT JOIN content.genre g ON g.id = gfw.genre_id
+        -- переименования персон и жанров доходят до фильмов частичными обновлениями через индекс зависимостей
+        cross join lateral (values (fw.updated_at), (pfw.created_at), (gfw.created_at)) v(last_change_date)
+        WHERE (%(ids)s::uuid[] IS NULL OR fw.id = ANY(%(ids)s::uuid[]))
+            AND fw.id BETWEEN %(id_from)s::uuid AND %(id_to)s::uuid
+        GROUP BY fw.id
+        having (max(v.last_change_date), fw.id) > (%(last_change_date)s, %(last_id)s::uuid)
+        ORDER BY max(v.last_change_date), fw.id
+    """
+    params = {'ids': ids, 'last_change_date': last_sync_state, 'last_id': last_id or MIN_UUID}
+    yield from extract_documents(database_settings, raw_sql, params, batch_size, 'fetcher', copy_workers)
\ No newline at end of file
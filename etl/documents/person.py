@@ -5,7 +5,10 @@ import psycopg
 from elasticsearch_dsl import Document, Keyword, Text, InnerDoc, Nested
 from psycopg import ServerCursor
 from psycopg.conninfo import make_conninfo
-from psycopg.rows import class_row, dict_row
+from psycopg.rows import dict_row
+
+from documents import MIN_UUID
+from documents.extract import extract_documents
 
 
 class Film(InnerDoc):
@@ -52,64 +55,85 @@ class Person(Document):
 
 
 def get_person_index_data(
-        database_settings: dict, last_sync_state: datetime, batch_size: int = 100
-) -> Generator[list[Person], None, None]:
-    dsn = make_conninfo(**database_settings)
-
-    with psycopg.connect(dsn, row_factory=dict_row) as conn, ServerCursor(conn, 'fetcher') as cursor:
-        raw_sql = '''
-        WITH person_film_work_details AS (
-            SELECT
-                p.id AS person_id,
-                p.full_name as person_full_name,
-                pfw.film_work_id AS film_id,
-                pfw.role,
-                max(v.last_change_date) AS last_change_date
-            FROM
-                content.person p
-                JOIN content.person_film_work pfw ON p.id = pfw.person_id
-                JOIN content.film_work fw ON pfw.film_work_id = fw.id
-                cross join lateral (values (fw.updated_at), (pfw.created_at), (p.updated_at)) v(last_change_date)
-            GROUP BY p.id, film_work_id, pfw.role
-            having max(v.last_change_date) > %s
-        ),
-        film_roles AS (
-            SELECT
-                person_id,
-                film_id,
-                person_full_name,
-                ARRAY_AGG(role) AS roles,
-                MAX(last_change_date) AS last_change_date
-            FROM
-                person_film_work_details
-            GROUP BY
-                person_id, film_id, person_full_name
-        )
+        database_settings: dict,
+        last_sync_state: datetime,
+        batch_size: int = 100,
+        ids: list[str] | None = None,
+        last_id: str | None = None,
+        copy_workers: int = 0,
+) -> Generator[list[dict], None, None]:
+    """Документы персон в виде словарей, готовых к отправке в ES."""
+    raw_sql = '''
+    WITH person_film_work_details AS (
+        SELECT
+            p.id AS person_id,
+            p.full_name as person_full_name,
+            pfw.film_work_id AS film_id,
+            pfw.role,
+            max(v.last_change_date) AS last_change_date
+        FROM
+            content.person p
+            JOIN content.person_film_work pfw ON p.id = pfw.person_id
+            JOIN content.film_work fw ON pfw.film_work_id = fw.id
+            cross join lateral (values (fw.updated_at), (pfw.created_at), (p.updated_at)) v(last_change_date)
+        WHERE (%(ids)s::uuid[] IS NULL OR p.id = ANY(%(ids)s::uuid[]))
+            AND p.id BETWEEN %(id_from)s::uuid AND %(id_to)s::uuid
+        GROUP BY p.id, film_work_id, pfw.role
+        having max(v.last_change_date) >= %(last_change_date)s
+    ),
+    film_roles AS (
         SELECT
             person_id,
+            film_id,
             person_full_name,
-            JSON_AGG(
-                JSON_BUILD_OBJECT(
-                    'id', film_id,
-                    'roles', roles
-                )
-            ) AS films,
-            MAX(last_change_date) as last_change_date
+            ARRAY_AGG(role) AS roles,
+            MAX(last_change_date) AS last_change_date
         FROM
-            film_roles
+            person_film_work_details
         GROUP BY
-            person_id, person_full_name
+            person_id, film_id, person_full_name
+    )
+    SELECT
+        person_id::text AS id,
+        person_full_name AS full_name,
+        JSON_AGG(
+            JSON_BUILD_OBJECT(
+                'id', film_id,
+                'roles', roles
+            )
+        ) AS films,
+        MAX(last_change_date) as last_change_date
+    FROM
+        film_roles
+    GROUP BY
+        person_id, person_full_name
+    HAVING (MAX(last_change_date), person_id) > (%(last_change_date)s, %(last_id)s::uuid)
+    ORDER BY MAX(last_change_date), person_id
+    '''
+    params = {'ids': ids, 'last_change_date': last_sync_state, 'last_id': last_id or MIN_UUID}
+    yield from extract_documents(database_settings, raw_sql, params, batch_size, 'fetcher', copy_workers)
+
+
+def get_changed_persons(
+        database_settings: dict,
+        last_sync_state: datetime,
+        batch_size: int = 100,
+        ids: list[str] | None = None,
+        last_id: str | None = None,
+) -> Generator[list[dict], None, None]:
+    """Персоны, изменённые после курсора (last_sync_state, last_id): их имена встроены в документы фильмов."""
+    dsn = make_conninfo(**database_settings)
+
+    with psycopg.connect(dsn, row_factory=dict_row) as conn, ServerCursor(conn, 'changed_persons') as cursor:
+        raw_sql = '''
+        SELECT id::text AS id, full_name, updated_at AS last_change_date
+        FROM content.person
+        WHERE (%(ids)s::uuid[] IS NULL OR id = ANY(%(ids)s::uuid[]))
+            AND (updated_at, id) > (%(last_change_date)s, %(last_id)s::uuid)
+        ORDER BY updated_at, id
         '''
-        cursor.execute(raw_sql, params=(last_sync_state,))
+        params = {'ids': ids, 'last_change_date': last_sync_state, 'last_id': last_id or MIN_UUID}
+        cursor.execute(raw_sql, params=params)
 
         while results := cursor.fetchmany(size=batch_size):
-            persons = []
-            for result in results:
-                person = Person(
-                    id=result['person_id'],
-                    full_name=result['person_full_name'],
-                    films=[Film(id=film['id'], roles=film['roles']) for film in result['films']],
-                    last_change_date=result['last_change_date']
-                )
-                persons.append(person)
-            yield persons
+            yield results
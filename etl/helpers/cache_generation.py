@@ -0,0 +1,45 @@
+from typing import Iterable
+
+from redis import Redis
+
+from settings import settings
+
+GENERATION_KEY = 'cache:generation:{index}'
+# movie_service кэширует документы по id под ключами вида film:{id}
+DOCUMENT_KEY_PREFIXES = {'movies': 'film', 'persons': 'person', 'genres': 'genre'}
+
+
+def bump_cache_generation(index: str) -> int:
+    """Invalidate every cached list of the index in movie_service.
+
+    movie_service tags list cache keys with the index generation, so incrementing it
+    makes all of them unreachable at once. Publishing the generation key evicts the
+    value kept in the in-process cache tier of each movie_service pod.
+    """
+    redis_settings = settings.redis_settings
+    generation_key = GENERATION_KEY.format(index=index)
+
+    with Redis(host=redis_settings.host, port=redis_settings.port) as redis:
+        generation = redis.incr(generation_key)
+        redis.publish(redis_settings.cache_invalidation_channel, generation_key)
+    return generation
+
+
+def drop_cached_documents(index: str, ids: Iterable[str]) -> None:
+    """Удалить из кэша movie_service документы индекса, закэшированные по id.
+
+    Ключи удаляются из Redis и публикуются в канал инвалидации, чтобы каждый под
+    вытеснил их из in-process кэша.
+    """
+    prefix = DOCUMENT_KEY_PREFIXES.get(index)
+    keys = [f'{prefix}:{_id}' for _id in ids]
+    if prefix is None or not keys:
+        return
+
+    redis_settings = settings.redis_settings
+    with Redis(host=redis_settings.host, port=redis_settings.port) as redis:
+        with redis.pipeline(transaction=False) as pipe:
+            pipe.delete(*keys)
+            for key in keys:
+                pipe.publish(redis_settings.cache_invalidation_channel, key)
+            pipe.execute()
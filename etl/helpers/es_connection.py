@@ -0,0 +1,15 @@
+from elasticsearch.serializer import OrjsonSerializer
+from elasticsearch_dsl import connections
+
+from settings import settings
+
+
+def create_es_connection() -> None:
+    """Подключение по умолчанию для elasticsearch_dsl и bulk-загрузки.
+
+    Документы сериализуются в NDJSON через orjson: это заметная часть CPU при полной загрузке.
+    """
+    connections.create_connection(
+        hosts=settings.elasticsearch_settings.get_host(),
+        serializer=OrjsonSerializer(),
+    )
@@ -1,64 +1,199 @@
 import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
 from datetime import datetime
-from typing import Generator, Any, Type, Callable
 
 import pytz
-from dateutil import parser
-from elasticsearch.helpers import bulk
-from elasticsearch_dsl import connections, Document
+from redis import Redis
 
+from cdc import LogicalReplicationSource, reindex_documents
+from dependencies import DependencyIndex, propagate_changes, sync_entity_changes
 from documents.movie import Movie, get_movie_index_data
-from documents.person import Person, get_person_index_data
-from documents.genre import Genre, get_genre_index_data
-from helpers.backoff_func_wrapper import backoff
+from documents.person import Person, get_changed_persons, get_person_index_data
+from documents.genre import Genre, get_changed_genres, get_genre_index_data
+from helpers.es_connection import create_es_connection
 from logger import logger
+from notifications import ChangeListener
+from pipeline import IndexPipeline
 from settings import settings
-from state_manager.json_file_storage import JsonFileStorage
-from state_manager.state_manager import StateManager
-
-
-DataLoader = Callable[[dict, datetime, int], Generator[list[Type[Document]], None, None]]
-
-@backoff(0.1, 2, 10, logger)
-def _send_to_es(es_load_data:  Generator[dict[str, Any], Any, None]):
-    bulk(
-        connections.get_connection(),
-        es_load_data,
-    )
-
-
-def update_index(state_name: str, es_model: Type[Document], get_data_function: DataLoader):
-    state_manager = StateManager(JsonFileStorage(logger=logger))
-
-    last_sync_state = state_manager.get_state(state_name)
+from state_manager.factory import create_state_manager
+from state_manager.state_manager import Lease, LeaseLostError, StateManager
+
+MOVIE_STATE_NAME = 'movie_index_last_sync_state'
+
+INDEXES = (
+    ('person_index_last_sync_state', Person, get_person_index_data),
+    (MOVIE_STATE_NAME, Movie, get_movie_index_data),
+    ('genre_index_last_sync_state', Genre, get_genre_index_data),
+)
+INDEXES_BY_NAME = {es_model._index._name: (es_model, get_data_function) for _, es_model, get_data_function in INDEXES}
+EMBEDDED_ENTITIES = (
+    ('person', get_changed_persons),
+    ('genre', get_changed_genres),
+)
+
+
+def sync_indexes(state_manager: StateManager, dependency_index: DependencyIndex) -> None:
+    etl_settings = settings.etl_settings
+    database_settings = settings.database_settings.get_dsn()
+    started_at = datetime.now(pytz.UTC)
+
+    # копии персон и жанров обновляются в фильмах под арендой индекса фильмов:
+    # пока его перестраивают, изменения ждут и после переключения алиаса попадают в новый индекс
+    try:
+        with state_manager.lease(f'index:{Movie._index._name}') as lease:
+            if lease is not None:
+                for kind, get_changed_entities in EMBEDDED_ENTITIES:
+                    try:
+                        sync_entity_changes(
+                            dependency_index, state_manager, kind, get_changed_entities,
+                            database_settings, etl_settings.batch_size, started_at,
+                        )
+                    except Exception as e:
+                        logger.exception(f'Failed to propagate {kind} changes: {e}')
+    except Exception as e:
+        logger.exception(f'Failed to propagate person and genre changes: {e}')
+
+    # без индекса зависимостей переименования не дойдут до фильмов: строим его полной загрузкой фильмов
+    dependency_index_built = dependency_index.is_built()
+
+    pipelines = [
+        IndexPipeline(
+            state_name,
+            es_model,
+            get_data_function,
+            state_manager,
+            batch_size=etl_settings.batch_size,
+            queue_size=etl_settings.queue_size,
+            load_workers=etl_settings.load_workers,
+            checkpoint_batches=etl_settings.checkpoint_batches,
+            copy_workers=etl_settings.copy_workers,
+            on_batch=dependency_index.update_movies if es_model is Movie else None,
+            full_reload=es_model is Movie and not dependency_index_built,
+        )
+        for state_name, es_model, get_data_function in INDEXES
+    ]
+
+    with ThreadPoolExecutor(max_workers=etl_settings.index_concurrency, thread_name_prefix='index') as executor:
+        futures = {executor.submit(pipeline.run): pipeline.index_name for pipeline in pipelines}
+
+    for future, index_name in futures.items():
+        if future.exception() is not None:
+            logger.exception(f'Failed to sync {index_name}', exc_info=future.exception())
+        elif index_name == Movie._index._name and not dependency_index_built and future.result() is not None:
+            dependency_index.mark_built()
+
+
+def sync_changes(
+    source: LogicalReplicationSource, state_manager: StateManager, dependency_index: DependencyIndex
+) -> bool:
+    """Переиндексировать документы, затронутые очередной порцией изменений, вернуть False, если их не было
+    или затронутый индекс перестраивается: слот не сдвигается, и порция применится после переключения алиаса.
+    """
+    changes, commit_lsn = source.peek()
+    if commit_lsn is None:
+        return False
+
+    etl_settings = settings.etl_settings
+    database_settings = settings.database_settings.get_dsn()
+    affected, embedded = source.get_affected_ids(changes)
+    index_names = set(affected) | ({Movie._index._name} if embedded else set())
+
+    with ExitStack() as stack:
+        for index_name in sorted(index_names):
+            if stack.enter_context(state_manager.lease(f'index:{index_name}')) is None:
+                logger.debug(f'{index_name} is synced by another worker, changes wait')
+                return False
+
+        for index_name, ids in affected.items():
+            es_model, get_data_function = INDEXES_BY_NAME[index_name]
+            on_batch = dependency_index.update_movies if es_model is Movie else None
+            reindex_documents(database_settings, es_model, get_data_function, ids, etl_settings.batch_size, on_batch)
+
+        since = pytz.UTC.localize(datetime.min)
+        for kind, get_changed_entities in EMBEDDED_ENTITIES:
+            if kind in embedded:
+                for entities in get_changed_entities(database_settings, since, etl_settings.batch_size,
+                                                     ids=list(embedded[kind])):
+                    propagate_changes(dependency_index, kind, entities)
+
+        source.advance(commit_lsn)
+    return True
+
+
+def run_polling(state_manager: StateManager, dependency_index: DependencyIndex) -> None:
+    while True:
+        try:
+            sync_indexes(state_manager, dependency_index)
+        except Exception as e:
+            logger.exception(e)
+        time.sleep(settings.etl_settings.sync_interval)
 
-    if last_sync_state is None:
-        last_sync_state = pytz.UTC.localize(datetime.min)
-    else:
-        last_sync_state = parser.isoparse(last_sync_state)
 
-    connections.create_connection(hosts=settings.elasticsearch_settings.get_host())
+def run_notify(state_manager: StateManager, dependency_index: DependencyIndex) -> None:
+    """Синхронизировать индексы по событиям admin_service, редкий опрос подстраховывает изменения в обход админки."""
+    etl_settings = settings.etl_settings
+    listener = ChangeListener(settings.database_settings.get_dsn(), etl_settings.notify_channel)
+    # подписываемся до первой синхронизации, чтобы не пропустить изменения во время неё
+    listener.listen()
 
-    es_model.init()
+    while True:
+        try:
+            sync_indexes(state_manager, dependency_index)
+        except Exception as e:
+            logger.exception(e)
+        changes = listener.wait_for_changes(
+            etl_settings.safety_poll_interval, etl_settings.notify_debounce, etl_settings.notify_max_delay
+        )
+        logger.debug(f'Syncing after {changes} content changes' if changes else 'Syncing by safety poll')
 
-    for rows in get_data_function(settings.database_settings.get_dsn(), last_sync_state, 100):
-        es_load_data = (dict(d.to_dict(True, skip_empty=False), **{'_id': d.id}) for d in rows)
 
-        _send_to_es(es_load_data)
+def run_cdc(state_manager: StateManager, dependency_index: DependencyIndex) -> None:
+    etl_settings = settings.etl_settings
+    source = LogicalReplicationSource(
+        settings.database_settings.get_dsn(), etl_settings.cdc_slot_name, etl_settings.cdc_max_changes
+    )
 
-        last_change_date = pytz.UTC.localize(max(item.last_change_date for item in rows))
-        if last_change_date > last_sync_state:
-            last_sync_state = last_change_date
+    # полная синхронизация догоняет всё, что изменилось до создания слота
+    source.ensure_slot()
+    sync_indexes(state_manager, dependency_index)
 
-    state_manager.set_state(state_name, last_sync_state.isoformat())
+    # слот читает один воркер, остальные ждут, пока его аренда не истечёт
+    while True:
+        try:
+            with state_manager.lease(f'cdc:{etl_settings.cdc_slot_name}') as lease:
+                if lease is not None:
+                    consume_changes(source, state_manager, dependency_index, lease)
+        except LeaseLostError as e:
+            logger.warning(e)
+        except Exception as e:
+            logger.exception(e)
+        time.sleep(etl_settings.cdc_poll_interval)
 
 
-if __name__ == '__main__':
+def consume_changes(
+    source: LogicalReplicationSource, state_manager: StateManager, dependency_index: DependencyIndex, lease: Lease
+) -> None:
     while True:
+        lease.check()
         try:
-            update_index('person_index_last_sync_state', Person, get_person_index_data)
-            update_index('movie_index_last_sync_state', Movie, get_movie_index_data)
-            update_index('genre_index_last_sync_state', Genre, get_genre_index_data)
-            time.sleep(60)
+            if sync_changes(source, state_manager, dependency_index):
+                continue
         except Exception as e:
             logger.exception(e)
+        time.sleep(settings.etl_settings.cdc_poll_interval)
+
+
+if __name__ == '__main__':
+    create_es_connection()
+    redis_settings = settings.redis_settings
+    redis = Redis(host=redis_settings.host, port=redis_settings.port)
+    dependency_index = DependencyIndex(redis)
+    state_manager = create_state_manager(redis)
+
+    if settings.etl_settings.mode == 'cdc':
+        run_cdc(state_manager, dependency_index)
+    elif settings.etl_settings.mode == 'notify':
+        run_notify(state_manager, dependency_index)
+    else:
+        run_polling(state_manager, dependency_index)
@@ -0,0 +1,71 @@
+import select
+import time
+
+import psycopg
+from psycopg import Notify, sql
+from psycopg.conninfo import make_conninfo
+
+from logger import logger
+
+
+class ChangeListener:
+    """Подписка на события об изменениях контента, которые admin_service отправляет через NOTIFY.
+
+    Содержимое событий не важно: синхронизация всё равно идёт по курсору,
+    события лишь говорят, что пора её запустить.
+    """
+
+    def __init__(self, database_settings: dict, channel: str) -> None:
+        self.dsn = make_conninfo(**database_settings)
+        self.channel = channel
+        self._conn: psycopg.Connection | None = None
+        self._received = 0
+
+    def listen(self) -> None:
+        self._conn = psycopg.connect(self.dsn, autocommit=True)
+        self._conn.add_notify_handler(self._on_notify)
+        self._conn.execute(sql.SQL('LISTEN {}').format(sql.Identifier(self.channel)))
+
+    def wait_for_changes(self, timeout: float, debounce: float, max_delay: float) -> int:
+        """Дождаться изменений и вернуть число полученных событий, 0 - по таймауту.
+
+        После первого события ждём, пока события не перестанут приходить в течение debounce
+        секунд, но не дольше max_delay: серия сохранений в админке даёт одну синхронизацию.
+        """
+        try:
+            if self._conn is None or self._conn.closed:
+                self.listen()
+                # пока соединения не было, события могли потеряться
+                return 1
+
+            self._received = 0
+            if not self._poll(timeout):
+                return 0
+
+            deadline = time.monotonic() + max_delay
+            while (remaining := deadline - time.monotonic()) > 0 and self._poll(min(debounce, remaining)):
+                pass
+            return self._received
+        except psycopg.Error as e:
+            logger.warning(f'Listening on {self.channel} failed with {e}, reconnecting')
+            self.close()
+            time.sleep(min(debounce, timeout))
+            return 0
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _poll(self, timeout: float) -> bool:
+        """Дождаться данных от сервера не дольше timeout, вернуть True, если пришли события."""
+        received = self._received
+        readable, _, _ = select.select([self._conn], [], [], timeout)
+        if readable:
+            # обработчики уведомлений вызываются, когда соединение читает ответ сервера
+            self._conn.execute('SELECT 1')
+        return self._received > received
+
+    def _on_notify(self, notify: Notify) -> None:
+        self._received += 1
+        logger.debug(f'Content change on {notify.channel}: {notify.payload}')
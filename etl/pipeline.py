@@ -0,0 +1,349 @@
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from queue import Queue
+from typing import Any, Callable, Generator, Type
+
+import pytz
+from dateutil import parser
+from elasticsearch_dsl import connections, Document
+from redis.exceptions import RedisError
+
+from bulk import send_to_es
+from helpers.cache_generation import bump_cache_generation, drop_cached_documents
+from logger import logger
+from settings import settings
+from state_manager.state_manager import Lease, StateManager
+
+# загрузчики отдают документы словарями: классы Document нужны только для маппингов индексов
+DataLoader = Callable[..., Generator[list[dict[str, Any]], None, None]]
+
+_DONE = object()
+
+
+@dataclass
+class StageStats:
+    name: str
+    rows: int = 0
+    seconds: float = 0.0
+
+    def __str__(self) -> str:
+        rate = self.rows / self.seconds if self.seconds else 0.0
+        return f'{self.name} {self.rows} rows in {self.seconds:.2f}s ({rate:.0f} rows/s)'
+
+
+@dataclass(frozen=True, order=True)
+class Checkpoint:
+    """Курсор синхронизации: документы упорядочены по (last_change_date, id)."""
+
+    last_change_date: datetime
+    id: str = ''
+
+    @classmethod
+    def from_state(cls, state: str | dict | None) -> 'Checkpoint':
+        if state is None:
+            return cls(pytz.UTC.localize(datetime.min))
+        # до перехода на курсор в состоянии хранилась только дата
+        if isinstance(state, str):
+            return cls(parser.isoparse(state))
+        return cls(parser.isoparse(state['last_change_date']), state['id'])
+
+    @classmethod
+    def from_row(cls, row: dict[str, Any]) -> 'Checkpoint':
+        return cls(pytz.UTC.localize(row['last_change_date']), row['id'])
+
+    def to_state(self) -> dict[str, str]:
+        return {'last_change_date': self.last_change_date.isoformat(), 'id': self.id}
+
+
+class CheckpointTracker:
+    """Продвигает курсор только по непрерывному префиксу подтверждённых пачек.
+
+    Загрузчики подтверждают пачки не по порядку, а сохранённый курсор не должен
+    перескочить через пачку, которая ещё не записана в ES. Если строки читаются
+    без порядка (холодная загрузка через COPY), курсор сдвигается на максимум
+    только после того, как подтверждены все пачки.
+    """
+
+    def __init__(self, checkpoint: Checkpoint, ordered: bool = True) -> None:
+        self.checkpoint = checkpoint
+        self.ordered = ordered
+        self._next_seq = 0
+        self._acknowledged: dict[int, Checkpoint] = {}
+        self._latest = checkpoint
+
+    def acknowledge(self, seq: int, checkpoint: Checkpoint) -> int:
+        """Подтвердить пачку, вернуть число пачек, на которые сдвинулся курсор."""
+        if not self.ordered:
+            self._latest = max(self._latest, checkpoint)
+            return 0
+        self._acknowledged[seq] = checkpoint
+        advanced = 0
+        while self._next_seq in self._acknowledged:
+            self.checkpoint = self._acknowledged.pop(self._next_seq)
+            self._next_seq += 1
+            advanced += 1
+        return advanced
+
+    def complete(self) -> None:
+        """Все пачки загружены."""
+        if not self.ordered:
+            self.checkpoint = self._latest
+
+
+@dataclass
+class Batch:
+    seq: int
+    actions: list[dict[str, Any]]
+    checkpoint: Checkpoint
+
+
+def get_index_actions(rows: list[dict[str, Any]], index_name: str) -> list[dict[str, Any]]:
+    """Bulk-действия без копирования документов: строка из Postgres уходит в _source как есть."""
+    return [{'_index': index_name, '_id': row['id'], '_source': row} for row in rows]
+
+
+def bump_index_cache_generation(index_name: str, synced_rows: int) -> None:
+    try:
+        generation = bump_cache_generation(index_name)
+        logger.info(f'Synced {synced_rows} documents to {index_name}, cache generation {generation}')
+    except RedisError as e:
+        logger.warning(f'Failed to bump cache generation of {index_name}: {e}')
+
+
+def invalidate_cached_documents(index_name: str, ids: list[str]) -> None:
+    try:
+        drop_cached_documents(index_name, ids)
+    except RedisError as e:
+        logger.warning(f'Failed to invalidate {len(ids)} cached documents of {index_name}: {e}')
+
+
+def init_index(es_model: Type[Document]) -> None:
+    """Создать индекс модели или обновить его маппинг.
+
+    После первой перестройки имя индекса модели - алиас, а маппинг обновляется
+    у индекса, на который он указывает.
+    """
+    es = connections.get_connection()
+    alias = es_model._index._name
+    if es.indices.exists_alias(name=alias):
+        for index_name in es.indices.get_alias(name=alias):
+            es_model.init(index=index_name)
+    else:
+        es_model.init()
+
+
+class IndexPipeline:
+    """Синхронизация одного индекса: чтение из Postgres, преобразование и загрузка в ES.
+
+    Этапы работают в отдельных потоках и связаны ограниченными очередями,
+    поэтому чтение следующей пачки из Postgres идёт одновременно с записью предыдущей в ES.
+    """
+
+    def __init__(
+        self,
+        state_name: str,
+        es_model: Type[Document],
+        get_data_function: DataLoader,
+        state_manager: StateManager,
+        batch_size: int,
+        queue_size: int,
+        load_workers: int,
+        checkpoint_batches: int,
+        copy_workers: int = 0,
+        on_batch: Callable[[list[dict[str, Any]]], None] | None = None,
+        full_reload: bool = False,
+        target_index: str | None = None,
+    ) -> None:
+        self.state_name = state_name
+        self.es_model = es_model
+        self.get_data_function = get_data_function
+        self.state_manager = state_manager
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.load_workers = load_workers
+        self.checkpoint_batches = checkpoint_batches
+        self.copy_workers = copy_workers
+        self.on_batch = on_batch
+        self.full_reload = full_reload
+        self.target_index = target_index
+
+        self.index_name = es_model._index._name
+        self.fetch_stats = StageStats('fetch')
+        self.transform_stats = StageStats('transform')
+        self.load_stats = StageStats('load')
+
+        self._lock = threading.RLock()
+        self._failed = threading.Event()
+        self._error: Exception | None = None
+        self._lease: Lease | None = None
+        self._tracker: CheckpointTracker | None = None
+        self._saved_checkpoint: Checkpoint | None = None
+        self._unsaved_batches = 0
+        self._cold_load = False
+
+    @property
+    def checkpoint(self) -> Checkpoint | None:
+        """Курсор последней подтверждённой пачки."""
+        return self._tracker.checkpoint if self._tracker is not None else None
+
+    def run(self) -> int | None:
+        """Синхронизировать индекс, вернуть число загруженных документов.
+
+        Индекс синхронизирует только воркер, захвативший его аренду, остальные получают None.
+        """
+        with self.state_manager.lease(f'index:{self.index_name}') as lease:
+            if lease is None:
+                logger.debug(f'{self.index_name} is synced by another worker')
+                return None
+            return self.sync(lease)
+
+    def sync(self, lease: Lease) -> int:
+        """Синхронизировать индекс под уже захваченной арендой.
+
+        Документы пишутся в target_index, если он задан (новый индекс при полной перестройке),
+        иначе в индекс или алиас модели. Загрузка с нуля при copy_workers > 0 читает
+        Postgres через COPY в несколько соединений.
+        """
+        self._lease = lease
+        checkpoint = self._get_checkpoint()
+        self._cold_load = self.copy_workers > 0 and checkpoint == Checkpoint.from_state(None)
+        self._tracker = CheckpointTracker(checkpoint, ordered=not self._cold_load)
+        self._saved_checkpoint = checkpoint
+        if self.target_index is None:
+            init_index(self.es_model)
+
+        fetched: Queue = Queue(maxsize=self.queue_size)
+        transformed: Queue = Queue(maxsize=self.queue_size)
+
+        threads = [
+            threading.Thread(target=self._fetch, args=(checkpoint, fetched), name=f'{self.index_name}-fetch'),
+            threading.Thread(target=self._transform, args=(fetched, transformed), name=f'{self.index_name}-transform'),
+        ]
+        threads += [
+            threading.Thread(target=self._load, args=(transformed,), name=f'{self.index_name}-load-{number}')
+            for number in range(self.load_workers)
+        ]
+
+        started = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - started
+
+        # подтверждённый префикс сохраняется и после ошибки: следующий запуск продолжит с него
+        with self._lock:
+            if self._error is None:
+                self._tracker.complete()
+            self._save_checkpoint()
+        if self.load_stats.rows:
+            bump_index_cache_generation(self.index_name, self.load_stats.rows)
+
+        if self._error is not None:
+            raise self._error
+
+        logger.info(
+            f'{self.index_name}: {self.fetch_stats}, {self.transform_stats}, {self.load_stats}, '
+            f'total {elapsed:.2f}s'
+        )
+        return self.load_stats.rows
+
+    def _get_checkpoint(self) -> Checkpoint:
+        if self.full_reload:
+            return Checkpoint.from_state(None)
+        return Checkpoint.from_state(self.state_manager.get_state(self.state_name))
+
+    def _save_checkpoint(self) -> None:
+        checkpoint = self._tracker.checkpoint
+        if checkpoint == self._saved_checkpoint:
+            return
+        self._lease.check()
+        self.state_manager.set_state(self.state_name, checkpoint.to_state())
+        self._saved_checkpoint = checkpoint
+        self._unsaved_batches = 0
+
+    def _fetch(self, checkpoint: Checkpoint, sink: Queue) -> None:
+        rows = None
+        try:
+            rows = self.get_data_function(
+                settings.database_settings.get_dsn(),
+                checkpoint.last_change_date,
+                self.batch_size,
+                last_id=checkpoint.id or None,
+                copy_workers=self.copy_workers if self._cold_load else 0,
+            )
+            while not self._failed.is_set():
+                self._lease.check()
+                started = time.monotonic()
+                batch = next(rows, None)
+                self.fetch_stats.seconds += time.monotonic() - started
+                if batch is None:
+                    break
+                self.fetch_stats.rows += len(batch)
+                sink.put(batch)
+        except Exception as e:
+            self._fail(e)
+        finally:
+            if rows is not None:
+                rows.close()
+            sink.put(_DONE)
+
+    def _transform(self, source: Queue, sink: Queue) -> None:
+        write_index = self.target_index or self.index_name
+        seq = 0
+        try:
+            while (rows := source.get()) is not _DONE:
+                if self._failed.is_set():
+                    continue
+                started = time.monotonic()
+                try:
+                    # обычно строки отсортированы по курсору и последняя строка - верхняя граница пачки
+                    if self._cold_load:
+                        checkpoint = max(Checkpoint.from_row(row) for row in rows)
+                    else:
+                        checkpoint = Checkpoint.from_row(rows[-1])
+                    batch = Batch(seq=seq, actions=get_index_actions(rows, write_index), checkpoint=checkpoint)
+                    seq += 1
+                    if self.on_batch is not None:
+                        self.on_batch(rows)
+                except Exception as e:
+                    self._fail(e)
+                    continue
+                self.transform_stats.seconds += time.monotonic() - started
+                self.transform_stats.rows += len(rows)
+                sink.put(batch)
+        finally:
+            for _ in range(self.load_workers):
+                sink.put(_DONE)
+
+    def _load(self, source: Queue) -> None:
+        while (batch := source.get()) is not _DONE:
+            if self._failed.is_set():
+                continue
+            started = time.monotonic()
+            try:
+                send_to_es(batch.actions)
+            except Exception as e:
+                self._fail(e)
+                continue
+            # новый индекс при перестройке ещё не читают, в кэше лежат документы живого
+            if self.target_index is None:
+                invalidate_cached_documents(self.index_name, [action['_id'] for action in batch.actions])
+            with self._lock:
+                self.load_stats.seconds += time.monotonic() - started
+                self.load_stats.rows += len(batch.actions)
+                self._unsaved_batches += self._tracker.acknowledge(batch.seq, batch.checkpoint)
+                if self._unsaved_batches >= self.checkpoint_batches:
+                    try:
+                        self._save_checkpoint()
+                    except Exception as e:
+                        self._fail(e)
+
+    def _fail(self, error: Exception) -> None:
+        with self._lock:
+            if self._error is None:
+                self._error = error
+        self._failed.set()
+
@@ -0,0 +1,184 @@
+"""Полная перестройка индексов без простоя.
+
+Новый индекс с временной меткой в имени заполняется с отключённым refresh и без реплик,
+после загрузки сливается в один сегмент, получает обычные настройки и одним запросом
+_aliases занимает место прежнего индекса под алиасом, который читает movie_service.
+Пока идёт перестройка, её аренду index:{alias} ждут все, кто пишет в алиас: опрос,
+CDC и обновление копий персон и жанров в фильмах. Их изменения не сдвигают курсоры
+и слот и после переключения алиаса попадают в новый индекс.
+
+Запуск: python reindex.py movies persons genres
+"""
+import argparse
+import time
+from datetime import datetime
+from typing import Type
+
+import pytz
+from elasticsearch_dsl import connections, Document
+from redis import Redis
+
+from dependencies import DependencyIndex
+from documents.movie import Movie
+from helpers.es_connection import create_es_connection
+from logger import logger
+from main import INDEXES
+from pipeline import DataLoader, IndexPipeline, bump_index_cache_generation
+from settings import settings
+from state_manager.factory import create_state_manager
+from state_manager.state_manager import Lease, LeaseLostError, StateManager
+
+BULK_SETTINGS = {'refresh_interval': '-1', 'number_of_replicas': 0}
+DEFAULT_REFRESH_INTERVAL = '1s'
+# слияние и размещение реплик большого индекса идут дольше 10 секунд таймаута клиента по умолчанию
+FINALIZE_REQUEST_TIMEOUT = 600
+FORCEMERGE_POLL_INTERVAL = 10
+
+
+def create_bulk_index(es_model: Type[Document], index_name: str) -> None:
+    index = es_model._index.clone(name=index_name)
+    index.settings(**BULK_SETTINGS)
+    index.create()
+
+
+def get_live_indexes(alias: str) -> list[str]:
+    """Индексы под алиасом; до первой перестройки алиаса нет, и под его именем лежит обычный индекс."""
+    es = connections.get_connection()
+    if es.indices.exists_alias(name=alias):
+        return list(es.indices.get_alias(name=alias))
+    return []
+
+
+def get_replicas(index_name: str | None) -> str | None:
+    """Число реплик живого индекса, None - оставить значение кластера по умолчанию."""
+    if index_name is None:
+        return None
+    es = connections.get_connection()
+    response = es.indices.get_settings(index=index_name, name='index.number_of_replicas')
+    return next(iter(response.values()))['settings']['index']['number_of_replicas']
+
+
+def force_merge(index_name: str, lease: Lease) -> None:
+    """Слить индекс в один сегмент фоновой задачей и дождаться её, продлевая аренду."""
+    es = connections.get_connection()
+    task_id = es.indices.forcemerge(index=index_name, max_num_segments=1, wait_for_completion=False)['task']
+    while not (task := es.tasks.get(task_id=task_id))['completed']:
+        lease.check()
+        time.sleep(FORCEMERGE_POLL_INTERVAL)
+    if 'error' in task:
+        raise RuntimeError(f'Force merge of {index_name} failed: {task["error"]}')
+
+
+def finalize_index(es_model: Type[Document], index_name: str, replicas: str | None, lease: Lease) -> None:
+    es = connections.get_connection().options(request_timeout=FINALIZE_REQUEST_TIMEOUT)
+    es.indices.refresh(index=index_name)
+    try:
+        force_merge(index_name, lease)
+    except LeaseLostError:
+        raise
+    except Exception as e:
+        # индекс и без слияния полон, сегменты сольются фоном
+        logger.warning(f'Failed to force merge {index_name}: {e}')
+    es.indices.put_settings(
+        index=index_name,
+        settings={
+            'refresh_interval': es_model._index._settings.get('refresh_interval', DEFAULT_REFRESH_INTERVAL),
+            'number_of_replicas': replicas,
+        },
+    )
+    es.cluster.health(index=index_name, wait_for_status='yellow', timeout=f'{FINALIZE_REQUEST_TIMEOUT}s')
+
+
+def swap_alias(alias: str, index_name: str) -> list[str]:
+    """Атомарно перевести алиас на новый индекс, вернуть прежние индексы."""
+    es = connections.get_connection()
+    previous = get_live_indexes(alias)
+    actions = [{'add': {'index': index_name, 'alias': alias}}]
+    actions += [{'remove': {'index': previous_index, 'alias': alias}} for previous_index in previous]
+    if not previous and es.indices.exists(index=alias):
+        # индекс, созданный до перехода на алиасы, удаляется в том же запросе
+        actions.append({'remove_index': {'index': alias}})
+    es.indices.update_aliases(actions=actions)
+    return previous
+
+
+def rebuild_index(
+    state_manager: StateManager,
+    dependency_index: DependencyIndex,
+    state_name: str,
+    es_model: Type[Document],
+    get_data_function: DataLoader,
+) -> None:
+    etl_settings = settings.etl_settings
+    alias = es_model._index._name
+    index_name = f'{alias}_{datetime.now(pytz.UTC):%Y%m%d%H%M%S}'
+    # курсор новой загрузки хранится отдельно: до переключения алиаса живой индекс синхронизируется по своему
+    rebuild_state_name = f'{state_name}:{index_name}'
+
+    # пока аренда у перестройки, все, кто пишет в этот индекс, ждут
+    with state_manager.lease(f'index:{alias}') as lease:
+        if lease is None:
+            raise RuntimeError(f'{alias} is synced by another worker, retry later')
+
+        live_indexes = get_live_indexes(alias)
+        replicas = get_replicas(live_indexes[0] if live_indexes else None)
+        create_bulk_index(es_model, index_name)
+        logger.info(f'Rebuilding {alias} into {index_name}')
+
+        pipeline = IndexPipeline(
+            rebuild_state_name,
+            es_model,
+            get_data_function,
+            state_manager,
+            batch_size=etl_settings.batch_size,
+            queue_size=etl_settings.queue_size,
+            load_workers=etl_settings.load_workers,
+            checkpoint_batches=etl_settings.checkpoint_batches,
+            copy_workers=etl_settings.copy_workers,
+            on_batch=dependency_index.update_movies if es_model is Movie else None,
+            full_reload=True,
+            target_index=index_name,
+        )
+        try:
+            rows = pipeline.sync(lease)
+        except Exception:
+            connections.get_connection().indices.delete(index=index_name, ignore_unavailable=True)
+            raise
+        finally:
+            state_manager.set_state(rebuild_state_name, None)
+
+        try:
+            finalize_index(es_model, index_name, replicas, lease)
+            lease.check()
+        except Exception:
+            # загруженный индекс не удаляется: его можно доделать и переключить алиас вручную
+            logger.error(f'{index_name} is loaded with {rows} documents but not finalized, {alias} is not swapped')
+            raise
+
+        previous = swap_alias(alias, index_name)
+        state_manager.set_state(state_name, pipeline.checkpoint.to_state())
+        if es_model is Movie:
+            dependency_index.mark_built()
+
+    for previous_index in previous:
+        connections.get_connection().indices.delete(index=previous_index, ignore_unavailable=True)
+    bump_index_cache_generation(alias, rows)
+    logger.info(f'{alias} now points to {index_name} with {rows} documents')
+
+
+if __name__ == '__main__':
+    indexes = {es_model._index._name: (state_name, es_model, get_data_function)
+               for state_name, es_model, get_data_function in INDEXES}
+
+    arg_parser = argparse.ArgumentParser(description='Rebuild Elasticsearch indexes and swap their aliases')
+    arg_parser.add_argument('indexes', nargs='+', choices=sorted(indexes))
+    args = arg_parser.parse_args()
+
+    create_es_connection()
+    redis_settings = settings.redis_settings
+    redis = Redis(host=redis_settings.host, port=redis_settings.port)
+    dependency_index = DependencyIndex(redis)
+    state_manager = create_state_manager(redis)
+
+    for alias in args.indexes:
+        rebuild_index(state_manager, dependency_index, *indexes[alias])
@@ -1,3 +1,7 @@
+import os
+import socket
+from typing import Literal
+
 from pydantic import Field, Extra
 from pydantic_settings import BaseSettings
 
@@ -31,11 +35,58 @@ class ElasticsearchSettings(BaseSettings):
         return f'{self.host}:{self.port}'
 
 
+class RedisSettings(BaseSettings):
+    host: str = Field(..., alias='REDIS_HOST')
+    port: int = Field(..., alias='REDIS_PORT')
+    cache_invalidation_channel: str = Field('cache:invalidate', alias='CACHE_INVALIDATION_CHANNEL')
+
+    class Config:
+        env_file = ".env.etl"
+        env_file_encoding = 'utf-8'
+        extra = Extra.ignore
+
+
+class EtlSettings(BaseSettings):
+    batch_size: int = Field(500, alias='ETL_BATCH_SIZE')
+    index_concurrency: int = Field(3, alias='ETL_INDEX_CONCURRENCY')
+    load_workers: int = Field(2, alias='ETL_LOAD_WORKERS')
+    queue_size: int = Field(4, alias='ETL_QUEUE_SIZE')
+    checkpoint_batches: int = Field(10, alias='ETL_CHECKPOINT_BATCHES')
+    copy_workers: int = Field(4, alias='ETL_COPY_WORKERS')
+    bulk_chunk_size: int = Field(500, alias='ETL_BULK_CHUNK_SIZE')
+    bulk_min_chunk_size: int = Field(50, alias='ETL_BULK_MIN_CHUNK_SIZE')
+    bulk_max_chunk_bytes: int = Field(10 * 1024 * 1024, alias='ETL_BULK_MAX_CHUNK_BYTES')
+    bulk_retries: int = Field(5, alias='ETL_BULK_RETRIES')
+    dead_letter_path: str = Field('./storage/dead_letter.jsonl', alias='ETL_DEAD_LETTER_PATH')
+    sync_interval: int = Field(60, alias='ETL_SYNC_INTERVAL')
+    mode: Literal['notify', 'poll', 'cdc'] = Field('notify', alias='ETL_MODE')
+    notify_channel: str = Field('content_changes', alias='ETL_NOTIFY_CHANNEL')
+    notify_debounce: float = Field(1, alias='ETL_NOTIFY_DEBOUNCE')
+    notify_max_delay: float = Field(5, alias='ETL_NOTIFY_MAX_DELAY')
+    safety_poll_interval: int = Field(600, alias='ETL_SAFETY_POLL_INTERVAL')
+    cdc_slot_name: str = Field('etl_content', alias='ETL_CDC_SLOT_NAME')
+    cdc_max_changes: int = Field(1000, alias='ETL_CDC_MAX_CHANGES')
+    cdc_poll_interval: float = Field(1, alias='ETL_CDC_POLL_INTERVAL')
+    state_backend: Literal['json', 'redis', 'postgres', 'sqlite'] = Field('json', alias='ETL_STATE_BACKEND')
+    state_sqlite_path: str = Field('./storage/state.sqlite3', alias='ETL_STATE_SQLITE_PATH')
+    worker_id: str = Field(
+        default_factory=lambda: f'{socket.gethostname()}-{os.getpid()}', alias='ETL_WORKER_ID'
+    )
+    lease_ttl: int = Field(300, alias='ETL_LEASE_TTL')
+
+    class Config:
+        env_file = ".env.etl"
+        env_file_encoding = 'utf-8'
+        extra = Extra.ignore
+
+
 class Settings(BaseSettings):
     # debug: bool = Field(..., alias='DEBUG')
     debug: bool = Field(True, alias='DEBUG')
     database_settings: DatabaseSettings = DatabaseSettings()
     elasticsearch_settings: ElasticsearchSettings = ElasticsearchSettings()
+    redis_settings: RedisSettings = RedisSettings()
+    etl_settings: EtlSettings = EtlSettings()
 
 
 settings = Settings()
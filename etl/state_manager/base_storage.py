@@ -11,3 +11,26 @@ class BaseStorage(abc.ABC):
     def retrieve_state(self) -> dict[str, Any]:
         ...
 
+    def get_value(self, key: str) -> Any:
+        """Получить значение одного ключа."""
+        return self.retrieve_state().get(key)
+
+    def set_value(self, key: str, value: Any) -> None:
+        """Сохранить значение одного ключа, не затрагивая остальные.
+
+        Реализация по умолчанию перезаписывает состояние целиком,
+        хранилища с атомарной записью ключа её переопределяют.
+        """
+        state = self.retrieve_state()
+        state[key] = value
+        self.save_state(state)
+
+    def acquire_lease(self, name: str, owner: str, ttl: int) -> bool:
+        """Захватить или продлить аренду на ttl секунд, вернуть False, если она принадлежит другому владельцу.
+
+        Локальное хранилище доступно только одному воркеру, поэтому аренда всегда успешна.
+        """
+        return True
+
+    def release_lease(self, name: str, owner: str) -> None:
+        """Освободить аренду, если она всё ещё принадлежит владельцу."""
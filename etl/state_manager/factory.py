@@ -0,0 +1,26 @@
+from redis import Redis
+
+from logger import logger
+from settings import settings
+from state_manager.base_storage import BaseStorage
+from state_manager.json_file_storage import JsonFileStorage
+from state_manager.postgres_storage import PostgresStorage
+from state_manager.redis_storage import RedisStorage
+from state_manager.sqlite_storage import SqliteStorage
+from state_manager.state_manager import StateManager
+
+
+def create_storage(redis: Redis) -> BaseStorage:
+    backend = settings.etl_settings.state_backend
+    if backend == 'redis':
+        return RedisStorage(redis)
+    if backend == 'postgres':
+        return PostgresStorage(settings.database_settings.get_dsn())
+    if backend == 'sqlite':
+        return SqliteStorage(settings.etl_settings.state_sqlite_path)
+    return JsonFileStorage(logger=logger)
+
+
+def create_state_manager(redis: Redis) -> StateManager:
+    etl_settings = settings.etl_settings
+    return StateManager(create_storage(redis), owner=etl_settings.worker_id, lease_ttl=etl_settings.lease_ttl)
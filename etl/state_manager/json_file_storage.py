@@ -27,22 +27,21 @@ class JsonFileStorage(BaseStorage):
             raise ValueError("file_path can't be None")
 
         self._file_path = file_path
+        self._lock = FileLock(f'{self._file_path}.lock')
 
         self._logger = logger
         create_directory('./storage')
 
     def save_state(self, state: dict[str, Any]) -> None:
         """Сохранить состояние в хранилище."""
-        lock = FileLock(f'{self._file_path}.lock')
-        with lock:
+        with self._lock:
             with open(file=self._file_path, mode='w', encoding='utf-8') as json_storage:
                 json.dump(state, json_storage)
 
     def retrieve_state(self) -> dict[str, Any]:
         """Получить состояние из хранилища."""
         try:
-            lock = FileLock(f'{self._file_path}.lock')
-            with lock:
+            with self._lock:
                 with open(file=self._file_path, mode='r', encoding='utf-8') as json_storage:
                     return json.load(json_storage)
         except (FileNotFoundError, JSONDecodeError):
@@ -51,3 +50,8 @@ class JsonFileStorage(BaseStorage):
         except Exception as e:
             self._logger.exception(e)
             raise e
+
+    def set_value(self, key: str, value: Any) -> None:
+        """Обновить ключ: чтение и перезапись файла идут под одной блокировкой."""
+        with self._lock:
+            super().set_value(key, value)
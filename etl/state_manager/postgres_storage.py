@@ -0,0 +1,81 @@
+import threading
+from typing import Any
+
+import psycopg
+from psycopg.conninfo import make_conninfo
+from psycopg.types.json import Jsonb
+
+from state_manager.base_storage import BaseStorage
+
+CREATE_TABLES = """
+CREATE TABLE IF NOT EXISTS public.etl_state (
+    key TEXT PRIMARY KEY,
+    value JSONB,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+);
+CREATE TABLE IF NOT EXISTS public.etl_lease (
+    name TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL
+);
+"""
+
+UPSERT_VALUE = """
+INSERT INTO public.etl_state (key, value) VALUES (%s, %s)
+ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value, updated_at = now()
+"""
+
+# аренда переходит новому владельцу, только если прежняя истекла
+ACQUIRE_LEASE = """
+INSERT INTO public.etl_lease (name, owner, expires_at) VALUES (%(name)s, %(owner)s, now() + %(ttl)s * INTERVAL '1 second')
+ON CONFLICT (name) DO UPDATE SET owner = EXCLUDED.owner, expires_at = EXCLUDED.expires_at
+WHERE etl_lease.owner = EXCLUDED.owner OR etl_lease.expires_at < now()
+RETURNING owner
+"""
+
+
+class PostgresStorage(BaseStorage):
+    """Хранилище состояния в таблице Postgres.
+
+    Каждый ключ - отдельная строка, обновляемая через INSERT ... ON CONFLICT,
+    аренды хранятся в соседней таблице со временем истечения.
+    """
+
+    def __init__(self, database_settings: dict) -> None:
+        self.dsn = make_conninfo(**database_settings)
+        self._conn: psycopg.Connection | None = None
+        self._lock = threading.Lock()
+        self._execute(CREATE_TABLES)
+
+    def save_state(self, state: dict[str, Any]) -> None:
+        with self._lock:
+            conn = self._get_connection()
+            with conn.transaction():
+                conn.execute('DELETE FROM public.etl_state')
+                with conn.cursor() as cursor:
+                    cursor.executemany(UPSERT_VALUE, [(key, Jsonb(value)) for key, value in state.items()])
+
+    def retrieve_state(self) -> dict[str, Any]:
+        return dict(self._execute('SELECT key, value FROM public.etl_state').fetchall())
+
+    def get_value(self, key: str) -> Any:
+        row = self._execute('SELECT value FROM public.etl_state WHERE key = %s', (key,)).fetchone()
+        return None if row is None else row[0]
+
+    def set_value(self, key: str, value: Any) -> None:
+        self._execute(UPSERT_VALUE, (key, Jsonb(value)))
+
+    def acquire_lease(self, name: str, owner: str, ttl: int) -> bool:
+        return self._execute(ACQUIRE_LEASE, {'name': name, 'owner': owner, 'ttl': ttl}).fetchone() is not None
+
+    def release_lease(self, name: str, owner: str) -> None:
+        self._execute('DELETE FROM public.etl_lease WHERE name = %s AND owner = %s', (name, owner))
+
+    def _execute(self, query: str, params: Any = None) -> psycopg.Cursor:
+        with self._lock:
+            return self._get_connection().execute(query, params)
+
+    def _get_connection(self) -> psycopg.Connection:
+        if self._conn is None or self._conn.closed:
+            self._conn = psycopg.connect(self.dsn, autocommit=True)
+        return self._conn
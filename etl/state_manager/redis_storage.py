@@ -0,0 +1,64 @@
+import json
+from typing import Any
+
+from redis import Redis
+
+from state_manager.base_storage import BaseStorage
+
+# продлить или удалить аренду, только если она принадлежит владельцу
+RENEW_LEASE_SCRIPT = """
+local owner = redis.call('GET', KEYS[1])
+if owner == false then
+    return redis.call('SET', KEYS[1], ARGV[1], 'PX', ARGV[2], 'NX') and 1 or 0
+end
+if owner == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+RELEASE_LEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class RedisStorage(BaseStorage):
+    """Хранилище состояния в Redis.
+
+    Состояние лежит в хеше, каждый ключ которого обновляется отдельной командой HSET.
+    Аренды - строковые ключи с TTL, значением которых служит id владельца.
+    """
+
+    STATE_KEY = 'etl:state'
+    LEASE_KEY = 'etl:lease:{name}'
+
+    def __init__(self, redis: Redis) -> None:
+        self.redis = redis
+        self._renew_lease = self.redis.register_script(RENEW_LEASE_SCRIPT)
+        self._release_lease = self.redis.register_script(RELEASE_LEASE_SCRIPT)
+
+    def save_state(self, state: dict[str, Any]) -> None:
+        with self.redis.pipeline() as pipe:
+            pipe.delete(self.STATE_KEY)
+            if state:
+                pipe.hset(self.STATE_KEY, mapping={key: json.dumps(value) for key, value in state.items()})
+            pipe.execute()
+
+    def retrieve_state(self) -> dict[str, Any]:
+        return {key.decode(): json.loads(value) for key, value in self.redis.hgetall(self.STATE_KEY).items()}
+
+    def get_value(self, key: str) -> Any:
+        value = self.redis.hget(self.STATE_KEY, key)
+        return None if value is None else json.loads(value)
+
+    def set_value(self, key: str, value: Any) -> None:
+        self.redis.hset(self.STATE_KEY, key, json.dumps(value))
+
+    def acquire_lease(self, name: str, owner: str, ttl: int) -> bool:
+        return bool(self._renew_lease(keys=[self.LEASE_KEY.format(name=name)], args=[owner, ttl * 1000]))
+
+    def release_lease(self, name: str, owner: str) -> None:
+        self._release_lease(keys=[self.LEASE_KEY.format(name=name)], args=[owner])
@@ -0,0 +1,80 @@
+import json
+import os
+import sqlite3
+import time
+from contextlib import closing
+from typing import Any
+
+from state_manager.base_storage import BaseStorage
+
+CREATE_TABLES = """
+CREATE TABLE IF NOT EXISTS etl_state (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS etl_lease (
+    name TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+"""
+
+UPSERT_VALUE = """
+INSERT INTO etl_state (key, value) VALUES (?, ?)
+ON CONFLICT (key) DO UPDATE SET value = excluded.value
+"""
+
+# аренда переходит новому владельцу, только если прежняя истекла
+ACQUIRE_LEASE = """
+INSERT INTO etl_lease (name, owner, expires_at) VALUES (:name, :owner, :expires_at)
+ON CONFLICT (name) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at
+WHERE etl_lease.owner = excluded.owner OR etl_lease.expires_at < :now
+"""
+
+
+class SqliteStorage(BaseStorage):
+    """Хранилище состояния в файле SQLite в режиме WAL.
+
+    Ключи обновляются по одному, читатели не блокируют запись,
+    поэтому файл на общем томе могут использовать несколько воркеров одного хоста.
+    """
+
+    def __init__(self, file_path: str = './storage/state.sqlite3', timeout: float = 30) -> None:
+        self._file_path = file_path
+        self._timeout = timeout
+        os.makedirs(os.path.dirname(file_path) or '.', exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(CREATE_TABLES)
+
+    def save_state(self, state: dict[str, Any]) -> None:
+        with closing(self._connect()) as conn, conn:
+            conn.execute('DELETE FROM etl_state')
+            conn.executemany(UPSERT_VALUE, [(key, json.dumps(value)) for key, value in state.items()])
+
+    def retrieve_state(self) -> dict[str, Any]:
+        with closing(self._connect()) as conn:
+            return {key: json.loads(value) for key, value in conn.execute('SELECT key, value FROM etl_state')}
+
+    def get_value(self, key: str) -> Any:
+        with closing(self._connect()) as conn:
+            row = conn.execute('SELECT value FROM etl_state WHERE key = ?', (key,)).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def set_value(self, key: str, value: Any) -> None:
+        with closing(self._connect()) as conn, conn:
+            conn.execute(UPSERT_VALUE, (key, json.dumps(value)))
+
+    def acquire_lease(self, name: str, owner: str, ttl: int) -> bool:
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            cursor = conn.execute(ACQUIRE_LEASE, {'name': name, 'owner': owner, 'expires_at': now + ttl, 'now': now})
+            return cursor.rowcount > 0
+
+    def release_lease(self, name: str, owner: str) -> None:
+        with closing(self._connect()) as conn, conn:
+            conn.execute('DELETE FROM etl_lease WHERE name = ? AND owner = ?', (name, owner))
+
+    def _connect(self) -> sqlite3.Connection:
+        # соединение на операцию: sqlite3 не разрешает делить его между потоками пайплайнов
+        return sqlite3.connect(self._file_path, timeout=self._timeout)
@@ -1,21 +1,77 @@
-from typing import Any
+import threading
+from contextlib import contextmanager
+from typing import Any, Iterator
 
 from state_manager.base_storage import BaseStorage
 
 
-class StateManager:
+class LeaseLostError(Exception):
+    pass
+
+
+class Lease:
+    """Аренда ключа, которую фоновый поток продлевает каждую треть ttl.
+
+    Если продлить не удалось, аренда считается потерянной: работу под ней нужно прервать,
+    потому что её уже мог подхватить другой воркер.
+    """
+
+    def __init__(self, storage: BaseStorage, name: str, owner: str, ttl: int) -> None:
+        self.storage = storage
+        self.name = name
+        self.owner = owner
+        self.ttl = ttl
+        self.lost = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._renew, name=f'lease-{name}', daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
 
-    state: dict[str, Any]
+    def check(self) -> None:
+        if self.lost.is_set():
+            raise LeaseLostError(f'Lease {self.name} is lost')
 
-    def __init__(self, storage: BaseStorage) -> None:
+    def release(self) -> None:
+        self._stopped.set()
+        self._thread.join()
+        self.storage.release_lease(self.name, self.owner)
+
+    def _renew(self) -> None:
+        while not self._stopped.wait(self.ttl / 3):
+            try:
+                renewed = self.storage.acquire_lease(self.name, self.owner, self.ttl)
+            except Exception:
+                renewed = False
+            if not renewed:
+                self.lost.set()
+                return
+
+
+class StateManager:
+
+    def __init__(self, storage: BaseStorage, owner: str = 'etl', lease_ttl: int = 300) -> None:
         self.storage = storage
-        self.state = self.storage.retrieve_state()
+        self.owner = owner
+        self.lease_ttl = lease_ttl
 
     def set_state(self, key: str, value: Any) -> None:
-        self.state.update({key: value})
-        self.storage.save_state(self.state)
+        self.storage.set_value(key, value)
 
     def get_state(self, key: str) -> Any:
-        if self.state.__contains__(key):
-            return self.state[key]
-        return None
+        # состояние читается из хранилища: ключ мог обновить другой воркер
+        return self.storage.get_value(key)
+
+    @contextmanager
+    def lease(self, name: str) -> Iterator[Lease | None]:
+        """Удерживать аренду name на время блока, None - аренда у другого воркера."""
+        if not self.storage.acquire_lease(name, self.owner, self.lease_ttl):
+            yield None
+            return
+
+        lease = Lease(self.storage, name, self.owner, self.lease_ttl)
+        lease.start()
+        try:
+            yield lease
+        finally:
+            lease.release()
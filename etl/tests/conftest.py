@@ -0,0 +1,18 @@
+import os
+import sys
+
+# модули ETL импортируются от корня etl, как при запуске main.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+for name, value in {
+    'POSTGRES_HOST': 'localhost',
+    'POSTGRES_PORT': '5432',
+    'POSTGRES_SQL_DB': 'movies_database',
+    'POSTGRES_USER': 'app',
+    'POSTGRES_PASSWORD': 'app',
+    'ES_HOST': 'http://localhost',
+    'ES_PORT': '9200',
+    'REDIS_HOST': 'localhost',
+    'REDIS_PORT': '6379',
+}.items():
+    os.environ.setdefault(name, value)
@@ -0,0 +1,73 @@
+import json
+from http import HTTPStatus
+
+import pytest
+
+from bulk import AdaptiveChunkSize, BulkSender, DeadLetterFile
+
+
+def bulk_result(status: int, op_type: str = 'delete') -> tuple[bool, dict]:
+    item = {'_index': 'movies', '_id': '1', 'status': status}
+    if status >= HTTPStatus.MULTIPLE_CHOICES:
+        item['error'] = {'type': 'document_missing_exception'} if status == HTTPStatus.NOT_FOUND else 'error'
+    return status < HTTPStatus.MULTIPLE_CHOICES, {op_type: item}
+
+
+@pytest.fixture
+def dead_letter_path(tmp_path):
+    return str(tmp_path / 'dead_letter.jsonl')
+
+
+@pytest.fixture
+def make_sender(dead_letter_path, monkeypatch):
+    def inner(*responses: list[tuple[bool, dict]]) -> BulkSender:
+        sender = BulkSender(
+            AdaptiveChunkSize(initial=10, minimum=1),
+            max_chunk_bytes=1024 * 1024,
+            retries=2,
+            dead_letter=DeadLetterFile(dead_letter_path),
+            initial_backoff=0,
+        )
+        calls = iter(responses)
+        monkeypatch.setattr(sender, '_stream', lambda actions, ignore_status: next(calls))
+        return sender
+    return inner
+
+
+def read_dead_letters(path: str) -> list[dict]:
+    try:
+        with open(path, encoding='utf-8') as dead_letter:
+            return [json.loads(line) for line in dead_letter]
+    except FileNotFoundError:
+        return []
+
+
+def test_ignored_status_counts_as_success(make_sender, dead_letter_path):
+    sender = make_sender([bulk_result(HTTPStatus.NOT_FOUND), bulk_result(HTTPStatus.OK)])
+    actions = [
+        {'_op_type': 'delete', '_index': 'movies', '_id': '1'},
+        {'_op_type': 'delete', '_index': 'movies', '_id': '2'},
+    ]
+
+    assert sender.send(actions, ignore_status=(HTTPStatus.NOT_FOUND,)) == 2
+    assert read_dead_letters(dead_letter_path) == []
+
+
+def test_not_ignored_client_error_goes_to_dead_letter(make_sender, dead_letter_path):
+    sender = make_sender([bulk_result(HTTPStatus.NOT_FOUND)])
+    actions = [{'_op_type': 'delete', '_index': 'movies', '_id': '1'}]
+
+    assert sender.send(actions) == 0
+    assert [record['status'] for record in read_dead_letters(dead_letter_path)] == [HTTPStatus.NOT_FOUND]
+
+
+def test_throttled_documents_are_retried(make_sender, dead_letter_path):
+    sender = make_sender(
+        [bulk_result(HTTPStatus.TOO_MANY_REQUESTS, 'index'), bulk_result(HTTPStatus.CREATED, 'index')],
+        [bulk_result(HTTPStatus.CREATED, 'index')],
+    )
+    actions = [{'_index': 'movies', '_id': '1'}, {'_index': 'movies', '_id': '2'}]
+
+    assert sender.send(actions) == 2
+    assert sender.chunk_size.value == 5
+    assert read_dead_letters(dead_letter_path) == []
@@ -0,0 +1,62 @@
+from helpers import cache_generation
+from helpers.cache_generation import drop_cached_documents
+
+
+class FakePipeline:
+    def __init__(self, commands: list) -> None:
+        self.commands = commands
+
+    def __enter__(self) -> 'FakePipeline':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+    def delete(self, *keys: str) -> None:
+        self.commands.append(('delete', keys))
+
+    def publish(self, channel: str, message: str) -> None:
+        self.commands.append(('publish', channel, message))
+
+    def execute(self) -> None:
+        self.commands.append(('execute',))
+
+
+class FakeRedis:
+    commands: list = []
+
+    def __init__(self, host: str, port: int) -> None:
+        pass
+
+    def __enter__(self) -> 'FakeRedis':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+    def pipeline(self, transaction: bool) -> FakePipeline:
+        return FakePipeline(self.commands)
+
+
+def test_cached_documents_are_deleted_and_published(monkeypatch):
+    monkeypatch.setattr(cache_generation, 'Redis', FakeRedis)
+    monkeypatch.setattr(FakeRedis, 'commands', [])
+
+    drop_cached_documents('movies', ['1', '2'])
+
+    assert FakeRedis.commands == [
+        ('delete', ('film:1', 'film:2')),
+        ('publish', 'cache:invalidate', 'film:1'),
+        ('publish', 'cache:invalidate', 'film:2'),
+        ('execute',),
+    ]
+
+
+def test_documents_of_unknown_index_are_not_published(monkeypatch):
+    monkeypatch.setattr(cache_generation, 'Redis', FakeRedis)
+    monkeypatch.setattr(FakeRedis, 'commands', [])
+
+    drop_cached_documents('movies_20240101000000', ['1'])
+    drop_cached_documents('persons', [])
+
+    assert FakeRedis.commands == []
@@ -0,0 +1,56 @@
+from datetime import datetime
+
+import pytz
+
+import dependencies
+from dependencies import sync_entity_changes
+from pipeline import Checkpoint
+
+BOUNDARY = datetime(2024, 1, 1, 12, 0)
+
+
+class MemoryStateManager:
+    def __init__(self, states: dict | None = None) -> None:
+        self.states = states or {}
+
+    def get_state(self, key: str):
+        return self.states.get(key)
+
+    def set_state(self, key: str, value) -> None:
+        self.states[key] = value
+
+
+def test_entity_changes_resume_from_keyset_cursor(monkeypatch):
+    # две персоны с одинаковым updated_at на границе пачек: вторая не должна потеряться
+    persons = [
+        {'id': '00000000-0000-0000-0000-000000000001', 'full_name': 'A', 'last_change_date': BOUNDARY},
+        {'id': '00000000-0000-0000-0000-000000000002', 'full_name': 'B', 'last_change_date': BOUNDARY},
+    ]
+    calls = []
+
+    def get_changed_entities(database_settings, last_sync_state, batch_size, last_id=None):
+        calls.append((last_sync_state, last_id))
+        cursor = Checkpoint(last_sync_state, last_id or '')
+        rows = [person for person in persons if Checkpoint.from_row(person) > cursor]
+        for start in range(0, len(rows), batch_size):
+            yield rows[start:start + batch_size]
+
+    propagated = []
+    monkeypatch.setattr(
+        dependencies, 'propagate_changes',
+        lambda index, kind, entities: propagated.extend(entity['id'] for entity in entities) or 0,
+    )
+    state_name = 'person_dependency_last_sync_state'
+    state_manager = MemoryStateManager({state_name: pytz.UTC.localize(datetime(2023, 1, 1)).isoformat()})
+
+    sync_entity_changes(None, state_manager, 'person', get_changed_entities, {}, 1, datetime.now(pytz.UTC))
+
+    assert propagated == [person['id'] for person in persons]
+    assert Checkpoint.from_state(state_manager.states[state_name]) == Checkpoint.from_row(persons[-1])
+
+    persons.append({'id': '00000000-0000-0000-0000-000000000003', 'full_name': 'C', 'last_change_date': BOUNDARY})
+    sync_entity_changes(None, state_manager, 'person', get_changed_entities, {}, 1, datetime.now(pytz.UTC))
+
+    assert calls[-1] == (pytz.UTC.localize(BOUNDARY), persons[1]['id'])
+    assert propagated[-1] == persons[-1]['id']
+    assert len(propagated) == 3
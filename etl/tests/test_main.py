@@ -0,0 +1,49 @@
+from contextlib import contextmanager
+
+import main
+
+
+class FakeSource:
+    def __init__(self, affected: dict, embedded: dict) -> None:
+        self.affected = affected
+        self.embedded = embedded
+        self.advanced_to = None
+
+    def peek(self) -> tuple[list[dict], str]:
+        return [{'action': 'U'}], '0/16B3748'
+
+    def get_affected_ids(self, changes: list[dict]) -> tuple[dict, dict]:
+        return self.affected, self.embedded
+
+    def advance(self, lsn: str) -> None:
+        self.advanced_to = lsn
+
+
+class FakeStateManager:
+    def __init__(self, held: set[str]) -> None:
+        self.held = held
+
+    @contextmanager
+    def lease(self, name: str):
+        yield None if name in self.held else object()
+
+
+def test_changes_wait_while_index_is_rebuilt(monkeypatch):
+    reindexed = []
+    monkeypatch.setattr(main, 'reindex_documents', lambda settings, es_model, *args: reindexed.append(es_model))
+    source = FakeSource({'genres': {'1'}}, {'genre': {'1'}})
+
+    # переименование жанра обновляет фильмы, а индекс фильмов перестраивается
+    assert main.sync_changes(source, FakeStateManager({'index:movies'}), None) is False
+    assert reindexed == []
+    assert source.advanced_to is None
+
+
+def test_changes_are_applied_when_indexes_are_free(monkeypatch):
+    reindexed = []
+    monkeypatch.setattr(main, 'reindex_documents', lambda settings, es_model, *args: reindexed.append(es_model))
+    source = FakeSource({'genres': {'1'}}, {})
+
+    assert main.sync_changes(source, FakeStateManager({'index:movies'}), None) is True
+    assert reindexed == [main.Genre]
+    assert source.advanced_to == '0/16B3748'
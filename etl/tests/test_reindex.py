@@ -0,0 +1,118 @@
+from contextlib import contextmanager
+
+import pytest
+from elastic_transport import ConnectionTimeout
+
+import reindex
+from documents.movie import Movie
+from documents.person import Person
+
+
+class FakeIndices:
+    def __init__(self, es: 'FakeElasticsearch') -> None:
+        self.es = es
+
+    def refresh(self, index: str) -> None:
+        self.es.calls.append('refresh')
+
+    def forcemerge(self, index: str, max_num_segments: int, wait_for_completion: bool) -> dict:
+        self.es.calls.append('forcemerge')
+        if self.es.forcemerge_error is not None:
+            raise self.es.forcemerge_error
+        return {'task': 'node:1'}
+
+    def put_settings(self, index: str, settings: dict) -> None:
+        self.es.calls.append('put_settings')
+        if self.es.put_settings_error is not None:
+            raise self.es.put_settings_error
+
+
+class FakeTasks:
+    def __init__(self, es: 'FakeElasticsearch') -> None:
+        self.es = es
+
+    def get(self, task_id: str) -> dict:
+        self.es.calls.append('tasks.get')
+        return {'completed': next(self.es.task_states)}
+
+
+class FakeCluster:
+    def __init__(self, es: 'FakeElasticsearch') -> None:
+        self.es = es
+
+    def health(self, index: str, wait_for_status: str, timeout: str) -> None:
+        self.es.calls.append('health')
+
+
+class FakeElasticsearch:
+    def __init__(self, task_states=(True,), forcemerge_error=None, put_settings_error=None) -> None:
+        self.calls = []
+        self.task_states = iter(task_states)
+        self.forcemerge_error = forcemerge_error
+        self.put_settings_error = put_settings_error
+        self.indices = FakeIndices(self)
+        self.tasks = FakeTasks(self)
+        self.cluster = FakeCluster(self)
+
+    def options(self, request_timeout: float) -> 'FakeElasticsearch':
+        return self
+
+
+class FakeLease:
+    def check(self) -> None:
+        pass
+
+
+def test_force_merge_polls_the_background_task(monkeypatch):
+    es = FakeElasticsearch(task_states=(False, False, True))
+    monkeypatch.setattr(reindex.connections, 'get_connection', lambda: es)
+    monkeypatch.setattr(reindex, 'FORCEMERGE_POLL_INTERVAL', 0)
+
+    reindex.finalize_index(Movie, 'movies_1', '1', FakeLease())
+
+    assert es.calls == ['refresh', 'forcemerge', 'tasks.get', 'tasks.get', 'tasks.get', 'put_settings', 'health']
+
+
+def test_failed_force_merge_does_not_stop_finalization(monkeypatch):
+    es = FakeElasticsearch(forcemerge_error=ConnectionTimeout('timed out'))
+    monkeypatch.setattr(reindex.connections, 'get_connection', lambda: es)
+
+    reindex.finalize_index(Movie, 'movies_1', '1', FakeLease())
+
+    assert es.calls[-2:] == ['put_settings', 'health']
+
+
+class FakeStateManager:
+    def __init__(self) -> None:
+        self.states = {}
+
+    def set_state(self, key: str, value) -> None:
+        self.states[key] = value
+
+    @contextmanager
+    def lease(self, name: str):
+        yield FakeLease()
+
+
+class FakePipeline:
+    def __init__(self, *args, **kwargs) -> None:
+        pass
+
+    def sync(self, lease) -> int:
+        return 10
+
+
+def test_index_is_kept_when_finalization_fails(monkeypatch):
+    es = FakeElasticsearch(put_settings_error=ConnectionTimeout('timed out'))
+    deleted = []
+    es.indices.delete = lambda index, ignore_unavailable: deleted.append(index)
+    monkeypatch.setattr(reindex.connections, 'get_connection', lambda: es)
+    monkeypatch.setattr(reindex, 'get_live_indexes', lambda alias: [])
+    monkeypatch.setattr(reindex, 'create_bulk_index', lambda es_model, index_name: None)
+    monkeypatch.setattr(reindex, 'IndexPipeline', FakePipeline)
+    monkeypatch.setattr(reindex, 'swap_alias', lambda alias, index_name: pytest.fail('alias must not be swapped'))
+
+    with pytest.raises(ConnectionTimeout):
+        reindex.rebuild_index(FakeStateManager(), None, 'person_index_last_sync_state', Person, None)
+
+    assert deleted == []
@@ -0,0 +1,69 @@
+"""
+Compare cache payload size and encode/decode time per hit for a 50-item FilmDetail page.
+
+Run from the repository root:
+    python -m movie_service.benchmarks.cache_codec_benchmark
+"""
+import json
+import timeit
+import uuid
+
+from movie_service.src.models.film import FilmDetail
+from movie_service.src.services.cache_codec import create_cache_codec
+
+PAGE_SIZE = 50
+REPEAT = 200
+
+
+def make_film(number: int) -> FilmDetail:
+    return FilmDetail(
+        id=uuid.uuid4(),
+        title=f'Film {number}',
+        imdb_rating=7.5,
+        description='A long description of the plot, repeated to look like a real one. ' * 5,
+        genres=[{'id': uuid.uuid4(), 'name': name, 'description': f'{name} films'} for name in ('Action', 'Sci-Fi')],
+        directors=[{'id': uuid.uuid4(), 'full_name': 'Director Name'}],
+        actors=[{'id': uuid.uuid4(), 'full_name': f'Actor {i}'} for i in range(8)],
+        writers=[{'id': uuid.uuid4(), 'full_name': f'Writer {i}'} for i in range(2)],
+        permission='public',
+    )
+
+
+def legacy_dumps(films: list[FilmDetail]) -> str:
+    # JSON-of-JSON format used before the codec layer
+    return json.dumps({"items": [film.json() for film in films], "total_items": len(films)})
+
+
+def legacy_loads(raw: str) -> list[FilmDetail]:
+    cached_dict = json.loads(raw)
+    return [FilmDetail.parse_raw(item) for item in cached_dict['items']]
+
+
+def codec_dumps(codec, films: list[FilmDetail]) -> bytes:
+    return codec.dumps({"items": [film.model_dump(mode='json') for film in films], "total_items": len(films)})
+
+
+def codec_loads(codec, raw: bytes) -> list[FilmDetail]:
+    return [FilmDetail.model_validate(item) for item in codec.loads(raw)['items']]
+
+
+def measure(name: str, dumps, loads) -> None:
+    raw = dumps()
+    encode_us = timeit.timeit(dumps, number=REPEAT) / REPEAT * 1e6
+    decode_us = timeit.timeit(lambda: loads(raw), number=REPEAT) / REPEAT * 1e6
+    print(f'{name:<16}{len(raw):>10}{encode_us:>14.1f}{decode_us:>14.1f}')
+
+
+def main() -> None:
+    films = [make_film(number) for number in range(PAGE_SIZE)]
+
+    print(f'{PAGE_SIZE}-item FilmDetail page, mean of {REPEAT} runs')
+    print(f'{"format":<16}{"bytes":>10}{"encode, µs":>14}{"decode, µs":>14}')
+    measure('legacy json', lambda: legacy_dumps(films), legacy_loads)
+    for name, threshold in (('json', 0), ('orjson', 0), ('msgpack', 0), ('orjson+zstd', 1), ('msgpack+zstd', 1)):
+        codec = create_cache_codec(name.split('+')[0], compression_threshold=threshold)
+        measure(name, lambda codec=codec: codec_dumps(codec, films), lambda raw, codec=codec: codec_loads(codec, raw))
+
+
+if __name__ == '__main__':
+    main()
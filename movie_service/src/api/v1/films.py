@@ -3,6 +3,7 @@ from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
 
+from movie_service.src.models.batch import BatchRequest
 from movie_service.src.models.film import FilmDetail, Permissions
 from movie_service.src.services.auth import AuthService, get_auth_service
 from movie_service.src.services.film import FilmService, get_film_service
@@ -19,12 +20,45 @@ async def search_films(
     page_size: int = Query(50, gt=0, description="Number of items per page"),
     page_number: int = Query(1, gt=0, description="The page number to retrieve"),
     sort: str | None = Query(None, description="Field to sort by"),
+    cursor: str | None = Query(None, description="Deep pagination cursor, '*' to start"),
+    autocomplete: bool = Query(False, description="Search-as-you-type: match title word prefixes"),
     film_service: FilmService = Depends(get_film_service),
 ):
     """
     Search for films by query string with pagination and optional sorting.
     """
-    return await film_service.search(query=query, page_size=page_size, page_number=page_number, sort=sort)
+    return await film_service.search(
+        query=query, page_size=page_size, page_number=page_number, sort=sort, cursor=cursor, autocomplete=autocomplete
+    )
+
+
+@router.post('/batch', response_model=list[FilmDetail], summary="Get Films by a list of IDs")
+async def films_batch(
+    batch: BatchRequest,
+    request: Request,
+    film_service: FilmService = Depends(get_film_service),
+    auth_service: AuthService = Depends(get_auth_service)
+) -> list[FilmDetail]:
+    """
+    Get details of several films by their IDs in one request. Unknown IDs are skipped.
+    """
+    films = await film_service.get_many(batch.ids)
+
+    permissions = {film.permission for film in films if film.permission is not Permissions.PUBLIC}
+    if not permissions:
+        return films
+
+    token = request.headers.get('Authorization')
+    if not token:
+        raise HTTPException(
+            status_code=HTTPStatus.UNAUTHORIZED,
+            detail='Authorization token missing'
+        )
+
+    for permission in permissions:
+        await auth_service.check_permission(request, token, f'film:{permission.value}', 'GET')
+
+    return films
 
 
 @router.get('/{film_id}', response_model=FilmDetail)
@@ -62,9 +96,11 @@ async def list_films(
     page_size: int = Query(50, gt=0, description="Number of items per page"),
     page_number: int = Query(1, gt=0, description="The page number to retrieve"),
     sort: str | None = Query(None, description="Field to sort by"),
+    cursor: str | None = Query(None, description="Deep pagination cursor, '*' to start"),
     film_service: FilmService = Depends(get_film_service),
 ):
     """
     Retrieve a list of films with pagination and optional sorting.
+    Pass a cursor instead of page_number to crawl the whole list at a constant cost per page.
     """
-    return await film_service.get_all(page_size=page_size, page_number=page_number, sort=sort)
+    return await film_service.get_all(page_size=page_size, page_number=page_number, sort=sort, cursor=cursor)
@@ -1,6 +1,7 @@
 import http
 from uuid import UUID
 from fastapi import APIRouter, Depends, Query, HTTPException
+from movie_service.src.models.batch import BatchRequest
 from movie_service.src.models.film import Film
 from movie_service.src.services.genre import GenreService, get_genre_service
 from movie_service.src.models.genre import Genre
@@ -16,12 +17,21 @@ async def search_genres(
     page_size: int = Query(50, gt=0, description="Number of items per page"),
     page_number: int = Query(1, gt=0, description="The page number to retrieve"),
     sort: str | None = Query(None, description="Field to sort by"),
+    cursor: str | None = Query(None, description="Deep pagination cursor, '*' to start"),
     genre_service: GenreService = Depends(get_genre_service),
 ):
     """
     Search for genres by query string with pagination and optional sorting.
     """
-    return await genre_service.search(query=query, page_size=page_size, page_number=page_number, sort=sort)
+    return await genre_service.search(query=query, page_size=page_size, page_number=page_number, sort=sort, cursor=cursor)
+
+
+@router.post("/batch", response_model=list[Genre], summary="Get Genres by a list of IDs")
+async def get_genres_batch(batch: BatchRequest, genre_service: GenreService = Depends(get_genre_service)):
+    """
+    Retrieve several genres by their IDs in one request. Unknown IDs are skipped.
+    """
+    return await genre_service.get_many(batch.ids)
 
 
 @router.get("/{genre_id}", response_model=Genre, summary="Get Genre by ID")
@@ -41,12 +51,14 @@ async def list_genres(
     page_size: int = Query(50, gt=0, description="Number of items per page"),
     page_number: int = Query(1, gt=0, description="The page number to retrieve"),
     sort: str | None = Query(None, description="Field to sort by"),
+    cursor: str | None = Query(None, description="Deep pagination cursor, '*' to start"),
     genre_service: GenreService = Depends(get_genre_service),
 ):
     """
     Retrieve a list of genres with pagination and optional sorting.
+    Pass a cursor instead of page_number to crawl the whole list at a constant cost per page.
     """
-    return await genre_service.get_all(page_size=page_size, page_number=page_number, sort=sort)
+    return await genre_service.get_all(page_size=page_size, page_number=page_number, sort=sort, cursor=cursor)
 
 
 @router.get("/{genre_id}/film/", response_model=Pagination[Film], summary="Get Films by Genre ID")
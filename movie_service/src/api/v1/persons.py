@@ -3,6 +3,7 @@ from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 
+from movie_service.src.models.batch import BatchRequest
 from movie_service.src.models.film import Film
 from movie_service.src.models.person import Person, PersonFilmsParticipant
 from movie_service.src.models.pagination import Pagination, paginated_response
@@ -18,12 +19,21 @@ async def search_persons(
         page_size: int = Query(50, gt=0, description="Number of items per page"),
         page_number: int = Query(1, gt=0, description="The page number to retrieve"),
         sort: str | None = Query(None, description="Field to sort by"),
+        cursor: str | None = Query(None, description="Deep pagination cursor, '*' to start"),
         person_service: PersonService = Depends(get_person_service),
 ):
     """
     Search for persons by query string with pagination and optional sorting.
     """
-    return await person_service.search(query=query, page_size=page_size, page_number=page_number, sort=sort)
+    return await person_service.search(query=query, page_size=page_size, page_number=page_number, sort=sort, cursor=cursor)
+
+
+@router.post("/batch", response_model=list[PersonFilmsParticipant], summary="Get Persons by a list of IDs")
+async def get_persons_batch(batch: BatchRequest, person_service: PersonService = Depends(get_person_service)):
+    """
+    Retrieve several persons by their IDs in one request, including their films and roles. Unknown IDs are skipped.
+    """
+    return await person_service.get_many(batch.ids)
 
 
 @router.get("/{person_id}", response_model=PersonFilmsParticipant, summary="Get Person by ID")
@@ -43,12 +53,14 @@ async def list_persons(
         page_size: int = Query(50, gt=0, description="Number of items per page"),
         page_number: int = Query(1, gt=0, description="The page number to retrieve"),
         sort: str | None = Query(None, description="Field to sort by"),
+        cursor: str | None = Query(None, description="Deep pagination cursor, '*' to start"),
         person_service: PersonService = Depends(get_person_service),
 ):
     """
     Retrieve a list of persons with pagination and optional sorting.
+    Pass a cursor instead of page_number to crawl the whole list at a constant cost per page.
     """
-    return await person_service.get_all(page_size=page_size, page_number=page_number, sort=sort)
+    return await person_service.get_all(page_size=page_size, page_number=page_number, sort=sort, cursor=cursor)
 
 
 @router.get("/{person_id}/film/", response_model=Pagination[Film], summary="Get Films by Person ID")
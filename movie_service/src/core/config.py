@@ -1,5 +1,6 @@
 import os
 from functools import lru_cache
+from typing import Literal
 from logging import config as logging_config
 
 from pydantic import Field
@@ -40,6 +41,46 @@ class ElasticSearchSettings(BaseSettings):
     )
 
 
+class CacheSettings(BaseSettings):
+    expire_in_seconds: int = Field(60 * 5, alias='CACHE_EXPIRE_IN_SECONDS')
+    stale_ttl: int = Field(0, alias='CACHE_STALE_TTL')
+    local_max_size: int = Field(1024, alias='CACHE_LOCAL_MAX_SIZE')
+    local_ttl: int = Field(30, alias='CACHE_LOCAL_TTL')
+    invalidation_channel: str = Field('cache:invalidate', alias='CACHE_INVALIDATION_CHANNEL')
+    codec: str = Field('orjson', alias='CACHE_CODEC')
+    compression_threshold: int = Field(0, alias='CACHE_COMPRESSION_THRESHOLD')
+    compression_level: int = Field(3, alias='CACHE_COMPRESSION_LEVEL')
+
+    model_config = SettingsConfigDict(
+        env_file='.env',
+        env_prefix='cache_',
+        extra='ignore',
+        env_file_encoding='utf-8'
+    )
+
+
+class AuthSettings(BaseSettings):
+    pool_size: int = Field(100, alias='AUTH_POOL_SIZE')
+    keepalive_timeout: int = Field(30, alias='AUTH_KEEPALIVE_TIMEOUT')
+    timeout: float = Field(5, alias='AUTH_TIMEOUT')
+    decision_ttl: int = Field(30, alias='AUTH_DECISION_TTL')
+    decision_cache_size: int = Field(10000, alias='AUTH_DECISION_CACHE_SIZE')
+    mode: Literal['remote', 'local'] = Field('remote', alias='AUTH_MODE')
+    jwt_secret_key: str = Field('', alias='AUTH_JWT_SECRET_KEY')
+    jwt_algorithm: str = Field('HS256', alias='AUTH_JWT_ALGORITHM')
+    snapshot_secret_key: str = Field('', alias='AUTH_SNAPSHOT_SECRET_KEY')
+    feed_token: str = Field('', alias='AUTH_FEED_TOKEN')
+    refresh_interval: float = Field(5, alias='AUTH_REFRESH_INTERVAL')
+    max_staleness: float = Field(60, alias='AUTH_MAX_STALENESS')
+
+    model_config = SettingsConfigDict(
+        env_file='.env',
+        env_prefix='auth_',
+        extra='ignore',
+        env_file_encoding='utf-8'
+    )
+
+
 @lru_cache()
 def get_redis_settings() -> RedisSettings:
     return RedisSettings()
@@ -48,3 +89,13 @@ def get_redis_settings() -> RedisSettings:
 @lru_cache()
 def get_elastic_settings() -> ElasticSearchSettings:
     return ElasticSearchSettings()
+
+
+@lru_cache()
+def get_cache_settings() -> CacheSettings:
+    return CacheSettings()
+
+
+@lru_cache()
+def get_auth_settings() -> AuthSettings:
+    return AuthSettings()
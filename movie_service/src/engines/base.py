@@ -1,13 +1,34 @@
 import uuid
 from abc import ABC, abstractmethod
-from typing import Tuple, List
+from typing import NamedTuple, Tuple, List
+
+
+class InvalidCursorError(Exception):
+    """Raised when a pagination cursor is malformed or has expired."""
+
+
+class SearchTemplate(NamedTuple):
+    """A query stored in the search engine under template_id, filled in with params on every call."""
+    template_id: str
+    params: dict
 
 
 class AsyncSearchEngine(ABC):
+    @abstractmethod
+    async def put_templates(self, templates: dict[str, dict]) -> None:
+        """
+        Store the query of every template under its id, so that searches send only the id and params.
+        """
+        pass
+
     @abstractmethod
     async def get_by_id(self, index: str, _id: uuid) -> dict:
         pass
 
+    @abstractmethod
+    async def get_many(self, index: str, ids: List[uuid.UUID]) -> List[dict]:
+        pass
+
     @abstractmethod
     async def get_list(
         self,
@@ -16,6 +37,22 @@ class AsyncSearchEngine(ABC):
         page_number: int,
         sort_order: str | None = None,
         sort_field: str | None = None,
-        query: str | None = None,
+        query: dict | SearchTemplate | None = None,
     ) -> Tuple[List, int]:
         pass
+
+    @abstractmethod
+    async def get_list_by_cursor(
+        self,
+        index: str,
+        page_size: int,
+        cursor: str | None = None,
+        sort_order: str | None = None,
+        sort_field: str | None = None,
+        query: dict | SearchTemplate | None = None,
+    ) -> Tuple[List, int, str | None]:
+        """
+        Return the page following the opaque cursor (the first page when it is None),
+        the total number of items and the cursor of the next page, None after the last one.
+        """
+        pass
@@ -1,20 +1,43 @@
+import base64
+import binascii
+import json
 import uuid
 from typing import Tuple, List
 
-from elasticsearch import AsyncElasticsearch
+from elasticsearch import AsyncElasticsearch, BadRequestError, NotFoundError
 
-from movie_service.src.engines.base import AsyncSearchEngine
+from movie_service.src.engines.base import AsyncSearchEngine, InvalidCursorError, SearchTemplate
 
 
 class ElasticAsyncSearchEngine(AsyncSearchEngine):
+    PIT_KEEP_ALIVE = '1m'
+    # Every stored query is wrapped into the same mustache body, so paging, sorting and PIT are passed as params
+    TEMPLATE_BODY = (
+        '{"from": {{from}}, "size": {{size}}, "sort": {{#toJson}}sort{{/toJson}}, '
+        '"track_total_hits": {{track_total_hits}}, '
+        '{{#pit}}"pit": {{#toJson}}pit{{/toJson}}, {{/pit}}'
+        '{{#with_search_after}}"search_after": {{#toJson}}search_after{{/toJson}}, {{/with_search_after}}'
+        '"query": %s}'
+    )
 
     def __init__(self, elastic: AsyncElasticsearch):
         self.elastic = elastic
 
+    async def put_templates(self, templates: dict[str, dict]) -> None:
+        for template_id, query in templates.items():
+            await self.elastic.put_script(
+                id=template_id,
+                script={"lang": "mustache", "source": self.TEMPLATE_BODY % json.dumps(query)}
+            )
+
     async def get_by_id(self, index: str, _id: uuid) -> dict:
         response = await self.elastic.get(index=index, id=str(_id))
         return response['_source']
 
+    async def get_many(self, index: str, ids: List[uuid.UUID]) -> List[dict]:
+        response = await self.elastic.mget(index=index, ids=[str(_id) for _id in ids])
+        return [doc['_source'] for doc in response['docs'] if doc.get('found')]
+
     async def get_list(
             self,
             index: str,
@@ -22,17 +45,91 @@ class ElasticAsyncSearchEngine(AsyncSearchEngine):
             page_number: int,
             sort_order: str | None = None,
             sort_field: str | None = None,
-            query: str | None = None,
+            query: dict | SearchTemplate | None = None,
     ) -> Tuple[List, int]:
-
         from_ = (page_number - 1) * page_size
 
         body = {
             "from": from_,
             "size": page_size,
-            "query": query if query else {"match_all": {}},
-            "sort": [{sort_field: {"order": sort_order}}] if sort_field else []
+            "sort": [{sort_field: {"order": sort_order}}] if sort_field else [],
+            "track_total_hits": True
         }
 
-        response = await self.elastic.search(index=index, body=body)
+        response = await self._search(query, body, index)
         return response['hits']['hits'], response['hits']['total']['value']
+
+    async def get_list_by_cursor(
+            self,
+            index: str,
+            page_size: int,
+            cursor: str | None = None,
+            sort_order: str | None = None,
+            sort_field: str | None = None,
+            query: dict | SearchTemplate | None = None,
+    ) -> Tuple[List, int, str | None]:
+        """
+        Paginate with search_after over a point in time, so every page costs the same regardless of its depth.
+        The cursor carries the PIT id, the sort values of the last returned hit and the total counted on the first page.
+        """
+        if cursor:
+            state = self._decode_cursor(cursor)
+        else:
+            pit = await self.elastic.open_point_in_time(index=index, keep_alive=self.PIT_KEEP_ALIVE)
+            state = {"pit": pit['id'], "search_after": None, "total": None}
+
+        body = {
+            "from": 0,
+            "size": page_size,
+            "sort": [{sort_field: {"order": sort_order}}] if sort_field else [],
+            "pit": {"id": state['pit'], "keep_alive": self.PIT_KEEP_ALIVE},
+            "track_total_hits": state['total'] is None
+        }
+        if state['search_after']:
+            body['search_after'] = state['search_after']
+
+        try:
+            response = await self._search(query, body)
+        except (NotFoundError, BadRequestError) as e:
+            if not cursor:
+                raise
+            raise InvalidCursorError('Cursor is invalid or has expired') from e
+
+        hits = response['hits']['hits']
+        total = state['total'] if state['total'] is not None else response['hits']['total']['value']
+        pit_id = response.get('pit_id', state['pit'])
+
+        if len(hits) < page_size:
+            await self.elastic.close_point_in_time(id=pit_id)
+            return hits, total, None
+
+        next_cursor = self._encode_cursor({"pit": pit_id, "search_after": hits[-1]['sort'], "total": total})
+        return hits, total, next_cursor
+
+    async def _search(self, query: dict | SearchTemplate | None, body: dict, index: str | None = None) -> dict:
+        """
+        Run a search with a stored template or an inline query.
+        Only size=0 requests ask for the shard request cache: pages of hits are not worth caching there.
+        The template API has no request_cache flag, its size=0 requests are cached by the index default.
+        """
+        if isinstance(query, SearchTemplate):
+            params = {**query.params, **body, "with_search_after": "search_after" in body}
+            return await self.elastic.search_template(index=index, id=query.template_id, params=params)
+
+        return await self.elastic.search(
+            index=index,
+            body={**body, "query": query if query else {"match_all": {}}},
+            request_cache=True if body['size'] == 0 else None
+        )
+
+    @staticmethod
+    def _encode_cursor(state: dict) -> str:
+        return base64.urlsafe_b64encode(json.dumps(state).encode()).decode()
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> dict:
+        try:
+            state = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return {"pit": state['pit'], "search_after": state['search_after'], "total": state['total']}
+        except (binascii.Error, ValueError, TypeError, KeyError) as e:
+            raise InvalidCursorError('Malformed cursor') from e
@@ -1,4 +1,5 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 
 from elasticsearch import AsyncElasticsearch
 from fastapi import FastAPI
@@ -7,22 +8,38 @@ from redis.asyncio import Redis
 
 from movie_service.src.api.v1 import films, genres, persons
 from movie_service.src.core.config import (PROJECT_NAME,
-                          get_redis_settings, get_elastic_settings)
+                          get_redis_settings, get_elastic_settings, get_cache_settings)
 from movie_service.src.db import elastic, redis
+from movie_service.src.engines.elastic import ElasticAsyncSearchEngine
+from movie_service.src.services.auth import get_auth_service
+from movie_service.src.services.local_cache import get_local_cache, listen_for_invalidation
+from movie_service.src.services.search_templates import SEARCH_TEMPLATES
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     redis_settings = get_redis_settings()
     elastic_settings = get_elastic_settings()
+    cache_settings = get_cache_settings()
 
-    redis.redis_client = Redis(host=redis_settings.host, port=redis_settings.port, decode_responses=True)
+    redis.redis_client = Redis(host=redis_settings.host, port=redis_settings.port)
     elastic.es = AsyncElasticsearch(
         hosts=[f'{elastic_settings.host}:{elastic_settings.port}']
     )
+    await ElasticAsyncSearchEngine(elastic.es).put_templates(SEARCH_TEMPLATES)
+
+    invalidation_listener = asyncio.create_task(
+        listen_for_invalidation(redis.redis_client, get_local_cache(), cache_settings.invalidation_channel)
+    )
+    get_auth_service().start()
 
     yield
 
+    invalidation_listener.cancel()
+    with suppress(asyncio.CancelledError):
+        await invalidation_listener
+
+    await get_auth_service().close()
     await redis.redis_client.close()
     await elastic.es.close()
 
@@ -0,0 +1,9 @@
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+MAX_BATCH_SIZE = 100
+
+
+class BatchRequest(BaseModel):
+    ids: list[UUID] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
@@ -11,6 +11,7 @@ class PaginationMeta(BaseModel):
     page_number: int
     total_items: int
     total_pages: int
+    next_cursor: str | None = None
 
 
 class Pagination(BaseModel, Generic[T]):
@@ -18,13 +19,20 @@ class Pagination(BaseModel, Generic[T]):
     items: List[T]
 
 
-def create_paginated_response(items: List[T], total_items: int, page_size: int, page_number: int):
+def create_paginated_response(
+        items: List[T],
+        total_items: int,
+        page_size: int,
+        page_number: int,
+        next_cursor: str | None = None
+):
     total_pages = (total_items + page_size - 1) // page_size
     meta = PaginationMeta(
         page_size=page_size,
         page_number=page_number,
         total_items=total_items,
-        total_pages=total_pages
+        total_pages=total_pages,
+        next_cursor=next_cursor
     )
     return Pagination(meta=meta, items=items)
 
@@ -33,10 +41,10 @@ def paginated_response():
     def decorator(func: Callable):
         @wraps(func)
         async def wrapper(*args, **kwargs):
-            result, total_items = await func(*args, **kwargs)
+            result, total_items, *next_cursor = await func(*args, **kwargs)
             page_size = kwargs.get('page_size')
             page_number = kwargs.get('page_number')
 
-            return create_paginated_response(result, total_items, page_size, page_number)
+            return create_paginated_response(result, total_items, page_size, page_number, *next_cursor)
         return wrapper
     return decorator
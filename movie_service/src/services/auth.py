@@ -1,4 +1,12 @@
+import asyncio
+import base64
+import binascii
+import hashlib
+import json
+import time
 import uuid
+from contextlib import suppress
+
 import aiohttp
 from http import HTTPStatus
 from functools import lru_cache
@@ -6,37 +14,130 @@ from functools import lru_cache
 from fastapi import HTTPException
 from fastapi import Request
 
-from movie_service.src.core.config import AUTH_SERVICE_URL
+from movie_service.src.core.config import AUTH_SERVICE_URL, AuthSettings, get_auth_settings
+from movie_service.src.services.local_cache import LocalCache
+
+try:
+    from auth_client import AccessFeed, AccessVerifier, InvalidTokenError
+except ImportError:
+    AccessFeed = AccessVerifier = InvalidTokenError = None
 
 
 class AuthService:
     AUTH_SERVICE_URL = AUTH_SERVICE_URL
+    CACHEABLE_STATUSES = (HTTPStatus.OK, HTTPStatus.FORBIDDEN)
+
+    def __init__(self, settings: AuthSettings):
+        self.settings = settings
+        self.decisions = LocalCache(settings.decision_cache_size, settings.decision_ttl)
+        self._session: aiohttp.ClientSession | None = None
+        self._feed_task: asyncio.Task | None = None
+        self.verifier = None
+        self.feed = None
+        if settings.mode == 'local':
+            if AccessVerifier is None:
+                raise RuntimeError('Local auth mode requires the shared auth_client package')
+            self.verifier = AccessVerifier(settings.jwt_secret_key, settings.jwt_algorithm, settings.max_staleness,
+                                           settings.snapshot_secret_key)
+            self.feed = AccessFeed(self.verifier, self.AUTH_SERVICE_URL, settings.feed_token, settings.timeout)
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """
+        One long-lived session per process, so connections to auth_service are pooled and kept alive.
+        """
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.settings.pool_size,
+                    keepalive_timeout=self.settings.keepalive_timeout
+                ),
+                timeout=aiohttp.ClientTimeout(total=self.settings.timeout)
+            )
+        return self._session
+
+    def start(self) -> None:
+        """
+        In local mode keep the permission snapshot and the token blacklist in sync with auth_service.
+        """
+        if self.feed is not None:
+            self._feed_task = asyncio.create_task(self.feed.run(self.settings.refresh_interval))
+
+    async def close(self) -> None:
+        if self._feed_task is not None:
+            self._feed_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._feed_task
+        if self._session is not None:
+            await self._session.close()
 
     async def check_permission(self, request: Request, token: str, resource: str, http_method: str) -> bool | None:
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.get(
-                    f'{self.AUTH_SERVICE_URL}/users/check-permission',
-                    params={
-                        'resource': resource,
-                        'http_method': http_method,
-                        'x-request-id': request.headers.get('X-Request-ID', str(uuid.uuid4())),
-                    },
-                    headers={'Authorization': token}
-                ) as response:
-                    if response.status == HTTPStatus.OK:
-                        return True
-                    raise HTTPException(
-                        status_code=response.status,
-                        detail='Authorization service error'
-                    )
-            except aiohttp.ClientError:
-                raise HTTPException(
-                    status_code=HTTPStatus.SERVICE_UNAVAILABLE,
-                    detail='Authorization service connection error'
-                )
+        if self.verifier is not None and self.verifier.ready:
+            status = self._check_locally(token, resource, http_method)
+        else:
+            status = await self._check_remotely(request, token, resource, http_method)
+
+        if status == HTTPStatus.OK:
+            return True
+        raise HTTPException(
+            status_code=status,
+            detail='Authorization service error'
+        )
+
+    async def _check_remotely(self, request: Request, token: str, resource: str, http_method: str) -> int:
+        decision_key = self._decision_key(token, resource, http_method)
+        status = self.decisions.get(decision_key)
+
+        if status is None:
+            status = await self._request_permission(request, token, resource, http_method)
+            if status in self.CACHEABLE_STATUSES:
+                self.decisions.set(decision_key, status, ttl=self._token_ttl(token))
+        return status
+
+    def _check_locally(self, token: str, resource: str, http_method: str) -> int:
+        try:
+            allowed = self.verifier.check_permission(token, resource, http_method)
+        except InvalidTokenError:
+            return HTTPStatus.UNAUTHORIZED
+        return HTTPStatus.OK if allowed else HTTPStatus.FORBIDDEN
+
+    async def _request_permission(self, request: Request, token: str, resource: str, http_method: str) -> int:
+        try:
+            async with self.session.get(
+                f'{self.AUTH_SERVICE_URL}/users/check-permission',
+                params={
+                    'resource': resource,
+                    'http_method': http_method,
+                    'x-request-id': request.headers.get('X-Request-ID', str(uuid.uuid4())),
+                },
+                headers={'Authorization': token}
+            ) as response:
+                return response.status
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            raise HTTPException(
+                status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+                detail='Authorization service connection error'
+            )
+
+    @staticmethod
+    def _decision_key(token: str, resource: str, http_method: str) -> str:
+        token_hash = hashlib.sha256(token.encode('utf-8')).hexdigest()
+        return f'{token_hash}:{resource}:{http_method}'
+
+    @staticmethod
+    def _token_ttl(token: str) -> float | None:
+        """
+        Seconds left until the token exp. The payload is read without verification:
+        it only bounds how long a decision made by auth_service is reused.
+        """
+        try:
+            payload = token.removeprefix('Bearer ').split('.')[1]
+            claims = json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+            return float(claims['exp']) - time.time()
+        except (IndexError, KeyError, TypeError, ValueError, binascii.Error):
+            return None
 
 
 @lru_cache()
 def get_auth_service() -> AuthService:
-    return AuthService()
+    return AuthService(get_auth_settings())
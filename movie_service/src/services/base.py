@@ -13,13 +13,18 @@ class ApiServiceInterface(ABC):
     async def get_by_id(self, film_id: UUID) -> FilmDetail | Film | Genre | Person | PersonFilmsParticipant | None:
         pass
 
+    @abstractmethod
+    async def get_many(self, ids: List[UUID]) -> List[FilmDetail | Genre | PersonFilmsParticipant]:
+        pass
+
     @abstractmethod
     async def get_all(
             self,
             page_size: int,
             page_number: int,
-            sort: str | None
-    ) -> Tuple[List[FilmDetail | Film | Genre], int]:
+            sort: str | None,
+            cursor: str | None = None
+    ) -> Tuple[List[FilmDetail | Film | Genre], int] | Tuple[List[FilmDetail | Film | Genre], int, str | None]:
         pass
 
 
@@ -30,6 +35,7 @@ class SearchableApiServiceInterface(ApiServiceInterface):
             query: str,
             page_size: int,
             page_number: int,
-            sort: str | None
-    ) -> Tuple[List[FilmDetail | Film | Genre], int]:
+            sort: str | None,
+            cursor: str | None = None
+    ) -> Tuple[List[FilmDetail | Film | Genre], int] | Tuple[List[FilmDetail | Film | Genre], int, str | None]:
         pass
@@ -1,38 +1,182 @@
+import asyncio
+import hashlib
 import json
+import logging
 from functools import lru_cache
-from typing import Tuple, List, Type, Union
+from typing import Any, Awaitable, Callable, Tuple, List, Type, Union
 
 from redis.asyncio import Redis
 from fastapi import Depends
 
+from movie_service.src.core.config import get_cache_settings
 from movie_service.src.db.redis import get_redis
 from movie_service.src.models.film import Film, FilmDetail
 from movie_service.src.models.genre import Genre
 from movie_service.src.models.person import Person, PersonFilmsParticipant
+from movie_service.src.services.cache_codec import CacheCodec, get_cache_codec
+from movie_service.src.services.local_cache import CacheStats, LocalCache, get_local_cache
+from movie_service.src.services.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
 
 
 class CacheService:
-    CACHE_EXPIRE_IN_SECONDS = 60 * 5
+    CACHE_EXPIRE_IN_SECONDS = get_cache_settings().expire_in_seconds
+    CACHE_STALE_IN_SECONDS = get_cache_settings().stale_ttl
+    GENERATION_KEY = 'cache:generation:{index}'
 
-    def __init__(self, redis: Redis):
+    def __init__(self, redis: Redis, local_cache: LocalCache, codec: CacheCodec):
         self.redis = redis
+        self.local_cache = local_cache
+        self.codec = codec
+        self.redis_stats = CacheStats()
+        self.single_flight = SingleFlight()
+        self._revalidations: set[asyncio.Task] = set()
+
+    @property
+    def redis_expire(self) -> int:
+        """
+        Redis TTL of an entry: fresh period plus the window in which it may still be served stale.
+        """
+        return self.CACHE_EXPIRE_IN_SECONDS + self.CACHE_STALE_IN_SECONDS
+
+    @property
+    def stats(self) -> dict[str, CacheStats]:
+        """
+        Hit/miss counters per cache tier.
+        """
+        return {'local': self.local_cache.stats, 'redis': self.redis_stats}
+
+    async def get_generation(self, index: str) -> int:
+        """
+        Current cache generation of an index. The ETL increments it after each sync
+        and publishes the generation key, so pods re-read it from Redis.
+        """
+        generation_key = self.GENERATION_KEY.format(index=index)
+        generation = self.local_cache.get(generation_key)
+        if generation is None:
+            generation = int(await self.redis.get(generation_key) or 0)
+            self.local_cache.set(generation_key, generation)
+        return generation
+
+    async def make_list_key(self, index: str, **params) -> str:
+        """
+        Build a compact cache key for a list/search result: a hash of the normalized query parameters
+        in a per-index namespace tagged with the index generation.
+        Bumping the generation makes every cached list of the index unreachable at once.
+        """
+        generation = await self.get_generation(index)
+        normalized = json.dumps(params, sort_keys=True, separators=(',', ':'), default=str)
+        fingerprint = hashlib.blake2b(normalized.encode(), digest_size=16).hexdigest()
+        return f"{index}:list:{generation}:{fingerprint}"
+
+    def _encode(self, data: Film | FilmDetail | Genre | Person | PersonFilmsParticipant) -> bytes:
+        return self.codec.dumps(data.model_dump(mode='json'))
+
+    def _decode(
+            self,
+            raw: bytes,
+            model: Type[Union[Film, FilmDetail, Genre, Person]]
+    ) -> Union[Film, FilmDetail, Genre, Person, PersonFilmsParticipant] | None:
+        """
+        Decode a cached item, treating a payload written in another format as a miss.
+        """
+        try:
+            return model.model_validate(self.codec.loads(raw))
+        except ValueError:
+            logger.warning('Failed to decode cached %s', model.__name__)
+            return None
+
+    def _encode_list(
+            self,
+            items: List[Union[Film, FilmDetail, Genre, Person, PersonFilmsParticipant]],
+            total_items: int
+    ) -> bytes:
+        return self.codec.dumps({
+            "items": [item.model_dump(mode='json') for item in items],
+            "total_items": total_items
+        })
+
+    def _decode_list(
+            self,
+            raw: bytes,
+            model: Type[Union[Film, FilmDetail, Genre, Person]]
+    ) -> Tuple[List[Union[Film, FilmDetail, Genre, Person, PersonFilmsParticipant]], int] | None:
+        """
+        Decode a cached list in a single pass, treating a payload written in another format as a miss.
+        """
+        try:
+            cached_dict = self.codec.loads(raw)
+            return [model.model_validate(item) for item in cached_dict['items']], cached_dict['total_items']
+        except (ValueError, KeyError, TypeError):
+            logger.warning('Failed to decode cached list of %s', model.__name__)
+            return None
+
+    async def _get_from_redis(self, cache_key: str) -> Tuple[bytes | None, bool]:
+        """
+        Return the cached value and whether it is past its fresh period.
+        """
+        if self.CACHE_STALE_IN_SECONDS:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                data, ttl = await pipe.get(cache_key).ttl(cache_key).execute()
+            is_stale = 0 <= ttl <= self.CACHE_STALE_IN_SECONDS
+        else:
+            data, is_stale = await self.redis.get(cache_key), False
+
+        if data:
+            self.redis_stats.hits += 1
+        else:
+            self.redis_stats.misses += 1
+        return data, is_stale
+
+    async def coalesce(self, cache_key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run the loader for a missed key once, sharing its result with all concurrent misses of that key.
+        """
+        return await self.single_flight.do(cache_key, loader)
+
+    def _revalidate(self, cache_key: str, loader: Callable[[], Awaitable[Any]] | None) -> None:
+        """
+        Refresh a stale key in the background unless a refresh for it is already running.
+        """
+        if loader is None or self.single_flight.in_flight(cache_key):
+            return
+        task = asyncio.create_task(self._run_revalidation(cache_key, loader))
+        self._revalidations.add(task)
+        task.add_done_callback(self._revalidations.discard)
+
+    async def _run_revalidation(self, cache_key: str, loader: Callable[[], Awaitable[Any]]) -> None:
+        try:
+            await self.coalesce(cache_key, loader)
+        except Exception:
+            logger.exception('Failed to revalidate cache key %s', cache_key)
 
     async def get_list_from_cache(
             self,
             cache_key: str,
-            model: Type[Union[Film, Genre, Person]]
+            model: Type[Union[Film, Genre, Person]],
+            revalidate: Callable[[], Awaitable[Any]] | None = None
     ) -> Tuple[List[Union[Film, FilmDetail, Genre, Person, PersonFilmsParticipant]], int] | None:
         """
-        Retrieve list of data and total_items from Redis cache.
+        Retrieve list of data and total_items from the local tier or Redis cache.
+        A stale entry is still returned and refreshed in the background with `revalidate`.
         """
-        cached_data = await self.redis.get(cache_key)
+        local_data = self.local_cache.get(cache_key)
+        if local_data is not None:
+            return local_data
+
+        cached_data, is_stale = await self._get_from_redis(cache_key)
         if not cached_data:
             return None
 
-        cached_dict = json.loads(cached_data)
-        data = [model.parse_raw(item) for item in cached_dict['items']]
-        total_items = cached_dict['total_items']
-        return data, total_items
+        result = self._decode_list(cached_data, model)
+        if result is None:
+            return None
+        if is_stale:
+            self._revalidate(cache_key, revalidate)
+
+        self.local_cache.set(cache_key, result)
+        return result
 
     async def put_list_to_cache(
             self,
@@ -41,26 +185,37 @@ class CacheService:
             total_items: int
     ) -> None:
         """
-        Store list of data and total_items in Redis cache.
+        Store list of data and total_items in the local tier and Redis cache.
         """
-        serialized_data = json.dumps({
-            "items": [film.json() for film in films],
-            "total_items": total_items
-        })
-        await self.redis.set(cache_key, serialized_data, ex=self.CACHE_EXPIRE_IN_SECONDS)
+        await self.redis.set(cache_key, self._encode_list(films, total_items), ex=self.redis_expire)
+        self.local_cache.set(cache_key, (films, total_items))
 
     async def get_from_cache_by_id(
             self,
             cache_key: str,
-            model: Type[Union[Film, FilmDetail, Genre, Person]]
+            model: Type[Union[Film, FilmDetail, Genre, Person]],
+            revalidate: Callable[[], Awaitable[Any]] | None = None
     ) -> Union[Film, FilmDetail, Genre, Person, PersonFilmsParticipant] | None:
         """
-        Retrieve data by id from Redis cache.
+        Retrieve data by id from the local tier or Redis cache.
+        A stale entry is still returned and refreshed in the background with `revalidate`.
         """
-        data = await self.redis.get(cache_key)
+        local_data = self.local_cache.get(cache_key)
+        if local_data is not None:
+            return local_data
+
+        data, is_stale = await self._get_from_redis(cache_key)
         if not data:
             return None
-        return model.parse_raw(data)
+
+        obj = self._decode(data, model)
+        if obj is None:
+            return None
+        if is_stale:
+            self._revalidate(cache_key, revalidate)
+
+        self.local_cache.set(cache_key, obj)
+        return obj
 
     async def put_to_cache_by_id(
             self,
@@ -68,13 +223,61 @@ class CacheService:
             data: Film | FilmDetail | Genre | Person | PersonFilmsParticipant
     ) -> None:
         """
-        Store data by id in Redis cache.
+        Store data by id in the local tier and Redis cache.
+        """
+        await self.redis.set(cache_key, self._encode(data), self.redis_expire)
+        self.local_cache.set(cache_key, data)
+
+    async def get_many_from_cache(
+            self,
+            cache_keys: List[str],
+            model: Type[Union[Film, FilmDetail, Genre, Person]]
+    ) -> dict[str, Union[Film, FilmDetail, Genre, Person, PersonFilmsParticipant]]:
+        """
+        Retrieve data for several keys: the local tier first, then the rest with one Redis MGET.
+        Keys missing from both tiers are absent from the result.
+        """
+        result = {}
+        for cache_key in cache_keys:
+            local_data = self.local_cache.get(cache_key)
+            if local_data is not None:
+                result[cache_key] = local_data
+
+        redis_keys = [cache_key for cache_key in cache_keys if cache_key not in result]
+        if not redis_keys:
+            return result
+
+        for cache_key, data in zip(redis_keys, await self.redis.mget(redis_keys)):
+            obj = self._decode(data, model) if data else None
+            if obj is None:
+                self.redis_stats.misses += 1
+                continue
+            self.redis_stats.hits += 1
+            self.local_cache.set(cache_key, obj)
+            result[cache_key] = obj
+        return result
+
+    async def put_many_to_cache(
+            self,
+            data: dict[str, Film | FilmDetail | Genre | Person | PersonFilmsParticipant]
+    ) -> None:
+        """
+        Store several items by their cache keys in the local tier and, in one pipeline, in Redis cache.
         """
-        await self.redis.set(cache_key, data.json(), self.CACHE_EXPIRE_IN_SECONDS)
+        if not data:
+            return
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for cache_key, obj in data.items():
+                pipe.set(cache_key, self._encode(obj), ex=self.redis_expire)
+            await pipe.execute()
+        for cache_key, obj in data.items():
+            self.local_cache.set(cache_key, obj)
 
 
 @lru_cache()
 def get_cache_service(
-        redis: Redis = Depends(get_redis)
+        redis: Redis = Depends(get_redis),
+        local_cache: LocalCache = Depends(get_local_cache),
+        codec: CacheCodec = Depends(get_cache_codec)
 ) -> CacheService:
-    return CacheService(redis)
+    return CacheService(redis, local_cache, codec)
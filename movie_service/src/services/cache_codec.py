@@ -0,0 +1,119 @@
+import json
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Any
+
+import orjson
+
+from movie_service.src.core.config import get_cache_settings
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class CacheCodec(ABC):
+    """
+    Turns JSON-compatible python data into bytes stored in Redis and back.
+    """
+
+    @abstractmethod
+    def dumps(self, data: Any) -> bytes:
+        pass
+
+    @abstractmethod
+    def loads(self, raw: bytes) -> Any:
+        pass
+
+
+class JsonCodec(CacheCodec):
+
+    def dumps(self, data: Any) -> bytes:
+        return json.dumps(data).encode()
+
+    def loads(self, raw: bytes) -> Any:
+        return json.loads(raw)
+
+
+class OrjsonCodec(CacheCodec):
+
+    def dumps(self, data: Any) -> bytes:
+        return orjson.dumps(data)
+
+    def loads(self, raw: bytes) -> Any:
+        return orjson.loads(raw)
+
+
+class MsgpackCodec(CacheCodec):
+
+    def __init__(self):
+        if msgpack is None:
+            raise RuntimeError('msgpack cache codec requires the msgpack package')
+
+    def dumps(self, data: Any) -> bytes:
+        return msgpack.packb(data)
+
+    def loads(self, raw: bytes) -> Any:
+        return msgpack.unpackb(raw)
+
+
+class ZstdCodec(CacheCodec):
+    """
+    Compresses the output of another codec with zstd when it exceeds the size threshold.
+    The first byte marks whether the payload is compressed.
+    """
+    RAW = b'\x00'
+    COMPRESSED = b'\x01'
+
+    def __init__(self, codec: CacheCodec, threshold: int, level: int = 3):
+        if zstandard is None:
+            raise RuntimeError('zstd cache compression requires the zstandard package')
+        self.codec = codec
+        self.threshold = threshold
+        self.compressor = zstandard.ZstdCompressor(level=level)
+        self.decompressor = zstandard.ZstdDecompressor()
+
+    def dumps(self, data: Any) -> bytes:
+        raw = self.codec.dumps(data)
+        if len(raw) < self.threshold:
+            return self.RAW + raw
+        return self.COMPRESSED + self.compressor.compress(raw)
+
+    def loads(self, raw: bytes) -> Any:
+        marker, payload = raw[:1], raw[1:]
+        if marker == self.COMPRESSED:
+            try:
+                payload = self.decompressor.decompress(payload)
+            except zstandard.ZstdError as e:
+                raise ValueError('Corrupted zstd cache payload') from e
+        elif marker != self.RAW:
+            raise ValueError('Unknown cache payload marker')
+        return self.codec.loads(payload)
+
+
+CODECS: dict[str, type[CacheCodec]] = {
+    'json': JsonCodec,
+    'orjson': OrjsonCodec,
+    'msgpack': MsgpackCodec,
+}
+
+
+def create_cache_codec(name: str, compression_threshold: int = 0, compression_level: int = 3) -> CacheCodec:
+    if name not in CODECS:
+        raise ValueError(f'Unknown cache codec {name}, expected one of {", ".join(CODECS)}')
+    codec = CODECS[name]()
+    if compression_threshold > 0:
+        codec = ZstdCodec(codec, compression_threshold, compression_level)
+    return codec
+
+
+@lru_cache()
+def get_cache_codec() -> CacheCodec:
+    settings = get_cache_settings()
+    return create_cache_codec(settings.codec, settings.compression_threshold, settings.compression_level)
@@ -1,14 +1,16 @@
 import http
-from functools import lru_cache
+from functools import lru_cache, partial
 from typing import List, Tuple
 from uuid import UUID
 
 from fastapi import Depends, HTTPException
 
+from movie_service.src.engines.base import InvalidCursorError, SearchTemplate
 from movie_service.src.models.film import FilmDetail, Film
 from movie_service.src.services.base import SearchableApiServiceInterface
 from movie_service.src.services.cache import CacheService, get_cache_service
 from movie_service.src.services.request import RequestService, get_request_service
+from movie_service.src.services.search_templates import FILMS_AUTOCOMPLETE, FILMS_SEARCH, search_template
 
 
 class FilmService(SearchableApiServiceInterface):
@@ -22,17 +24,45 @@ class FilmService(SearchableApiServiceInterface):
         Retrieve a film by its unique ID.
         """
         cache_key = f"film:{film_id}"
-        cached_data = await self.cache_service.get_from_cache_by_id(cache_key, FilmDetail)
+        load = partial(self._load_by_id, cache_key, film_id)
+        cached_data = await self.cache_service.get_from_cache_by_id(cache_key, FilmDetail, revalidate=load)
         if cached_data:
             return cached_data
 
         try:
-            film = await self.request_service.response_by_id('movies', film_id, FilmDetail)
-            await self.cache_service.put_to_cache_by_id(cache_key, film)
-            return film
+            return await self.cache_service.coalesce(cache_key, load)
         except Exception as e:
             raise HTTPException(status_code=http.HTTPStatus.INTERNAL_SERVER_ERROR, detail=f"Error occurred: {str(e)}")
 
+    async def _load_by_id(self, cache_key: str, film_id: UUID) -> FilmDetail:
+        """
+        Fetch a film from Elasticsearch and put it to cache.
+        """
+        film = await self.request_service.response_by_id('movies', film_id, FilmDetail)
+        await self.cache_service.put_to_cache_by_id(cache_key, film)
+        return film
+
+    async def get_many(self, film_ids: List[UUID]) -> List[FilmDetail]:
+        """
+        Retrieve films by a list of IDs: cached ones with one Redis MGET, the rest with one Elasticsearch mget.
+        Unknown IDs are skipped, the order of the found films follows film_ids.
+        """
+        cache_keys = {f"film:{_id}": _id for _id in film_ids}
+        films = await self.cache_service.get_many_from_cache(list(cache_keys), FilmDetail)
+
+        missing_ids = [_id for cache_key, _id in cache_keys.items() if cache_key not in films]
+        if missing_ids:
+            try:
+                fetched = await self.request_service.response_many('movies', missing_ids, FilmDetail)
+            except Exception as e:
+                raise HTTPException(status_code=http.HTTPStatus.INTERNAL_SERVER_ERROR,
+                                    detail=f"Error occurred: {str(e)}")
+            fetched_films = {f"film:{obj.id}": obj for obj in fetched}
+            await self.cache_service.put_many_to_cache(fetched_films)
+            films.update(fetched_films)
+
+        return [films[cache_key] for cache_key in cache_keys if cache_key in films]
+
     async def get_films_by_person_id(
             self,
             person_id: UUID,
@@ -101,61 +131,81 @@ class FilmService(SearchableApiServiceInterface):
             self,
             page_size: int = 50,
             page_number: int = 1,
-            sort: str | None = None
-    ) -> Tuple[List[FilmDetail], int]:
+            sort: str | None = None,
+            cursor: str | None = None
+    ) -> Tuple[List[FilmDetail], int] | Tuple[List[FilmDetail], int, str | None]:
         """
         Get a list of films with pagination, sorting, and total count of genres.
         """
-        return await self._fetch_films(page_size, page_number, sort)
+        return await self._fetch_films(page_size, page_number, sort, cursor=cursor)
 
     async def search(
             self,
             query: str,
             page_size: int = 50,
             page_number: int = 1,
-            sort: str | None = None
-    ) -> Tuple[List[FilmDetail], int]:
+            sort: str | None = None,
+            cursor: str | None = None,
+            autocomplete: bool = False
+    ) -> Tuple[List[FilmDetail], int] | Tuple[List[FilmDetail], int, str | None]:
         """
         Search for films based on a query string with pagination, sorting, and total count of results.
+        In autocomplete mode the query is matched against title word prefixes instead of a fuzzy full-text search.
         """
-        search_body = {
-            "multi_match": {
-                "query": query,
-                "fields": ["title", "description"],
-                "fuzziness": "AUTO"
-            }
-        }
-        return await self._fetch_films(page_size, page_number, sort, search_body)
+        search_body = search_template(FILMS_AUTOCOMPLETE if autocomplete else FILMS_SEARCH, query)
+        return await self._fetch_films(page_size, page_number, sort, search_body, cursor=cursor)
 
     async def _fetch_films(
             self,
             page_size: int,
             page_number: int,
             sort: str | None = None,
-            query: dict | None = None
-    ) -> Tuple[List[FilmDetail], int]:
+            query: dict | SearchTemplate | None = None,
+            cursor: str | None = None
+    ) -> Tuple[List[FilmDetail], int] | Tuple[List[FilmDetail], int, str | None]:
         """
         Helper method to fetch list of films with pagination, sorting, total count, and caching.
+        Cursor pages are unique to a single crawl, so they bypass the cache.
         """
-
-        cache_key_parts = [f"films:list:{page_number}:{page_size}:{sort}"]
-        if query:
-            cache_key_parts.append(str(query))
-        cache_key = ":".join(cache_key_parts)
-
-        cached_data = await self.cache_service.get_list_from_cache(cache_key, FilmDetail)
+        if cursor:
+            try:
+                return await self.request_service.response_list_by_cursor('movies', FilmDetail, page_size, cursor, sort, query)
+            except InvalidCursorError as e:
+                raise HTTPException(status_code=http.HTTPStatus.BAD_REQUEST, detail=str(e))
+            except Exception as e:
+                raise HTTPException(status_code=http.HTTPStatus.INTERNAL_SERVER_ERROR,
+                                    detail=f"Error: {str(e)}")
+
+        cache_key = await self.cache_service.make_list_key(
+            'movies', page_number=page_number, page_size=page_size, sort=sort, query=query
+        )
+
+        load = partial(self._load_list, cache_key, page_size, page_number, sort, query)
+        cached_data = await self.cache_service.get_list_from_cache(cache_key, FilmDetail, revalidate=load)
         if cached_data:
             return cached_data
 
         try:
-            films, total_items = await self.request_service.response_list('movies', FilmDetail, page_size, page_number, sort, query)
-            await self.cache_service.put_list_to_cache(cache_key, films, total_items)
-
-            return films, total_items
+            return await self.cache_service.coalesce(cache_key, load)
         except Exception as e:
             raise HTTPException(status_code=http.HTTPStatus.INTERNAL_SERVER_ERROR,
                                 detail=f"Error: {str(e)}")
 
+    async def _load_list(
+            self,
+            cache_key: str,
+            page_size: int,
+            page_number: int,
+            sort: str | None = None,
+            query: dict | SearchTemplate | None = None
+    ) -> Tuple[List[FilmDetail], int]:
+        """
+        Fetch list of films from Elasticsearch and put it to cache.
+        """
+        films, total_items = await self.request_service.response_list('movies', FilmDetail, page_size, page_number, sort, query)
+        await self.cache_service.put_list_to_cache(cache_key, films, total_items)
+        return films, total_items
+
 
 @lru_cache()
 def get_film_service(
@@ -1,16 +1,18 @@
 import http
-from functools import lru_cache
+from functools import lru_cache, partial
 from typing import List, Tuple
 from uuid import UUID
 
 from fastapi import HTTPException, Depends
 
+from movie_service.src.engines.base import InvalidCursorError, SearchTemplate
 from movie_service.src.models.film import Film
 from movie_service.src.models.genre import Genre
 from movie_service.src.services.base import SearchableApiServiceInterface
 from movie_service.src.services.cache import CacheService, get_cache_service
 from movie_service.src.services.film import FilmService, get_film_service
 from movie_service.src.services.request import RequestService, get_request_service
+from movie_service.src.services.search_templates import GENRES_SEARCH, search_template
 
 
 class GenreService(SearchableApiServiceInterface):
@@ -25,46 +27,70 @@ class GenreService(SearchableApiServiceInterface):
         Get a genre by its ID. Cache the result if found.
         """
         cache_key = f"genre:{genre_id}"
-        cached_data = await self.cache_service.get_from_cache_by_id(cache_key, Genre)
+        load = partial(self._load_by_id, cache_key, genre_id)
+        cached_data = await self.cache_service.get_from_cache_by_id(cache_key, Genre, revalidate=load)
         if cached_data:
             return cached_data
 
         try:
-            genre = await self.request_service.response_by_id('genres', genre_id, Genre)
-            await self.cache_service.put_to_cache_by_id(cache_key, genre)
-            return genre
+            return await self.cache_service.coalesce(cache_key, load)
         except Exception as e:
             raise HTTPException(status_code=http.HTTPStatus.INTERNAL_SERVER_ERROR, detail=f"Error occurred: {str(e)}")
 
+    async def _load_by_id(self, cache_key: str, genre_id: UUID) -> Genre:
+        """
+        Fetch a genre from Elasticsearch and put it to cache.
+        """
+        genre = await self.request_service.response_by_id('genres', genre_id, Genre)
+        await self.cache_service.put_to_cache_by_id(cache_key, genre)
+        return genre
+
+    async def get_many(self, genre_ids: List[UUID]) -> List[Genre]:
+        """
+        Retrieve genres by a list of IDs: cached ones with one Redis MGET, the rest with one Elasticsearch mget.
+        Unknown IDs are skipped, the order of the found genres follows genre_ids.
+        """
+        cache_keys = {f"genre:{_id}": _id for _id in genre_ids}
+        genres = await self.cache_service.get_many_from_cache(list(cache_keys), Genre)
+
+        missing_ids = [_id for cache_key, _id in cache_keys.items() if cache_key not in genres]
+        if missing_ids:
+            try:
+                fetched = await self.request_service.response_many('genres', missing_ids, Genre)
+            except Exception as e:
+                raise HTTPException(status_code=http.HTTPStatus.INTERNAL_SERVER_ERROR,
+                                    detail=f"Error occurred: {str(e)}")
+            fetched_genres = {f"genre:{obj.id}": obj for obj in fetched}
+            await self.cache_service.put_many_to_cache(fetched_genres)
+            genres.update(fetched_genres)
+
+        return [genres[cache_key] for cache_key in cache_keys if cache_key in genres]
+
     async def get_all(
             self,
             page_size: int = 50,
             page_number: int = 1,
-            sort: str | None = None
-    ) -> Tuple[List[Genre], int]:
+            sort: str | None = None,
+            cursor: str | None = None
+    ) -> Tuple[List[Genre], int] | Tuple[List[Genre], int, str | None]:
         """
         Get a list of genres with pagination, sorting, and total count of genres.
         """
-        return await self._fetch_genres(page_size, page_number, sort)
+        return await self._fetch_genres(page_size, page_number, sort, cursor=cursor)
 
     async def search(
             self,
             query: str,
             page_size: int = 50,
             page_number: int = 1,
-            sort: str | None = None
-    ) -> Tuple[List[Genre], int]:
+            sort: str | None = None,
+            cursor: str | None = None
+    ) -> Tuple[List[Genre], int] | Tuple[List[Genre], int, str | None]:
         """
         Search for genres based on a query string with pagination, sorting, and total count of results.
         """
-        search_body = {
-            "multi_match": {
-                "query": query,
-                "fields": ["name^3", "description"],
-                "fuzziness": "AUTO"
-            }
-        }
-        return await self._fetch_genres(page_size, page_number, sort, search_body)
+        search_body = search_template(GENRES_SEARCH, query)
+        return await self._fetch_genres(page_size, page_number, sort, search_body, cursor=cursor)
 
     async def get_genre_films(
             self,
@@ -83,30 +109,52 @@ class GenreService(SearchableApiServiceInterface):
             page_size: int,
             page_number: int,
             sort: str | None = None,
-            query: dict | None = None
-    ) -> Tuple[List[Genre], int]:
+            query: dict | SearchTemplate | None = None,
+            cursor: str | None = None
+    ) -> Tuple[List[Genre], int] | Tuple[List[Genre], int, str | None]:
         """
-        Helper method to fetch list of films with pagination, sorting, total count, and caching.
+        Helper method to fetch list of genres with pagination, sorting, total count, and caching.
+        Cursor pages are unique to a single crawl, so they bypass the cache.
         """
-
-        cache_key_parts = [f"genres:list:{page_number}:{page_size}:{sort}"]
-        if query:
-            cache_key_parts.append(str(query))
-        cache_key = ":".join(cache_key_parts)
-
-        cached_data = await self.cache_service.get_list_from_cache(cache_key, Genre)
+        if cursor:
+            try:
+                return await self.request_service.response_list_by_cursor('genres', Genre, page_size, cursor, sort, query)
+            except InvalidCursorError as e:
+                raise HTTPException(status_code=http.HTTPStatus.BAD_REQUEST, detail=str(e))
+            except Exception as e:
+                raise HTTPException(status_code=http.HTTPStatus.INTERNAL_SERVER_ERROR,
+                                    detail=f"Error: {str(e)}")
+
+        cache_key = await self.cache_service.make_list_key(
+            'genres', page_number=page_number, page_size=page_size, sort=sort, query=query
+        )
+
+        load = partial(self._load_list, cache_key, page_size, page_number, sort, query)
+        cached_data = await self.cache_service.get_list_from_cache(cache_key, Genre, revalidate=load)
         if cached_data:
             return cached_data
 
         try:
-            genres, total_items = await self.request_service.response_list('genres', Genre, page_size, page_number, sort, query)
-            await self.cache_service.put_list_to_cache(cache_key, genres, total_items)
-
-            return genres, total_items
+            return await self.cache_service.coalesce(cache_key, load)
         except Exception as e:
             raise HTTPException(status_code=http.HTTPStatus.INTERNAL_SERVER_ERROR,
                                 detail=f"Error: {str(e)}")
 
+    async def _load_list(
+            self,
+            cache_key: str,
+            page_size: int,
+            page_number: int,
+            sort: str | None = None,
+            query: dict | SearchTemplate | None = None
+    ) -> Tuple[List[Genre], int]:
+        """
+        Fetch list of genres from Elasticsearch and put it to cache.
+        """
+        genres, total_items = await self.request_service.response_list('genres', Genre, page_size, page_number, sort, query)
+        await self.cache_service.put_list_to_cache(cache_key, genres, total_items)
+        return genres, total_items
+
 
 @lru_cache()
 def get_genre_service(
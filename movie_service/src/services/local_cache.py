@@ -0,0 +1,130 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from contextlib import suppress
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Iterable
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from movie_service.src.core.config import get_cache_settings
+
+logger = logging.getLogger(__name__)
+
+INVALIDATE_ALL = '*'
+INVALIDATION_RETRY_DELAY = 1
+INVALIDATION_MAX_RETRY_DELAY = 30
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+
+
+class LocalCache:
+    """
+    Size-bounded in-process LRU cache with per-entry TTL.
+    Stores already parsed models, so a hit costs neither a Redis round trip nor deserialization.
+    """
+
+    def __init__(self, max_size: int, ttl: int):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl > 0
+
+    def get(self, key: str) -> Any | None:
+        entry = self._data.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            self.stats.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        """
+        Store the value for the cache TTL, or for a shorter per-entry ttl.
+        """
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if not self.enabled or ttl <= 0:
+            return
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def delete(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+async def listen_for_invalidation(redis: Redis, local_cache: LocalCache, channel: str) -> None:
+    """
+    Evict keys published to the invalidation channel. The ETL publishes the film:{id}, person:{id}
+    and genre:{id} keys of documents it writes and the generation keys of indexes it syncs.
+    A message is either a single key or '*' to drop the whole local tier.
+    A lost connection is retried with backoff, the local tier is dropped after reconnecting
+    because messages published while disconnected never arrive.
+    """
+    delay = INVALIDATION_RETRY_DELAY
+    reconnecting = False
+    while True:
+        pubsub = redis.pubsub()
+        try:
+            await pubsub.subscribe(channel)
+            if reconnecting:
+                local_cache.clear()
+                logger.info('Resubscribed to cache invalidation on %s, local cache dropped', channel)
+            delay = INVALIDATION_RETRY_DELAY
+            async for message in pubsub.listen():
+                if message['type'] != 'message':
+                    continue
+                key = message['data'].decode() if isinstance(message['data'], bytes) else message['data']
+                if key == INVALIDATE_ALL:
+                    local_cache.clear()
+                else:
+                    local_cache.delete([key])
+            logger.warning('Cache invalidation subscription on %s ended, reconnecting in %s s', channel, delay)
+        except (RedisError, OSError) as e:
+            logger.warning('Listening for cache invalidation on %s failed with %s, reconnecting in %s s',
+                           channel, e, delay)
+        except asyncio.CancelledError:
+            with suppress(RedisError, OSError):
+                await pubsub.unsubscribe(channel)
+            logger.info('Stopped listening for cache invalidation on %s', channel)
+            raise
+        finally:
+            with suppress(RedisError, OSError):
+                await pubsub.close()
+
+        reconnecting = True
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, INVALIDATION_MAX_RETRY_DELAY)
+
+
+@lru_cache()
+def get_local_cache() -> LocalCache:
+    settings = get_cache_settings()
+    return LocalCache(settings.local_max_size, settings.local_ttl)
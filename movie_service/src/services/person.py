@@ -1,16 +1,18 @@
 import http
-from functools import lru_cache
+from functools import lru_cache, partial
 from typing import List, Tuple
 from uuid import UUID
 
 from fastapi import HTTPException, Depends
 
+from movie_service.src.engines.base import InvalidCursorError, SearchTemplate
 from movie_service.src.models.film import Film
 from movie_service.src.models.person import PersonFilmsParticipant, Person
 from movie_service.src.services.base import SearchableApiServiceInterface
 from movie_service.src.services.cache import CacheService, get_cache_service
 from movie_service.src.services.film import FilmService, get_film_service
 from movie_service.src.services.request import RequestService, get_request_service
+from movie_service.src.services.search_templates import PERSONS_SEARCH, search_template
 
 
 class PersonService(SearchableApiServiceInterface):
@@ -25,46 +27,70 @@ class PersonService(SearchableApiServiceInterface):
         Get a person by their ID, including their films and roles.
         """
         cache_key = f"person:{person_id}"
-        cached_data = await self.cache_service.get_from_cache_by_id(cache_key, PersonFilmsParticipant)
+        load = partial(self._load_by_id, cache_key, person_id)
+        cached_data = await self.cache_service.get_from_cache_by_id(cache_key, PersonFilmsParticipant, revalidate=load)
         if cached_data:
             return cached_data
 
         try:
-            person = await self.request_service.response_by_id('persons', person_id, PersonFilmsParticipant)
-            await self.cache_service.put_to_cache_by_id(cache_key, person)
-            return person
+            return await self.cache_service.coalesce(cache_key, load)
         except Exception as e:
             raise HTTPException(status_code=http.HTTPStatus.INTERNAL_SERVER_ERROR, detail=f"Error occurred: {str(e)}")
 
+    async def _load_by_id(self, cache_key: str, person_id: UUID) -> PersonFilmsParticipant:
+        """
+        Fetch a person from Elasticsearch and put it to cache.
+        """
+        person = await self.request_service.response_by_id('persons', person_id, PersonFilmsParticipant)
+        await self.cache_service.put_to_cache_by_id(cache_key, person)
+        return person
+
+    async def get_many(self, person_ids: List[UUID]) -> List[PersonFilmsParticipant]:
+        """
+        Retrieve persons by a list of IDs: cached ones with one Redis MGET, the rest with one Elasticsearch mget.
+        Unknown IDs are skipped, the order of the found persons follows person_ids.
+        """
+        cache_keys = {f"person:{_id}": _id for _id in person_ids}
+        persons = await self.cache_service.get_many_from_cache(list(cache_keys), PersonFilmsParticipant)
+
+        missing_ids = [_id for cache_key, _id in cache_keys.items() if cache_key not in persons]
+        if missing_ids:
+            try:
+                fetched = await self.request_service.response_many('persons', missing_ids, PersonFilmsParticipant)
+            except Exception as e:
+                raise HTTPException(status_code=http.HTTPStatus.INTERNAL_SERVER_ERROR,
+                                    detail=f"Error occurred: {str(e)}")
+            fetched_persons = {f"person:{obj.id}": obj for obj in fetched}
+            await self.cache_service.put_many_to_cache(fetched_persons)
+            persons.update(fetched_persons)
+
+        return [persons[cache_key] for cache_key in cache_keys if cache_key in persons]
+
     async def get_all(
             self,
             page_size: int = 10,
             page_number: int = 1,
-            sort: str | None = None
-    ) -> Tuple[List[Person], int]:
+            sort: str | None = None,
+            cursor: str | None = None
+    ) -> Tuple[List[Person], int] | Tuple[List[Person], int, str | None]:
         """
         Get a list of persons with pagination, sorting, and total count.
         """
-        return await self._fetch_persons(page_size=page_size, page_number=page_number, sort=sort)
+        return await self._fetch_persons(page_size=page_size, page_number=page_number, sort=sort, cursor=cursor)
 
     async def search(
             self,
             query: str,
             page_size: int = 50,
             page_number: int = 1,
-            sort: str | None = None
-    ) -> Tuple[List[Person], int]:
+            sort: str | None = None,
+            cursor: str | None = None
+    ) -> Tuple[List[Person], int] | Tuple[List[Person], int, str | None]:
         """
         Search for persons based on a query string with pagination, sorting, and total count.
         """
-        search_body = {
-            "multi_match": {
-                "query": query,
-                "fields": ["full_name^3"],
-                "fuzziness": "AUTO"
-            }
-        }
-        return await self._fetch_persons(page_size, page_number, sort, search_body)
+        search_body = search_template(PERSONS_SEARCH, query)
+        return await self._fetch_persons(page_size, page_number, sort, search_body, cursor=cursor)
 
     async def get_person_films(
             self,
@@ -83,30 +109,52 @@ class PersonService(SearchableApiServiceInterface):
             page_size: int,
             page_number: int,
             sort: str | None = None,
-            query: dict | None = None
-    ) -> Tuple[List[Person], int]:
+            query: dict | SearchTemplate | None = None,
+            cursor: str | None = None
+    ) -> Tuple[List[Person], int] | Tuple[List[Person], int, str | None]:
         """
-        Helper method to fetch list of films with pagination, sorting, total count, and caching.
+        Helper method to fetch list of persons with pagination, sorting, total count, and caching.
+        Cursor pages are unique to a single crawl, so they bypass the cache.
         """
-
-        cache_key_parts = [f"persons:list:{page_number}:{page_size}:{sort}"]
-        if query:
-            cache_key_parts.append(str(query))
-        cache_key = ":".join(cache_key_parts)
-
-        cached_data = await self.cache_service.get_list_from_cache(cache_key, Person)
+        if cursor:
+            try:
+                return await self.request_service.response_list_by_cursor('persons', Person, page_size, cursor, sort, query)
+            except InvalidCursorError as e:
+                raise HTTPException(status_code=http.HTTPStatus.BAD_REQUEST, detail=str(e))
+            except Exception as e:
+                raise HTTPException(status_code=http.HTTPStatus.INTERNAL_SERVER_ERROR,
+                                    detail=f"Error: {str(e)}")
+
+        cache_key = await self.cache_service.make_list_key(
+            'persons', page_number=page_number, page_size=page_size, sort=sort, query=query
+        )
+
+        load = partial(self._load_list, cache_key, page_size, page_number, sort, query)
+        cached_data = await self.cache_service.get_list_from_cache(cache_key, Person, revalidate=load)
         if cached_data:
             return cached_data
 
         try:
-            persons, total_items = await self.request_service.response_list('persons', Person, page_size, page_number, sort, query)
-            await self.cache_service.put_list_to_cache(cache_key, persons, total_items)
-
-            return persons, total_items
+            return await self.cache_service.coalesce(cache_key, load)
         except Exception as e:
             raise HTTPException(status_code=http.HTTPStatus.INTERNAL_SERVER_ERROR,
                                 detail=f"Error: {str(e)}")
 
+    async def _load_list(
+            self,
+            cache_key: str,
+            page_size: int,
+            page_number: int,
+            sort: str | None = None,
+            query: dict | SearchTemplate | None = None
+    ) -> Tuple[List[Person], int]:
+        """
+        Fetch list of persons from Elasticsearch and put it to cache.
+        """
+        persons, total_items = await self.request_service.response_list('persons', Person, page_size, page_number, sort, query)
+        await self.cache_service.put_list_to_cache(cache_key, persons, total_items)
+        return persons, total_items
+
 
 @lru_cache()
 def get_person_service(
@@ -5,7 +5,7 @@ from uuid import UUID
 from fastapi import Depends
 
 from movie_service.src.db.elastic import get_elastic_engine
-from movie_service.src.engines.base import AsyncSearchEngine
+from movie_service.src.engines.base import AsyncSearchEngine, SearchTemplate
 from movie_service.src.models.film import FilmDetail, Film
 from movie_service.src.models.genre import Genre
 from movie_service.src.models.person import Person, PersonFilmsParticipant
@@ -18,6 +18,7 @@ class RequestService:
         "full_name": "full_name.raw",
         "name": "name.raw"
     }
+    FIRST_PAGE_CURSOR = '*'
 
     def __init__(self, search_engine: AsyncSearchEngine):
         self.search_engine = search_engine
@@ -29,22 +30,45 @@ class RequestService:
             page_size: int,
             page_number: int,
             sort: str | None = None,
-            query: dict | None = None
+            query: dict | SearchTemplate | None = None
     ) -> Tuple[List, int]:
         """
         Retrieves list of data from Elasticsearch.
         """
+        sort_order, sort_field = self._parse_sort(sort)
 
+        response, total_items = await self.search_engine.get_list(index, page_size, page_number, sort_order, sort_field, query)
+        data = [model(**doc['_source']) for doc in response]
+        return data, total_items
+
+    async def response_list_by_cursor(
+            self,
+            index: str,
+            model: Type[Union[FilmDetail, Film, Genre, Person]],
+            page_size: int,
+            cursor: str,
+            sort: str | None = None,
+            query: dict | SearchTemplate | None = None
+    ) -> Tuple[List, int, str | None]:
+        """
+        Retrieves the page of data following the cursor from Elasticsearch, together with the next cursor.
+        """
+        sort_order, sort_field = self._parse_sort(sort)
+        engine_cursor = None if cursor == self.FIRST_PAGE_CURSOR else cursor
+
+        response, total_items, next_cursor = await self.search_engine.get_list_by_cursor(
+            index, page_size, engine_cursor, sort_order, sort_field, query
+        )
+        data = [model(**doc['_source']) for doc in response]
+        return data, total_items, next_cursor
+
+    def _parse_sort(self, sort: str | None) -> Tuple[str, str | None]:
         sort_order = "asc"
         if sort and sort.startswith('-'):
             sort_order = "desc"
             sort = sort[1:]
 
-        sort_field = self.SORTABLE_FIELDS.get(sort, sort)
-
-        response, total_items = await self.search_engine.get_list(index, page_size, page_number, sort_order, sort_field, query)
-        data = [model(**doc['_source']) for doc in response]
-        return data, total_items
+        return sort_order, self.SORTABLE_FIELDS.get(sort, sort)
 
     async def response_by_id(
             self,
@@ -58,6 +82,18 @@ class RequestService:
         obj = await self.search_engine.get_by_id(index, uuid)
         return model(**obj)
 
+    async def response_many(
+            self,
+            index: str,
+            uuids: List[UUID],
+            model: Type[Union[FilmDetail, Film, Genre, Person]]
+    ) -> List[FilmDetail | Film | Genre | Person | PersonFilmsParticipant]:
+        """
+        Retrieves data by list of ids from Elasticsearch in one request. Missing ids are skipped.
+        """
+        objs = await self.search_engine.get_many(index, uuids)
+        return [model(**obj) for obj in objs]
+
 
 @lru_cache()
 def get_request_service(
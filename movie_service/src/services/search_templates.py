@@ -0,0 +1,44 @@
+from movie_service.src.engines.base import SearchTemplate
+
+FILMS_SEARCH = 'films_search'
+FILMS_AUTOCOMPLETE = 'films_autocomplete'
+PERSONS_SEARCH = 'persons_search'
+GENRES_SEARCH = 'genres_search'
+
+# Queries stored in Elasticsearch on startup; searches send only the template id and the query string
+SEARCH_TEMPLATES = {
+    FILMS_SEARCH: {
+        "multi_match": {
+            "query": "{{query}}",
+            "fields": ["title", "description"],
+            "fuzziness": "AUTO"
+        }
+    },
+    # title.suggest is indexed as edge n-grams, so a plain match finds titles by word prefixes without fuzziness
+    FILMS_AUTOCOMPLETE: {
+        "match": {
+            "title.suggest": {
+                "query": "{{query}}",
+                "operator": "and"
+            }
+        }
+    },
+    PERSONS_SEARCH: {
+        "multi_match": {
+            "query": "{{query}}",
+            "fields": ["full_name^3"],
+            "fuzziness": "AUTO"
+        }
+    },
+    GENRES_SEARCH: {
+        "multi_match": {
+            "query": "{{query}}",
+            "fields": ["name^3", "description"],
+            "fuzziness": "AUTO"
+        }
+    },
+}
+
+
+def search_template(template_id: str, query: str) -> SearchTemplate:
+    return SearchTemplate(template_id, {"query": query})
@@ -20,3 +20,13 @@ def make_get_request(client_session):
             return await response.json(), response.headers, response.status
 
     return inner
+
+
+@pytest_asyncio.fixture(name="make_post_request")
+def make_post_request(client_session):
+    async def inner(endpoint: str, json: dict = None, headers: dict = None):
+        url = f'{test_settings.service_url}{endpoint}'
+        async with client_session.post(url, json=json, headers=headers) as response:
+            return await response.json(), response.headers, response.status
+
+    return inner
@@ -14,3 +14,4 @@ async def redis_client():
 @pytest_asyncio.fixture(scope='function', autouse=True)
 async def clear_redis_cache(redis_client):
     await redis_client.flushdb()
+    await redis_client.publish(test_settings.cache_invalidation_channel, '*')
@@ -18,6 +18,7 @@ class TestSettings(BaseSettings):
 
     redis_host: str = Field('127.0.0.1', alias='REDIS_HOST')
     redis_port: int = Field("6379", alias='REDIS_PORT')
+    cache_invalidation_channel: str = Field('cache:invalidate', alias='CACHE_INVALIDATION_CHANNEL')
     service_url: str = Field('http://api:8000', alias='SERVICE_URL')
 
     model_config = SettingsConfigDict(
@@ -1,3 +1,4 @@
+import asyncio
 import uuid
 from http import HTTPStatus
 
@@ -94,6 +95,59 @@ async def test_film_cache(make_get_request, es_write_data, es_client, film_data)
     assert response['id'] == film_data['id']
 
 
+# Test that a published invalidation evicts the film from every cache tier
+async def test_film_cache_invalidation(make_get_request, es_write_data, redis_client):
+    film_data = {'id': str(uuid.uuid4()), 'title': 'Old title', 'imdb_rating': 5, 'permission': 'public'}
+    await es_write_data([film_data], test_settings.es_movie_index, test_settings.es_movies_index_mapping)
+
+    # Populate Redis and the in-process tier
+    response, _, status = await make_get_request(f"{ENDPOINT}{film_data['id']}")
+    assert status == HTTPStatus.OK
+    assert response['title'] == 'Old title'
+
+    # Update the film in Elasticsearch and invalidate its cache key
+    updated_film_data = {**film_data, 'title': 'New title'}
+    await es_write_data([updated_film_data], test_settings.es_movie_index, test_settings.es_movies_index_mapping)
+    cache_key = f"film:{film_data['id']}"
+    await redis_client.delete(cache_key)
+    await redis_client.publish(test_settings.cache_invalidation_channel, cache_key)
+    await asyncio.sleep(0.1)
+
+    response, _, status = await make_get_request(f"{ENDPOINT}{film_data['id']}")
+    assert status == HTTPStatus.OK
+    assert response['title'] == 'New title'
+
+
+# Test retrieving several films by IDs in one request
+async def test_films_batch(make_post_request, es_write_data, redis_client):
+    films_data = [
+        {'id': str(uuid.uuid4()), 'title': f'Batch film {i}', 'imdb_rating': 5, 'permission': 'public'}
+        for i in range(3)
+    ]
+    await es_write_data(films_data, test_settings.es_movie_index, test_settings.es_movies_index_mapping)
+
+    # Unknown IDs are skipped, the order follows the request
+    ids = [films_data[2]['id'], str(uuid.uuid4()), films_data[0]['id'], films_data[1]['id']]
+    response, _, status = await make_post_request(f"{ENDPOINT}batch", json={'ids': ids})
+    assert status == HTTPStatus.OK
+    assert [film['id'] for film in response] == [films_data[2]['id'], films_data[0]['id'], films_data[1]['id']]
+
+    # Found films are cached one key per film
+    assert await redis_client.exists(*[f"film:{film['id']}" for film in films_data]) == len(films_data)
+
+
+@pytest.mark.parametrize(
+    "ids, expected_status", [
+        ([], HTTPStatus.UNPROCESSABLE_ENTITY),
+        (['invalid-uuid'], HTTPStatus.UNPROCESSABLE_ENTITY),
+        ([str(uuid.uuid4()) for _ in range(101)], HTTPStatus.UNPROCESSABLE_ENTITY)
+    ]
+)
+async def test_films_batch_validation(make_post_request, ids, expected_status):
+    _, _, status = await make_post_request(f"{ENDPOINT}batch", json={'ids': ids})
+    assert status == expected_status
+
+
 # Tests for the structure of the response for getting a film by ID
 async def test_film_by_id_response_structure(make_get_request, es_write_data):
     # Add data to Elasticsearch
@@ -137,6 +191,35 @@ async def test_films_list_response_structure(make_get_request, es_write_data):
         assert response_film == expected_film
 
 
+# Test crawling the whole list of films with a cursor
+async def test_films_list_cursor_pagination(make_get_request, es_write_data):
+    films_data = [
+        {'id': str(uuid.uuid4()), 'title': f'Film {i}', 'imdb_rating': i, 'permission': 'public'}
+        for i in range(5)
+    ]
+    await es_write_data(films_data, test_settings.es_movie_index, test_settings.es_movies_index_mapping)
+
+    ratings = []
+    params = {'page_size': 2, 'sort': '-imdb_rating', 'cursor': '*'}
+    while True:
+        response, _, status = await make_get_request(f"{ENDPOINT}", params=params)
+        assert status == HTTPStatus.OK
+        assert response['meta']['total_items'] == len(films_data)
+        ratings.extend(film['imdb_rating'] for film in response['items'])
+
+        if response['meta']['next_cursor'] is None:
+            break
+        params['cursor'] = response['meta']['next_cursor']
+
+    assert ratings == [4, 3, 2, 1, 0]
+
+
+async def test_films_list_invalid_cursor(make_get_request):
+    params = {'page_size': 2, 'cursor': 'invalid-cursor'}
+    _, _, status = await make_get_request(f"{ENDPOINT}", params=params)
+    assert status == HTTPStatus.BAD_REQUEST
+
+
 # Test basic search functionality
 @pytest.mark.parametrize(
     "query, expected_results", [
@@ -159,6 +242,25 @@ async def test_search_films(make_get_request, es_write_data, query, expected_res
     assert len(response['items']) == expected_results
 
 
+# Test search-as-you-type: title word prefixes match, typos are not corrected
+@pytest.mark.parametrize(
+    "query, expected_results", [
+        ("Man wh", 1),
+        ("wor", 1),
+        ("Mna", 0)
+    ]
+)
+async def test_search_films_autocomplete(make_get_request, es_write_data, query, expected_results):
+    film_data = {'id': str(uuid.uuid4()), 'title': 'Man who build the world', 'imdb_rating': 5, 'permission': 'public'}
+    await es_write_data([film_data], test_settings.es_movie_index, test_settings.es_movies_index_mapping)
+
+    params = {'query': query, 'page_size': 10, 'page_number': 1, 'autocomplete': 'true'}
+    response, _, status = await make_get_request(f'{ENDPOINT}search', params=params)
+    assert status == HTTPStatus.OK
+    assert len(response['items']) == expected_results
+    assert response['meta']['total_items'] == expected_results
+
+
 # Test search with pagination
 @pytest.mark.parametrize(
     "films_data, search_query, page_size, page_number, expected_total_items, expected_total_pages, expected_items_count",
@@ -269,3 +371,28 @@ async def test_search_films_cache(make_get_request, es_write_data, es_client, fi
     assert status == HTTPStatus.OK
     assert len(response['items']) == 1  # Cached result
     assert response['items'][0]['id'] == film_data['id']
+
+
+# Test that bumping the index cache generation invalidates every cached list of the index
+async def test_films_list_cache_generation(make_get_request, es_write_data, redis_client):
+    film_data = {'id': str(uuid.uuid4()), 'title': 'First', 'imdb_rating': 5, 'permission': 'public'}
+    await es_write_data([film_data], test_settings.es_movie_index, test_settings.es_movies_index_mapping)
+
+    params = {'page_size': 10, 'page_number': 1}
+    response, _, status = await make_get_request(f"{ENDPOINT}", params=params)
+    assert status == HTTPStatus.OK
+    assert len(response['items']) == 1
+
+    # The ETL syncs one more film and bumps the generation of the index
+    new_film_data = {'id': str(uuid.uuid4()), 'title': 'Second', 'imdb_rating': 5, 'permission': 'public'}
+    await es_write_data(
+        [film_data, new_film_data], test_settings.es_movie_index, test_settings.es_movies_index_mapping
+    )
+    generation_key = f'cache:generation:{test_settings.es_movie_index}'
+    await redis_client.incr(generation_key)
+    await redis_client.publish(test_settings.cache_invalidation_channel, generation_key)
+    await asyncio.sleep(0.1)
+
+    response, _, status = await make_get_request(f"{ENDPOINT}", params=params)
+    assert status == HTTPStatus.OK
+    assert len(response['items']) == 2
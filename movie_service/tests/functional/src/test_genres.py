@@ -92,6 +92,17 @@ async def test_genre_cache(make_get_request, es_write_data, es_client, genre_dat
     assert response['id'] == genre_data['id']
 
 
+# Test retrieving several genres by IDs in one request
+async def test_genres_batch(make_post_request, es_write_data):
+    genres_data = [{'id': str(uuid.uuid4()), 'name': 'Action'}, {'id': str(uuid.uuid4()), 'name': 'Drama'}]
+    await es_write_data(genres_data, test_settings.es_genre_index, test_settings.es_genres_index_mapping)
+
+    ids = [genres_data[1]['id'], str(uuid.uuid4()), genres_data[0]['id']]
+    response, _, status = await make_post_request(f"{ENDPOINT}batch", json={'ids': ids})
+    assert status == HTTPStatus.OK
+    assert [genre['name'] for genre in response] == ['Drama', 'Action']
+
+
 # Tests for the structure of the response for getting a genre by ID
 @pytest.mark.parametrize(
     "genre_data, expected_status", [
@@ -72,6 +72,17 @@ async def test_get_non_existent_person_by_id(make_get_request, person_data):
     assert 'NotFoundError' in response['detail']
 
 
+# Test retrieving several persons by IDs in one request
+async def test_persons_batch(make_post_request, es_write_data):
+    persons_data = [{'id': str(uuid.uuid4()), 'full_name': f'Batch Person {i}'} for i in range(2)]
+    await es_write_data(persons_data, test_settings.es_persons_index, test_settings.es_persons_index_mapping)
+
+    ids = [persons_data[1]['id'], str(uuid.uuid4()), persons_data[0]['id']]
+    response, _, status = await make_post_request(f"{ENDPOINT}batch", json={'ids': ids})
+    assert status == HTTPStatus.OK
+    assert [person['id'] for person in response] == [persons_data[1]['id'], persons_data[0]['id']]
+
+
 # Get existing person films
 @pytest.mark.parametrize(
     "person_data, film_data", [
@@ -22,6 +22,11 @@ MOVIES_INDEX = {
         "russian_stemmer": {
           "type": "stemmer",
           "language": "russian"
+        },
+        "autocomplete_edge_ngram": {
+          "type": "edge_ngram",
+          "min_gram": 1,
+          "max_gram": 20
         }
       },
       "analyzer": {
@@ -35,6 +40,19 @@ MOVIES_INDEX = {
             "russian_stop",
             "russian_stemmer"
           ]
+        },
+        "autocomplete": {
+          "tokenizer": "standard",
+          "filter": [
+            "lowercase",
+            "autocomplete_edge_ngram"
+          ]
+        },
+        "autocomplete_search": {
+          "tokenizer": "standard",
+          "filter": [
+            "lowercase"
+          ]
         }
       }
     }
@@ -74,6 +92,11 @@ MOVIES_INDEX = {
         "fields": {
           "raw": {
             "type": "keyword"
+          },
+          "suggest": {
+            "type": "text",
+            "analyzer": "autocomplete",
+            "search_analyzer": "autocomplete_search"
           }
         }
       },
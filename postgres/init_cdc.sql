@@ -0,0 +1,3 @@
+-- ETL in CDC mode needs film, person and genre ids of deleted link rows, not only their primary keys
+ALTER TABLE content.genre_film_work REPLICA IDENTITY FULL;
+ALTER TABLE content.person_film_work REPLICA IDENTITY FULL;
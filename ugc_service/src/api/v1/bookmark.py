@@ -3,9 +3,9 @@ from http import HTTPStatus
 from fastapi import APIRouter, Depends, HTTPException, Query
 
 from ugc_service.src.core.exceptions import DuplicateException
-from ugc_service.src.core.utils import has_permission
-from ugc_service.src.models.models import SearchRequest, PaginatedResponse, BookmarkResponse, \
-    BookmarkRequest
+from ugc_service.src.core.utils import check_bulk_size, has_permission
+from ugc_service.src.models.models import BulkRequest, BulkResponse, CountMode, SearchRequest, PaginatedResponse, \
+    BookmarkResponse, BookmarkRequest
 from ugc_service.src.services.bookmark import BookmarkService, get_bookmark_service
 
 router = APIRouter(dependencies=[Depends(has_permission)])
@@ -26,6 +26,16 @@ async def create_bookmark(
         )
 
 
+@router.post('/bulk', response_model=BulkResponse)
+async def create_bookmarks_bulk(
+        request: BulkRequest[BookmarkRequest],
+        user_id: str = Depends(has_permission),
+        service: BookmarkService = Depends(get_bookmark_service)
+):
+    check_bulk_size(request.items)
+    return await service.create_bookmarks_bulk(request.items, user_id)
+
+
 @router.get('/{bookmark_id}', response_model=BookmarkResponse)
 async def get_bookmark(
         bookmark_id: str,
@@ -53,11 +63,12 @@ async def get_user_bookmarks(  # noqa: WPS211
         limit: int = Query(10, le=50),
         sort_by: str = Query(None),
         sort_order: int = Query(1),
+        count_mode: CountMode = Query(CountMode.exact),
         service: BookmarkService = Depends(get_bookmark_service)
 ):
     filters = {'user_id': user_id}
     sort_params = {sort_by: sort_order} if sort_by else None
-    return await service.search_bookmarks(filters, skip, limit, sort_params)
+    return await service.search_bookmarks(filters, skip, limit, sort_params, count_mode)
 
 
 @router.post('/search', response_model=PaginatedResponse[BookmarkResponse])
@@ -68,4 +79,4 @@ async def search_bookmarks(
 ):
     filters = request.filters or {'user_id': user_id}
     sort_params = {request.sort_by: request.sort_order} if request.sort_by else None
-    return await service.search_bookmarks(filters, request.skip, request.limit, sort_params)
+    return await service.search_bookmarks(filters, request.skip, request.limit, sort_params, request.count_mode)
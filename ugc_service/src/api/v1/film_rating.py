@@ -3,9 +3,9 @@ from http import HTTPStatus
 from fastapi import APIRouter, Depends, HTTPException, Query
 
 from ugc_service.src.core.exceptions import DuplicateException
-from ugc_service.src.core.utils import has_permission
-from ugc_service.src.models.models import FilmAggregatedRatingResponse, FilmRatingResponse, \
-    FilmRatingCreate, PaginatedResponse
+from ugc_service.src.core.utils import check_bulk_size, has_permission
+from ugc_service.src.models.models import BulkRequest, BulkResponse, CountMode, FilmAggregatedRatingResponse, \
+    FilmRatingBulkItem, FilmRatingResponse, FilmRatingCreate, PaginatedResponse
 from ugc_service.src.services.film_rating import FilmRatingService, get_film_rating_service
 
 router = APIRouter(dependencies=[Depends(has_permission)])
@@ -25,6 +25,16 @@ async def create_rating(
         )
 
 
+@router.post('/bulk', response_model=BulkResponse)
+async def create_ratings_bulk(
+        request: BulkRequest[FilmRatingBulkItem],
+        user_id: str = Depends(has_permission),
+        service: FilmRatingService = Depends(get_film_rating_service)
+):
+    check_bulk_size(request.items)
+    return await service.create_ratings_bulk(request.items, user_id)
+
+
 @router.get('/{rating_id}', response_model=FilmRatingResponse)
 async def get_rating(
         rating_id: str,
@@ -60,8 +70,8 @@ async def get_user_ratings(  # noqa: WPS211
         limit: int = Query(10, le=50),
         sort_by: str = Query(None),
         sort_order: int = Query(1),
+        count_mode: CountMode = Query(CountMode.exact),
         service: FilmRatingService = Depends(get_film_rating_service)
 ):
-    filters = {'user_id': user_id}
     sort_params = {sort_by: sort_order} if sort_by else None
-    return await service.search_film_ratings(filters, skip, limit, sort_params)
+    return await service.get_user_ratings(user_id, skip, limit, sort_params, count_mode)
@@ -3,9 +3,9 @@ from http import HTTPStatus
 from fastapi import APIRouter, Depends, HTTPException, Query
 
 from ugc_service.src.core.exceptions import DuplicateException
-from ugc_service.src.core.utils import has_permission
-from ugc_service.src.models.models import SearchRequest, PaginatedResponse, ReviewResponse, \
-    ReactionRequest, ReviewCreate, ReviewUpdate
+from ugc_service.src.core.utils import check_bulk_size, has_permission
+from ugc_service.src.models.models import BulkRequest, BulkResponse, CountMode, SearchRequest, PaginatedResponse, \
+    ReviewBulkItem, ReviewResponse, ReactionRequest, ReviewCreate, ReviewUpdate
 from ugc_service.src.services.review import ReviewService, get_review_service
 
 router = APIRouter(dependencies=[Depends(has_permission)])
@@ -18,7 +18,7 @@ async def search_reviews(
 ):
     filters = request.filters or {}
     sort_params = {request.sort_by: request.sort_order} if request.sort_by else None
-    return await service.search_reviews(filters, request.skip, request.limit, sort_params)
+    return await service.search_reviews(filters, request.skip, request.limit, sort_params, request.count_mode)
 
 
 @router.get('/users/{user_id}', response_model=PaginatedResponse[ReviewResponse])
@@ -28,11 +28,12 @@ async def get_user_bookmarks(  # noqa: WPS211
         limit: int = Query(10, le=50),
         sort_by: str = Query(None),
         sort_order: int = Query(1),
+        count_mode: CountMode = Query(CountMode.exact),
         service: ReviewService = Depends(get_review_service)
 ):
     filters = {'user_id': user_id}
     sort_params = {sort_by: sort_order} if sort_by else None
-    return await service.search_reviews(filters, skip, limit, sort_params)
+    return await service.search_reviews(filters, skip, limit, sort_params, count_mode)
 
 
 @router.post('', response_model=ReviewResponse)
@@ -49,6 +50,16 @@ async def create_review(
         )
 
 
+@router.post('/bulk', response_model=BulkResponse)
+async def create_reviews_bulk(
+        request: BulkRequest[ReviewBulkItem],
+        user_id: str = Depends(has_permission),
+        service: ReviewService = Depends(get_review_service)
+):
+    check_bulk_size(request.items)
+    return await service.create_reviews_bulk(request.items, user_id)
+
+
 @router.get('/{review_id}', response_model=ReviewResponse)
 async def get_review(
         review_id: str,
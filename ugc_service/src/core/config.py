@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -7,6 +9,25 @@ class Settings(BaseSettings):
     mongo_url: str = Field(..., alias='MONGO_URL')
     mongo_db: str = Field(..., alias='MONGO_DB')
     auth_service_url: str = Field(..., alias='AUTH_SERVICE_URL')
+    auth_mode: Literal['remote', 'local'] = Field(default='remote', alias='AUTH_MODE')
+    auth_feed_url: str = Field(default='http://auth_service:8001/api/v1/auth', alias='AUTH_FEED_URL')
+    auth_jwt_secret_key: str = Field(default='', alias='AUTH_JWT_SECRET_KEY')
+    auth_jwt_algorithm: str = Field(default='HS256', alias='AUTH_JWT_ALGORITHM')
+    auth_snapshot_secret_key: str = Field(default='', alias='AUTH_SNAPSHOT_SECRET_KEY')
+    auth_feed_token: str = Field(default='', alias='AUTH_FEED_TOKEN')
+    auth_refresh_interval: float = Field(default=5, alias='AUTH_REFRESH_INTERVAL')
+    auth_max_staleness: float = Field(default=60, alias='AUTH_MAX_STALENESS')
+    count_cap: int = Field(default=10000, alias='COUNT_CAP')
+    count_cache_ttl: float = Field(default=30, alias='COUNT_CACHE_TTL')
+    count_cache_size: int = Field(default=1000, alias='COUNT_CACHE_SIZE')
+    bulk_max_items: int = Field(default=500, alias='BULK_MAX_ITEMS')
+    rating_write_mode: Literal['direct', 'write_behind'] = Field(default='direct', alias='RATING_WRITE_MODE')
+    kafka_broker_urls: str = Field(default='localhost:9092', alias='KAFKA_BROKER_URLS')
+    ratings_topic: str = Field(default='ugc_ratings', alias='RATINGS_TOPIC')
+    ratings_consumer_group: str = Field(default='ugc_ratings_writer', alias='RATINGS_CONSUMER_GROUP')
+    ratings_batch_size: int = Field(default=500, alias='RATINGS_BATCH_SIZE')
+    ratings_batch_timeout: float = Field(default=1, alias='RATINGS_BATCH_TIMEOUT')
+    pending_ratings_ttl: float = Field(default=60, alias='PENDING_RATINGS_TTL')
     docs_token_url: str = Field(..., alias='DOCS_TOKEN_URL')
     env: str = Field(..., alias='ENV')
 
@@ -0,0 +1,66 @@
+import asyncio
+import json
+import logging
+from typing import List
+
+from aiokafka import AIOKafkaProducer
+
+from ugc_service.src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def json_serializer(value: dict) -> bytes:
+    return json.dumps(value).encode('utf-8')
+
+
+class KafkaRatingProducer:
+    """
+    Appends ratings and their deletions to the ratings topic for the write-behind mode.
+    Messages are keyed by user and film, so changes of one rating stay ordered within a partition.
+    """
+
+    def __init__(self):
+        self.producer = None
+        self.is_started = False
+
+    async def start(self):
+        if not self.is_started:
+            logger.info('Starting Kafka producer...')
+            # aiokafka binds the producer to the running loop, so it is created here and not on import
+            self.producer = AIOKafkaProducer(
+                bootstrap_servers=settings.kafka_broker_urls,
+                value_serializer=json_serializer,
+                # the topic holds the only copy of a rating until the consumer writes it
+                acks='all',
+            )
+            await self.producer.start()
+            self.is_started = True
+
+    async def stop(self):
+        if self.is_started:
+            logger.info('Stopping Kafka producer...')
+            await self.producer.stop()
+            self.is_started = False
+
+    async def send_rating(self, rating: dict):
+        await self.send_ratings([rating])
+
+    async def send_ratings(self, ratings: List[dict]):
+        # all messages are queued before waiting, so they share producer batches
+        try:
+            deliveries = [
+                await self.producer.send(settings.ratings_topic, key=self._get_key(rating), value=rating)
+                for rating in ratings
+            ]
+            await asyncio.gather(*deliveries)
+        except Exception as e:
+            logger.error('Failed to send ratings: %s', str(e), exc_info=True)
+            raise
+
+    @staticmethod
+    def _get_key(rating: dict) -> bytes:
+        return f'{rating["user_id"]}:{rating["film_id"]}'.encode('utf-8')
+
+
+rating_producer = KafkaRatingProducer()
@@ -11,6 +11,14 @@ from ugc_service.src.services.auth import AuthServiceClient, get_auth_service_cl
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=settings.docs_token_url)
 
 
+def check_bulk_size(items: list) -> None:
+    if len(items) > settings.bulk_max_items:
+        raise HTTPException(
+            status_code=HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+            detail=f'At most {settings.bulk_max_items} items are accepted in one request'
+        )
+
+
 def get_user_id(token: str) -> dict:
     payload_part = token.split('.')[1]
     payload_decoded = base64.urlsafe_b64decode(payload_part + '=' * (-len(payload_part) % 4))
@@ -1,4 +1,5 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI
 from fastapi.responses import ORJSONResponse
@@ -6,7 +7,9 @@ from fastapi.responses import ORJSONResponse
 
 from ugc_service.src.core.config import settings
 from ugc_service.src.api.v1 import bookmark, film_rating, review
+from ugc_service.src.core.kafka import rating_producer
 from ugc_service.src.core.mongo import mongo_client
+from ugc_service.src.services.auth import get_auth_service_client
 from ugc_service.src.setup_mongo import init_mongo_and_shard
 
 
@@ -18,7 +21,16 @@ if settings.env != 'test':
 @asynccontextmanager
 async def lifespan(_: FastAPI):
     await init_mongo_and_shard()
+    if settings.rating_write_mode == 'write_behind':
+        await rating_producer.start()
+    auth_feed = get_auth_service_client().feed
+    auth_feed_task = asyncio.create_task(auth_feed.run(settings.auth_refresh_interval)) if auth_feed else None
     yield
+    if auth_feed_task is not None:
+        auth_feed_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await auth_feed_task
+    await rating_producer.stop()
     mongo_client.close()
 
 
@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import Dict
 from beanie import Document
 from pydantic import Field
 from pymongo import ASCENDING, IndexModel
@@ -26,6 +27,8 @@ class Review(Document):
     rating: int = Field(..., ge=0, le=10)
     likes: set[str] = Field(default_factory=set)
     dislikes: set[str] = Field(default_factory=set)
+    likes_count: int = 0
+    dislikes_count: int = 0
     timestamp: datetime = Field(default_factory=datetime.utcnow)
 
     class Settings:
@@ -52,3 +55,16 @@ class FilmRating(Document):
                 unique=True
             )
         ]
+
+
+class FilmRatingStats(Document):
+    film_id: str
+    ratings_sum: int = 0
+    ratings_count: int = 0
+    histogram: Dict[str, int] = Field(default_factory=dict)
+
+    class Settings:
+        name = 'film_rating_stats'
+        indexes = [
+            IndexModel([('film_id', ASCENDING)], unique=True)
+        ]
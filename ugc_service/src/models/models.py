@@ -1,6 +1,6 @@
 from datetime import datetime
 from enum import Enum
-from typing import List, TypeVar, Generic, Optional, Dict, Any
+from typing import List, Literal, TypeVar, Generic, Optional, Dict, Any
 
 from pydantic import BaseModel, Field
 
@@ -26,10 +26,22 @@ class FilmRatingCreate(BaseModel):
     rating: int = Field(..., ge=0, le=10)
 
 
+class FilmRatingBulkItem(BaseModel):
+    film_id: str
+    rating: int = Field(..., ge=0, le=10)
+
+
+class FilmRatingDeletion(BaseModel):
+    user_id: str
+    film_id: str
+    deleted: Literal[True] = True
+
+
 class FilmAggregatedRatingResponse(BaseModel):
     film_id: str
     avg_rating: float
     total_ratings: int
+    histogram: Dict[int, int] = Field(default_factory=dict)
 
 
 class ReviewCreate(BaseModel):
@@ -39,6 +51,12 @@ class ReviewCreate(BaseModel):
     rating: int = Field(..., ge=0, le=10)
 
 
+class ReviewBulkItem(BaseModel):
+    film_id: str
+    review_text: str = Field(..., max_length=500)
+    rating: int = Field(..., ge=0, le=10)
+
+
 class ReviewUpdate(BaseModel):
     review_text: str = Field(..., max_length=500)
     rating: int = Field(..., ge=0, le=10)
@@ -66,12 +84,41 @@ class BookmarkRequest(BaseModel):
     film_id: str
 
 
+class CountMode(str, Enum):
+    exact = "exact"
+    capped = "capped"
+    estimated = "estimated"
+
+
 class SearchRequest(BaseModel):
     filters: Optional[Dict[str, Any]] = None
     skip: int = 0
     limit: int = 10
     sort_by: Optional[str] = None
     sort_order: int = 1
+    count_mode: CountMode = CountMode.exact
+
+
+class BulkRequest(BaseModel, Generic[T]):
+    items: List[T] = Field(..., min_length=1)
+
+
+class BulkItemStatus(str, Enum):
+    created = "created"
+    updated = "updated"
+    unchanged = "unchanged"
+    failed = "failed"
+
+
+class BulkItemResult(BaseModel):
+    index: int
+    status: BulkItemStatus
+    id: Optional[str] = None
+    error: Optional[str] = None
+
+
+class BulkResponse(BaseModel):
+    items: List[BulkItemResult]
 
 
 class ReactionType(str, Enum):
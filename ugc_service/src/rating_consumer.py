@@ -0,0 +1,112 @@
+"""
+Write ratings accepted in the write-behind mode from Kafka to MongoDB.
+
+Usage: python -m ugc_service.src.rating_consumer
+Ratings are read in batches of up to RATINGS_BATCH_SIZE. Deletions of the batch are applied first,
+then the ratings are written with one bulk upsert, which also updates the film counters.
+Offsets are committed after the batch is written, so after a crash a batch may be written again;
+upserts and deletions make that harmless for the ratings, counters skewed by a half-written batch
+are fixed by repair_rating_stats.
+"""
+import asyncio
+import json
+import logging
+
+from aiokafka import AIOKafkaConsumer
+from beanie import init_beanie
+from pydantic import ValidationError
+from pymongo.errors import PyMongoError
+
+from ugc_service.src.core.config import settings
+from ugc_service.src.core.mongo import mongo_client
+from ugc_service.src.models.documents import FilmRating
+from ugc_service.src.models.models import BulkItemStatus, FilmRatingDeletion
+from ugc_service.src.repository.film_rating import FilmRatingRepository, get_film_rating_repository
+from ugc_service.src.setup_mongo import DOCUMENT_MODELS
+
+logger = logging.getLogger(__name__)
+
+RETRY_DELAY = 5
+
+
+def parse_ratings(messages: list) -> tuple[list[FilmRating], list[tuple[str, str]]]:
+    """
+    Return the ratings to write and the (user_id, film_id) pairs to delete before them.
+    A later message about the same user and film replaces an earlier one of the batch,
+    a pair deleted and rated again is deleted first, so the new rating is inserted with its own id.
+    """
+    ratings, deleted = {}, set()
+    for message in messages:
+        try:
+            payload = json.loads(message.value)
+            if isinstance(payload, dict) and 'deleted' in payload:
+                deletion = FilmRatingDeletion.model_validate(payload)
+                key = (deletion.user_id, deletion.film_id)
+                ratings.pop(key, None)
+                deleted.add(key)
+                continue
+            rating = FilmRating.model_validate(payload)
+        except (json.JSONDecodeError, ValidationError) as e:
+            logger.error('Skipping malformed rating at offset %s: %s', message.offset, e)
+            continue
+        ratings[(rating.user_id, rating.film_id)] = rating
+    return list(ratings.values()), list(deleted)
+
+
+async def write_ratings(
+        repository: FilmRatingRepository,
+        ratings: list[FilmRating],
+        deleted: list[tuple[str, str]],
+) -> None:
+    while True:
+        try:
+            for user_id, film_id in deleted:
+                await repository.delete_user_rating(user_id, film_id)
+            results = await repository.bulk_upsert(ratings, update_fields=['rating']) if ratings else []
+            break
+        except PyMongoError as e:
+            logger.warning('Writing %s ratings failed with %s, retrying', len(ratings) + len(deleted), e)
+            await asyncio.sleep(RETRY_DELAY)
+
+    for rating, result in zip(ratings, results):
+        if result.status == BulkItemStatus.failed:
+            logger.error('Rating of %s by %s was not written: %s', rating.film_id, rating.user_id, result.error)
+
+
+async def consume_ratings() -> None:
+    await init_beanie(database=mongo_client, document_models=DOCUMENT_MODELS)
+    repository = get_film_rating_repository()
+
+    consumer = AIOKafkaConsumer(
+        settings.ratings_topic,
+        bootstrap_servers=settings.kafka_broker_urls,
+        group_id=settings.ratings_consumer_group,
+        auto_offset_reset='earliest',
+        enable_auto_commit=False,
+    )
+    await consumer.start()
+    logger.info('Consuming ratings from %s', settings.ratings_topic)
+    try:
+        while True:
+            batches = await consumer.getmany(
+                timeout_ms=int(settings.ratings_batch_timeout * 1000),
+                max_records=settings.ratings_batch_size,
+            )
+            messages = [message for partition_messages in batches.values() for message in partition_messages]
+            if not messages:
+                continue
+
+            ratings, deleted = parse_ratings(messages)
+            if ratings or deleted:
+                await write_ratings(repository, ratings, deleted)
+            await consumer.commit()
+            logger.info(
+                'Written %s ratings and %s deletions from %s messages', len(ratings), len(deleted), len(messages)
+            )
+    finally:
+        await consumer.stop()
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(consume_ratings())
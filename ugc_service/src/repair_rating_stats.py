@@ -0,0 +1,34 @@
+"""
+Rebuild film_rating_stats from film_ratings.
+
+Usage: python -m ugc_service.src.repair_rating_stats [film_id ...]
+Without film ids the counters of every film are rebuilt.
+"""
+import argparse
+import asyncio
+import logging
+
+from beanie import init_beanie
+
+from ugc_service.src.core.mongo import mongo_client
+from ugc_service.src.repository.film_rating import get_film_rating_repository
+from ugc_service.src.setup_mongo import DOCUMENT_MODELS
+
+logger = logging.getLogger(__name__)
+
+
+async def repair_rating_stats(film_ids: list[str]) -> None:
+    await init_beanie(database=mongo_client, document_models=DOCUMENT_MODELS)
+    repository = get_film_rating_repository()
+
+    for film_id in film_ids or [None]:
+        await repository.recompute_stats(film_id)
+        logger.info('Rating stats rebuilt for %s', film_id or 'all films')
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description='Rebuild film rating counters from the ratings')
+    parser.add_argument('film_ids', nargs='*')
+    args = parser.parse_args()
+    asyncio.run(repair_rating_stats(args.film_ids))
@@ -1,26 +1,41 @@
+import asyncio
 from typing import List, Optional, Dict, Any, TypeVar, Generic, Type
 from beanie import Document, SortDirection
+from beanie.odm.utils.encoder import Encoder
 from abc import ABC, abstractmethod
 
 from bson import ObjectId
-from pymongo.errors import DuplicateKeyError
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 
+from ugc_service.src.core.config import settings
 from ugc_service.src.core.exceptions import DuplicateException
+from ugc_service.src.models.models import BulkItemResult, BulkItemStatus, CountMode
+from ugc_service.src.repository.count_cache import CountCache, get_count_cache
 
 T = TypeVar('T', bound=Document)
 
+UPSERT_KEY = ('user_id', 'film_id')
+
 
 class BaseRepository(Generic[T], ABC):
     @abstractmethod
     def get_model(self) -> Type[T]:
         pass
 
+    def get_count_cache(self) -> CountCache:
+        return get_count_cache()
+
+    def invalidate_counts(self, document: Dict[str, Any]) -> None:
+        self.get_count_cache().invalidate(self.get_model().get_collection_name(), document)
+
     async def create(self, item: T) -> T:
         try:
             await item.insert()
-            return item
         except DuplicateKeyError as e:
             raise DuplicateException('Duplicate key in MongoDB') from e
+        self.invalidate_counts(item.model_dump())
+        return item
 
     async def get(self, item_id: str) -> Optional[T]:
         model = self.get_model()
@@ -30,10 +45,12 @@ class BaseRepository(Generic[T], ABC):
         existing_item = await self.get(item_id)
         if not existing_item:
             return None
+        self.invalidate_counts(existing_item.model_dump())
         update_data = item.model_dump(exclude_unset=True)
         for key, value in update_data.items():
             setattr(existing_item, key, value)
         await existing_item.save()
+        self.invalidate_counts(existing_item.model_dump())
         return existing_item
 
     async def delete(self, item_id: str) -> None:
@@ -41,6 +58,58 @@ class BaseRepository(Generic[T], ABC):
         document = await model.find_one({'_id': ObjectId(item_id)})
         if document:
             await document.delete()
+            self.invalidate_counts(document.model_dump())
+
+    async def bulk_upsert(self, items: List[T], update_fields: List[str]) -> List[BulkItemResult]:
+        """
+        Write items with one unordered bulk_write of upserts on the unique (user_id, film_id) pair.
+        An existing document gets update_fields overwritten, the rest of its fields are kept.
+        A failed item does not stop the others. Items repeating a pair of an earlier item of the batch are rejected.
+        """
+        results: Dict[int, BulkItemResult] = {}
+        operations, indexes, seen_keys = [], [], set()
+        for index, item in enumerate(items):
+            document = Encoder(to_db=True).encode(item)
+            key = tuple(document[field] for field in UPSERT_KEY)
+            if key in seen_keys:
+                results[index] = BulkItemResult(
+                    index=index, status=BulkItemStatus.failed, error='Duplicate user_id and film_id in the request'
+                )
+                continue
+            seen_keys.add(key)
+
+            # an id set in advance is kept for a new document, an existing one keeps its own id
+            on_insert = {
+                field: value for field, value in document.items()
+                if field not in {'revision_id', *UPSERT_KEY, *update_fields}
+                and not (field == '_id' and value is None)
+            }
+            update = {'$setOnInsert': on_insert}
+            if update_fields:
+                update['$set'] = {field: document[field] for field in update_fields}
+            operations.append(UpdateOne(dict(zip(UPSERT_KEY, key)), update, upsert=True))
+            indexes.append(index)
+            self.invalidate_counts(document)
+
+        try:
+            write_result = await self.get_model().get_motor_collection().bulk_write(operations, ordered=False)
+            details = write_result.bulk_api_result
+        except BulkWriteError as e:
+            details = e.details
+
+        # indexes in the bulk result refer to the operations, not to the items
+        upserted = {indexes[upsert['index']]: upsert['_id'] for upsert in details['upserted']}
+        errors = {indexes[error['index']]: error['errmsg'] for error in details['writeErrors']}
+        for index in indexes:
+            if index in errors:
+                results[index] = BulkItemResult(index=index, status=BulkItemStatus.failed, error=errors[index])
+            elif index in upserted:
+                results[index] = BulkItemResult(index=index, status=BulkItemStatus.created, id=str(upserted[index]))
+            else:
+                status = BulkItemStatus.updated if update_fields else BulkItemStatus.unchanged
+                results[index] = BulkItemResult(index=index, status=status)
+
+        return [results[index] for index in range(len(items))]
 
     async def find(
             self,
@@ -48,7 +117,13 @@ class BaseRepository(Generic[T], ABC):
             skip: int = 0,
             limit: int = 10,
             sort_by: Optional[Dict[str, int]] = None,
+            count_mode: CountMode = CountMode.exact,
     ) -> tuple[int, List[T]]:
+        """
+        Return the total number of matching documents and the requested page of them.
+        The total is counted concurrently with the page fetch and cached per filter,
+        so paging through one listing counts it once.
+        """
         model = self.get_model()
         query = model.find(filters)
         if sort_by:
@@ -58,6 +133,27 @@ class BaseRepository(Generic[T], ABC):
             ]
             query = query.sort(*sort_params)
 
-        documents = await query.skip(skip).limit(limit).to_list()
+        page = query.skip(skip).limit(limit).to_list()
+
+        count_cache = self.get_count_cache()
+        collection_name = model.get_collection_name()
+        cache_key = count_cache.make_key(collection_name, count_mode.value, filters)
+        total = count_cache.get(cache_key)
+        if total is not None:
+            return total, await page
+
+        documents, total = await asyncio.gather(page, self.count(filters, count_mode))
+        count_cache.put(cache_key, total, collection_name, filters)
+        return total, documents
 
-        return len(documents), documents
+    async def count(self, filters: Dict[str, Any], count_mode: CountMode = CountMode.exact) -> int:
+        """
+        Count matching documents: exactly, exactly up to settings.count_cap, or from the collection metadata.
+        The metadata estimate ignores filters, so it is used only for an unfiltered listing.
+        """
+        collection = self.get_model().get_motor_collection()
+        if count_mode == CountMode.estimated and not filters:
+            return await collection.estimated_document_count()
+        if count_mode == CountMode.exact:
+            return await collection.count_documents(filters)
+        return await collection.count_documents(filters, limit=settings.count_cap)
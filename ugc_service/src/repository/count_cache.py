@@ -0,0 +1,71 @@
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from ugc_service.src.core.config import settings
+
+
+class CountCache:
+    """
+    Totals of list queries in process memory, keyed by collection, count mode and a fingerprint of the filters.
+    A write through this process drops the totals whose filters may match the written document,
+    writes of other instances become visible once the ttl expires.
+    """
+
+    def __init__(self, ttl: float, max_size: int):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: OrderedDict[str, tuple[float, int, str, Dict[str, Any]]] = OrderedDict()
+
+    @staticmethod
+    def make_key(collection: str, mode: str, filters: Dict[str, Any]) -> str:
+        normalized = json.dumps(filters, sort_keys=True, separators=(',', ':'), default=str)
+        fingerprint = hashlib.blake2b(normalized.encode(), digest_size=16).hexdigest()
+        return f'{collection}:{mode}:{fingerprint}'
+
+    def get(self, key: str) -> Optional[int]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, total, _, _ = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return total
+
+    def put(self, key: str, total: int, collection: str, filters: Dict[str, Any]) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, total, collection, filters)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, collection: str, document: Dict[str, Any]) -> None:
+        stale = [
+            key for key, (_, _, entry_collection, filters) in self._entries.items()
+            if entry_collection == collection and self._may_match(filters, document)
+        ]
+        for key in stale:
+            del self._entries[key]
+
+    @staticmethod
+    def _may_match(filters: Dict[str, Any], document: Dict[str, Any]) -> bool:
+        # only plain equality on top-level fields is checked, any other condition is treated as a possible match
+        for key, value in filters.items():
+            if isinstance(value, dict) or key.startswith('$') or key not in document:
+                continue
+            field = document[key]
+            if isinstance(field, (list, set, tuple)) and not isinstance(value, (list, set, tuple)):
+                if value not in field:
+                    return False
+            elif field != value:
+                return False
+        return True
+
+
+@lru_cache()
+def get_count_cache() -> CountCache:
+    return CountCache(settings.count_cache_ttl, settings.count_cache_size)
@@ -1,41 +1,193 @@
+from collections import defaultdict
+from datetime import datetime, timezone
 from functools import lru_cache
-from typing import Type
-from ugc_service.src.models.documents import FilmRating
-from ugc_service.src.models.models import FilmAggregatedRatingResponse
+from typing import List, Optional, Type
+
+from bson import ObjectId
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import DuplicateKeyError
+
+from ugc_service.src.core.exceptions import DuplicateException
+from ugc_service.src.models.documents import FilmRating, FilmRatingStats
+from ugc_service.src.models.models import BulkItemResult, BulkItemStatus, FilmAggregatedRatingResponse
 from ugc_service.src.repository.base import BaseRepository
 
 
 class FilmRatingRepository(BaseRepository[FilmRating]):
+    """
+    Ratings together with per-film counters in film_rating_stats.
+    Every write applies its delta to the counters with an atomic $inc, so reading the average is a point read.
+    """
+
     def get_model(self) -> Type[FilmRating]:
         return FilmRating
 
+    async def create(self, item: FilmRating) -> FilmRating:
+        item = await super().create(item)
+        await self.apply_rating_change(item.film_id, added=item.rating)
+        return item
+
+    async def update(self, item_id: str, item: FilmRating) -> Optional[FilmRating]:
+        update_data = item.model_dump(include={'user_id', 'film_id', 'rating'})
+        try:
+            previous = await FilmRating.get_motor_collection().find_one_and_update(
+                {'_id': ObjectId(item_id)},
+                {'$set': update_data},
+                return_document=ReturnDocument.BEFORE,
+            )
+        except DuplicateKeyError as e:
+            raise DuplicateException('Duplicate key in MongoDB') from e
+        if previous is None:
+            return None
+        self.invalidate_counts(previous)
+        self.invalidate_counts(update_data)
+
+        if previous['film_id'] == item.film_id:
+            await self.apply_rating_change(item.film_id, added=item.rating, removed=previous['rating'])
+        else:
+            await self.apply_rating_change(previous['film_id'], removed=previous['rating'])
+            await self.apply_rating_change(item.film_id, added=item.rating)
+        return FilmRating.model_validate({**previous, **update_data})
+
+    async def delete(self, item_id: str) -> None:
+        await self._delete_one({'_id': ObjectId(item_id)})
+
+    async def delete_user_rating(self, user_id: str, film_id: str) -> None:
+        await self._delete_one({'user_id': user_id, 'film_id': film_id})
+
+    async def _delete_one(self, filters: dict) -> None:
+        previous = await FilmRating.get_motor_collection().find_one_and_delete(filters)
+        if previous is not None:
+            self.invalidate_counts(previous)
+            await self.apply_rating_change(previous['film_id'], removed=previous['rating'])
+
+    async def bulk_upsert(self, items: List[FilmRating], update_fields: List[str]) -> List[BulkItemResult]:
+        """
+        Upsert ratings in bulk and apply the deltas of every film with one more bulk_write.
+        Previous ratings are read before the write, so a rating changed concurrently
+        may skew the counters until the next repair.
+        """
+        previous_ratings = {
+            (document['user_id'], document['film_id']): document['rating']
+            async for document in FilmRating.get_motor_collection().find(
+                {'$or': [{'user_id': item.user_id, 'film_id': item.film_id} for item in items]},
+                {'user_id': 1, 'film_id': 1, 'rating': 1},
+            )
+        }
+        results = await super().bulk_upsert(items, update_fields)
+
+        increments = defaultdict(lambda: defaultdict(int))
+        for item, result in zip(items, results):
+            if result.status == BulkItemStatus.failed:
+                continue
+            removed = previous_ratings.get((item.user_id, item.film_id))
+            if result.status == BulkItemStatus.created:
+                removed = None
+            self._add_increments(increments[item.film_id], added=item.rating, removed=removed)
+
+        operations = []
+        for film_id, film_increments in increments.items():
+            film_increments = {field: delta for field, delta in film_increments.items() if delta}
+            if film_increments:
+                operations.append(UpdateOne({'film_id': film_id}, {'$inc': film_increments}, upsert=True))
+        if operations:
+            await FilmRatingStats.get_motor_collection().bulk_write(operations, ordered=False)
+        return results
+
+    async def get_user_ratings_for_films(self, user_id: str, film_ids: List[str]) -> List[FilmRating]:
+        return await FilmRating.find({'user_id': user_id, 'film_id': {'$in': film_ids}}).to_list()
+
+    async def apply_rating_change(
+            self,
+            film_id: str,
+            added: Optional[int] = None,
+            removed: Optional[int] = None,
+    ) -> None:
+        increments = defaultdict(int)
+        self._add_increments(increments, added, removed)
+
+        increments = {field: delta for field, delta in increments.items() if delta}
+        if not increments:
+            return
+        await FilmRatingStats.get_motor_collection().update_one(
+            {'film_id': film_id},
+            {'$inc': increments},
+            upsert=True,
+        )
+
+    @staticmethod
+    def _add_increments(increments: defaultdict, added: Optional[int] = None, removed: Optional[int] = None) -> None:
+        if added is not None:
+            increments['ratings_sum'] += added
+            increments['ratings_count'] += 1
+            increments[f'histogram.{added}'] += 1
+        if removed is not None:
+            increments['ratings_sum'] -= removed
+            increments['ratings_count'] -= 1
+            increments[f'histogram.{removed}'] -= 1
+
     async def get_average_rating(self, film_id: str) -> FilmAggregatedRatingResponse:
-        pipeline = [
-            {'$match': {'film_id': film_id}},
-            {
-                '$group': {
-                    '_id': '$film_id',
-                    'avg_rating': {'$avg': '$rating'},
-                    'total_ratings': {'$sum': 1},
-                }
-            }
-        ]
-        aggregate_result = await FilmRating.aggregate(pipeline).to_list()
+        stats = await FilmRatingStats.find_one(FilmRatingStats.film_id == film_id)
 
-        if not aggregate_result:
+        if not stats or stats.ratings_count <= 0:
             return FilmAggregatedRatingResponse(
                 film_id=film_id,
                 avg_rating=0.0,
                 total_ratings=0,
             )
 
-        doc = aggregate_result[0]
         return FilmAggregatedRatingResponse(
             film_id=film_id,
-            avg_rating=doc['avg_rating'],
-            total_ratings=doc['total_ratings'],
+            avg_rating=stats.ratings_sum / stats.ratings_count,
+            total_ratings=stats.ratings_count,
+            histogram={int(rating): count for rating, count in stats.histogram.items() if count},
         )
 
+    async def recompute_stats(self, film_id: Optional[str] = None) -> None:
+        """
+        Rebuild the counters of one film, or of every film, from the ratings themselves.
+        Counters of films left without ratings are removed. Deltas applied while the rebuild runs
+        may be overwritten, the next run corrects them.
+        """
+        started = datetime.now(timezone.utc)
+        film_filter = {'film_id': film_id} if film_id else {}
+        pipeline = [
+            {'$match': film_filter},
+            {'$group': {'_id': {'film_id': '$film_id', 'rating': '$rating'}, 'count': {'$sum': 1}}},
+            {
+                '$group': {
+                    '_id': '$_id.film_id',
+                    'ratings_sum': {'$sum': {'$multiply': ['$_id.rating', '$count']}},
+                    'ratings_count': {'$sum': '$count'},
+                    'histogram': {'$push': {'k': {'$toString': '$_id.rating'}, 'v': '$count'}},
+                }
+            },
+            {
+                '$project': {
+                    '_id': 0,
+                    'film_id': '$_id',
+                    'ratings_sum': 1,
+                    'ratings_count': 1,
+                    'histogram': {'$arrayToObject': '$histogram'},
+                    'repaired_at': started,
+                }
+            },
+            {
+                '$merge': {
+                    'into': FilmRatingStats.Settings.name,
+                    'on': 'film_id',
+                    'whenMatched': 'replace',
+                    'whenNotMatched': 'insert',
+                }
+            },
+        ]
+        await FilmRating.aggregate(pipeline).to_list()
+
+        await FilmRatingStats.get_motor_collection().delete_many({
+            **film_filter,
+            '$or': [{'repaired_at': {'$lt': started}}, {'ratings_count': {'$lte': 0}}],
+        })
+
 
 @lru_cache()
 def get_film_rating_repository() -> FilmRatingRepository:
@@ -0,0 +1,78 @@
+import time
+from collections import OrderedDict, defaultdict
+from functools import lru_cache
+from typing import Dict, List, Optional, Set
+
+from ugc_service.src.core.config import settings
+from ugc_service.src.models.documents import FilmRating
+
+
+class PendingRatings:
+    """
+    Ratings accepted in the write-behind mode and possibly not written to MongoDB yet, kept in process memory
+    so the submitting user reads own ratings back. A pending deletion keeps the deleted rating
+    to hide the stored one. An entry is dropped once the ttl expires, the consumer is expected
+    to write it by then. Ratings accepted by other instances are not visible here.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._expires_at: OrderedDict[tuple[str, str], float] = OrderedDict()
+        self._by_user: Dict[str, Dict[str, FilmRating]] = defaultdict(dict)
+        self._by_id: Dict[str, FilmRating] = {}
+        self._deleted: Set[tuple[str, str]] = set()
+
+    def add(self, rating: FilmRating, deleted: bool = False) -> None:
+        self._purge()
+        key = (rating.user_id, rating.film_id)
+        self._remove(key)
+        self._expires_at[key] = time.monotonic() + self.ttl
+        self._by_user[rating.user_id][rating.film_id] = rating
+        self._by_id[str(rating.id)] = rating
+        if deleted:
+            self._deleted.add(key)
+
+    def is_deleted(self, rating: FilmRating) -> bool:
+        return (rating.user_id, rating.film_id) in self._deleted
+
+    def get(self, rating_id: str) -> Optional[FilmRating]:
+        self._purge()
+        return self._by_id.get(rating_id)
+
+    def get_user_rating(self, user_id: str, film_id: str) -> Optional[FilmRating]:
+        self._purge()
+        return self._by_user.get(user_id, {}).get(film_id)
+
+    def get_user_ratings(self, user_id: str) -> List[FilmRating]:
+        self._purge()
+        return list(self._by_user.get(user_id, {}).values())
+
+    def discard(self, rating_id: str) -> None:
+        rating = self._by_id.get(rating_id)
+        if rating is not None:
+            self._remove((rating.user_id, rating.film_id))
+
+    def _purge(self) -> None:
+        # entries share one ttl, so the oldest ones expire first
+        now = time.monotonic()
+        while self._expires_at:
+            key, expires_at = next(iter(self._expires_at.items()))
+            if expires_at >= now:
+                break
+            self._remove(key)
+
+    def _remove(self, key: tuple[str, str]) -> None:
+        if self._expires_at.pop(key, None) is None:
+            return
+        self._deleted.discard(key)
+        user_id, film_id = key
+        user_ratings = self._by_user[user_id]
+        rating = user_ratings.pop(film_id)
+        self._by_id.pop(str(rating.id), None)
+        if not user_ratings:
+            del self._by_user[user_id]
+
+
+@lru_cache()
+def get_pending_ratings() -> PendingRatings:
+    return PendingRatings(settings.pending_ratings_ttl)
@@ -1,14 +1,97 @@
 from functools import lru_cache
-from typing import Type
+from typing import Any, Dict, Optional, Type
+
+from bson import ObjectId
+from pymongo import ReturnDocument
 
 from ugc_service.src.models.documents import Review
+from ugc_service.src.models.models import ReactionType
 from ugc_service.src.repository.base import BaseRepository
 
+REACTION_FIELDS = {
+    ReactionType.like: ('likes', 'dislikes'),
+    ReactionType.dislike: ('dislikes', 'likes'),
+}
+
 
 class ReviewRepository(BaseRepository[Review]):
+    # a concurrent reaction of the same user can change the state between the conditional updates
+    TOGGLE_ATTEMPTS = 3
+
     def get_model(self) -> Type[Review]:
         return Review
 
+    async def update_fields(self, item_id: str, fields: Dict[str, Any]) -> Optional[Review]:
+        """
+        Set the given fields in one atomic update, leaving reactions written concurrently intact.
+        """
+        document = await Review.get_motor_collection().find_one_and_update(
+            {'_id': ObjectId(item_id)},
+            {'$set': fields},
+            return_document=ReturnDocument.AFTER,
+        )
+        if document is None:
+            return None
+        self.invalidate_counts(document)
+        return Review.model_validate(document)
+
+    async def toggle_reaction(self, review_id: str, user_id: str, reaction: ReactionType) -> bool:
+        """
+        Toggle the reaction of the user with conditional updates that hold the state in their filter,
+        so the reaction sets and their counters change together in one atomic update_one.
+        Return False when the review does not exist.
+        """
+        field, opposite = REACTION_FIELDS[reaction]
+        count_field, opposite_count_field = f'{field}_count', f'{opposite}_count'
+        review_filter = {'_id': ObjectId(review_id)}
+        collection = Review.get_motor_collection()
+
+        updates = [
+            # no reaction yet
+            (
+                {field: {'$ne': user_id}, opposite: {'$ne': user_id}},
+                {'$addToSet': {field: user_id}, '$inc': {count_field: 1}},
+            ),
+            # the same reaction again takes it back
+            (
+                {field: user_id},
+                {'$pull': {field: user_id}, '$inc': {count_field: -1}},
+            ),
+            # the opposite reaction is replaced
+            (
+                {field: {'$ne': user_id}, opposite: user_id},
+                {
+                    '$addToSet': {field: user_id},
+                    '$pull': {opposite: user_id},
+                    '$inc': {count_field: 1, opposite_count_field: -1},
+                },
+            ),
+        ]
+
+        for _ in range(self.TOGGLE_ATTEMPTS):
+            for state_filter, update in updates:
+                result = await collection.update_one({**review_filter, **state_filter}, update)
+                if result.matched_count:
+                    return True
+            if not await collection.count_documents(review_filter, limit=1):
+                return False
+        raise RuntimeError(f'Reaction of {user_id} to review {review_id} keeps changing concurrently')
+
+    async def backfill_reaction_counts(self) -> int:
+        """
+        Fill likes_count and dislikes_count of reviews written before the counters existed.
+        """
+        result = await Review.get_motor_collection().update_many(
+            {'likes_count': {'$exists': False}},
+            [{
+                '$set': {
+                    'likes_count': {'$size': {'$ifNull': ['$likes', []]}},
+                    'dislikes_count': {'$size': {'$ifNull': ['$dislikes', []]}},
+                }
+            }],
+        )
+        return result.modified_count
+
 
 @lru_cache()
 def get_review_repository() -> ReviewRepository:
@@ -8,13 +8,28 @@ from starlette.datastructures import Headers
 
 from ugc_service.src.core.config import settings
 
+if settings.auth_mode == 'local':
+    from auth_client import AccessFeed, AccessVerifier, InvalidTokenError
+
 
 class AuthServiceClient:
     def __init__(self):
         self.service_url = settings.auth_service_url
+        self.verifier = None
+        self.feed = None
+        if settings.auth_mode == 'local':
+            self.verifier = AccessVerifier(settings.auth_jwt_secret_key, settings.auth_jwt_algorithm,
+                                           settings.auth_max_staleness, settings.auth_snapshot_secret_key)
+            self.feed = AccessFeed(self.verifier, settings.auth_feed_url, settings.auth_feed_token)
 
     async def check_permission(self, token: str, resource: str, http_method: str,
                                headers: Headers) -> bool:
+        if self.verifier is not None and self.verifier.ready:
+            try:
+                return self.verifier.check_permission(token, resource, http_method)
+            except InvalidTokenError:
+                return False
+
         headers = {'Authorization': f'Bearer {token}',
                    'X-Request-Id': headers.get('X-Request-Id', str(uuid.uuid4()))}
         query_params = {'resource': resource, 'http_method': http_method}
@@ -1,11 +1,11 @@
 from functools import lru_cache
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 from fastapi import Depends
 
 from ugc_service.src.core.exceptions import DuplicateException
 from ugc_service.src.models.documents import Bookmark
-from ugc_service.src.models.models import PaginatedResponse, BookmarkResponse, BookmarkRequest
+from ugc_service.src.models.models import BulkResponse, CountMode, PaginatedResponse, BookmarkResponse, BookmarkRequest
 from ugc_service.src.repository.bookmark import BookmarkRepository, get_bookmark_repository
 
 
@@ -33,6 +33,14 @@ class BookmarkService:
             timestamp=bookmark_doc.timestamp
         )
 
+    async def create_bookmarks_bulk(self, bookmark_reqs: List[BookmarkRequest], user_id: str) -> BulkResponse:
+        bookmark_docs = [
+            Bookmark(user_id=user_id, film_id=bookmark_req.film_id)
+            for bookmark_req in bookmark_reqs
+        ]
+        results = await self.repository.bulk_upsert(bookmark_docs, update_fields=[])
+        return BulkResponse(items=results)
+
     async def get_bookmark(self, bookmark_id: str) -> Optional[BookmarkResponse]:
         bookmark_doc = await self.repository.get(bookmark_id)
         if not bookmark_doc:
@@ -53,9 +61,10 @@ class BookmarkService:
             filters: Dict[str, Any],
             skip: int = 0,
             limit: int = 10,
-            sort_by: Optional[Dict[str, int]] = None
+            sort_by: Optional[Dict[str, int]] = None,
+            count_mode: CountMode = CountMode.exact
     ) -> PaginatedResponse[BookmarkResponse]:
-        count, bookmarks = await self.repository.find(filters, skip, limit, sort_by)
+        count, bookmarks = await self.repository.find(filters, skip, limit, sort_by, count_mode)
 
         bookmark_responses = [
             BookmarkResponse(
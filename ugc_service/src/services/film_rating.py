@@ -1,17 +1,24 @@
+from collections import defaultdict
 from functools import lru_cache
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
+from beanie import PydanticObjectId
 from fastapi import Depends
 
+from ugc_service.src.core.config import settings
+from ugc_service.src.core.exceptions import DuplicateException
+from ugc_service.src.core.kafka import rating_producer
 from ugc_service.src.models.documents import FilmRating
-from ugc_service.src.models.models import FilmAggregatedRatingResponse, FilmRatingResponse, \
-    FilmRatingCreate, PaginatedResponse
+from ugc_service.src.models.models import BulkItemResult, BulkItemStatus, BulkResponse, CountMode, \
+    FilmAggregatedRatingResponse, FilmRatingBulkItem, FilmRatingDeletion, FilmRatingResponse, FilmRatingCreate, PaginatedResponse
 from ugc_service.src.repository.film_rating import FilmRatingRepository, get_film_rating_repository
+from ugc_service.src.repository.pending_ratings import PendingRatings, get_pending_ratings
 
 
 class FilmRatingService:
-    def __init__(self, repository: FilmRatingRepository):
+    def __init__(self, repository: FilmRatingRepository, pending_ratings: PendingRatings):
         self.repository = repository
+        self.pending_ratings = pending_ratings
 
     async def create_rating(self, rating_data: FilmRatingCreate) -> FilmRatingResponse:
         film_rating_doc = FilmRating(
@@ -19,6 +26,9 @@ class FilmRatingService:
             film_id=rating_data.film_id,
             rating=rating_data.rating,
         )
+        if settings.rating_write_mode == 'write_behind':
+            return await self._submit_rating(film_rating_doc)
+
         film_rating_doc = await self.repository.create(film_rating_doc)
         return FilmRatingResponse(
             id=str(film_rating_doc.id),
@@ -28,8 +38,62 @@ class FilmRatingService:
             timestamp=film_rating_doc.timestamp,
         )
 
+    async def _submit_rating(self, film_rating_doc: FilmRating) -> FilmRatingResponse:
+        """
+        Append a new rating to Kafka and answer without waiting for MongoDB. The rating gets its id here
+        and the consumer inserts it with that id. A pending or stored rating of the film is a conflict,
+        as in the direct mode. Two first ratings of one film sent at once through different instances
+        are both accepted, the one written first is kept.
+        """
+        if await self._find_user_rating(film_rating_doc.user_id, film_rating_doc.film_id) is not None:
+            raise DuplicateException('Rating of this film by the user already exists')
+        film_rating_doc.id = PydanticObjectId()
+        await rating_producer.send_rating(film_rating_doc.model_dump(mode='json'))
+        self.pending_ratings.add(film_rating_doc)
+        return self._to_response(film_rating_doc)
+
+    async def create_ratings_bulk(self, ratings_data: List[FilmRatingBulkItem], user_id: str) -> BulkResponse:
+        film_rating_docs = [FilmRating(user_id=user_id, **rating_data.model_dump()) for rating_data in ratings_data]
+        if settings.rating_write_mode == 'write_behind':
+            return await self._submit_ratings_bulk(film_rating_docs)
+        results = await self.repository.bulk_upsert(film_rating_docs, update_fields=['rating'])
+        return BulkResponse(items=results)
+
+    async def _submit_ratings_bulk(self, film_rating_docs: List[FilmRating]) -> BulkResponse:
+        """
+        Upsert ratings through Kafka, so they stay ordered with the other changes of the same ratings.
+        An existing rating keeps its id and timestamp, a new one gets its id here.
+        """
+        results: Dict[int, BulkItemResult] = {}
+        submitted: Dict[int, FilmRating] = {}
+        seen_keys = set()
+        for index, doc in enumerate(film_rating_docs):
+            key = (doc.user_id, doc.film_id)
+            if key in seen_keys:
+                results[index] = BulkItemResult(
+                    index=index, status=BulkItemStatus.failed, error='Duplicate user_id and film_id in the request'
+                )
+                continue
+            seen_keys.add(key)
+            submitted[index] = doc
+
+        existing = await self._find_user_ratings([(doc.user_id, doc.film_id) for doc in submitted.values()])
+        for index, doc in submitted.items():
+            current = existing.get((doc.user_id, doc.film_id))
+            if current is not None:
+                doc.id, doc.timestamp = current.id, current.timestamp
+                results[index] = BulkItemResult(index=index, status=BulkItemStatus.updated, id=str(doc.id))
+            else:
+                doc.id = PydanticObjectId()
+                results[index] = BulkItemResult(index=index, status=BulkItemStatus.created, id=str(doc.id))
+
+        await rating_producer.send_ratings([doc.model_dump(mode='json') for doc in submitted.values()])
+        for doc in submitted.values():
+            self.pending_ratings.add(doc)
+        return BulkResponse(items=[results[index] for index in range(len(film_rating_docs))])
+
     async def get_rating(self, rating_id: str) -> Optional[FilmRatingResponse]:
-        doc = await self.repository.get(rating_id)
+        doc = await self._find_rating(rating_id)
         if not doc:
             return None
         return FilmRatingResponse(
@@ -43,13 +107,10 @@ class FilmRatingService:
     async def update_rating(
             self, rating_id: str, rating_data: FilmRatingCreate
     ) -> Optional[FilmRatingResponse]:
-        existing_doc = await self.repository.get(rating_id)
-        if not existing_doc:
-            return None
-        existing_doc.user_id = rating_data.user_id
-        existing_doc.film_id = rating_data.film_id
-        existing_doc.rating = rating_data.rating
-        updated_doc = await self.repository.update(rating_id, existing_doc)
+        if settings.rating_write_mode == 'write_behind':
+            return await self._submit_rating_update(rating_id, rating_data)
+
+        updated_doc = await self.repository.update(rating_id, FilmRating(**rating_data.model_dump()))
         if not updated_doc:
             return None
         return FilmRatingResponse(
@@ -60,9 +121,62 @@ class FilmRatingService:
             timestamp=updated_doc.timestamp,
         )
 
+    async def _submit_rating_update(
+            self, rating_id: str, rating_data: FilmRatingCreate
+    ) -> Optional[FilmRatingResponse]:
+        """
+        Change the value of a rating through Kafka. Messages are keyed by user and film,
+        so moving a rating to another user or film is not supported in this mode.
+        """
+        current = await self._find_rating(rating_id)
+        if current is None:
+            return None
+        if (current.user_id, current.film_id) != (rating_data.user_id, rating_data.film_id):
+            raise ValueError('user_id and film_id of a rating cannot be changed in the write-behind mode')
+        updated_doc = current.model_copy(update={'rating': rating_data.rating})
+        await rating_producer.send_rating(updated_doc.model_dump(mode='json'))
+        self.pending_ratings.add(updated_doc)
+        return self._to_response(updated_doc)
+
     async def delete_rating(self, rating_id: str) -> None:
+        if settings.rating_write_mode == 'write_behind':
+            # the deletion follows the pending changes of the rating through the topic
+            current = await self._find_rating(rating_id)
+            if current is not None:
+                deletion = FilmRatingDeletion(user_id=current.user_id, film_id=current.film_id)
+                await rating_producer.send_rating(deletion.model_dump())
+                self.pending_ratings.add(current, deleted=True)
+            return
+
+        self.pending_ratings.discard(rating_id)
         await self.repository.delete(rating_id)
 
+    async def _find_rating(self, rating_id: str) -> Optional[FilmRating]:
+        # a pending change is newer than the stored rating with the same id
+        pending = self.pending_ratings.get(rating_id)
+        if pending is not None:
+            return None if self.pending_ratings.is_deleted(pending) else pending
+        return await self.repository.get(rating_id)
+
+    async def _find_user_rating(self, user_id: str, film_id: str) -> Optional[FilmRating]:
+        return (await self._find_user_ratings([(user_id, film_id)])).get((user_id, film_id))
+
+    async def _find_user_ratings(self, keys: List[tuple[str, str]]) -> Dict[tuple[str, str], FilmRating]:
+        """Current ratings of (user_id, film_id) pairs, pending changes laid over the stored ratings."""
+        found = {}
+        missing = defaultdict(list)
+        for user_id, film_id in keys:
+            pending = self.pending_ratings.get_user_rating(user_id, film_id)
+            if pending is None:
+                missing[user_id].append(film_id)
+                continue
+            if not self.pending_ratings.is_deleted(pending):
+                found[(user_id, film_id)] = pending
+        for user_id, film_ids in missing.items():
+            for rating in await self.repository.get_user_ratings_for_films(user_id, film_ids):
+                found[(rating.user_id, rating.film_id)] = rating
+        return found
+
     async def get_average_rating(self, film_id: str) -> FilmAggregatedRatingResponse:
         return await self.repository.get_average_rating(film_id)
 
@@ -71,9 +185,10 @@ class FilmRatingService:
             filters: Dict[str, Any],
             skip: int = 0,
             limit: int = 10,
-            sort_by: Optional[Dict[str, int]] = None
+            sort_by: Optional[Dict[str, int]] = None,
+            count_mode: CountMode = CountMode.exact
     ) -> PaginatedResponse[FilmRatingResponse]:
-        count, film_ratings = await self.repository.find(filters, skip, limit, sort_by)
+        count, film_ratings = await self.repository.find(filters, skip, limit, sort_by, count_mode)
 
         film_ratings_responses = [
             FilmRatingResponse(
@@ -88,9 +203,55 @@ class FilmRatingService:
 
         return PaginatedResponse(total=count, items=film_ratings_responses)
 
+    async def get_user_ratings(
+            self,
+            user_id: str,
+            skip: int = 0,
+            limit: int = 10,
+            sort_by: Optional[Dict[str, int]] = None,
+            count_mode: CountMode = CountMode.exact
+    ) -> PaginatedResponse[FilmRatingResponse]:
+        """
+        Ratings of the user with the changes still waiting in Kafka laid over them.
+        A pending change replaces the stored value and a pending deletion hides it,
+        a pending new rating is added to the first page and to the total, so that page may hold more than limit items.
+        """
+        page = await self.search_film_ratings({'user_id': user_id}, skip, limit, sort_by, count_mode)
+        pending = {rating.film_id: rating for rating in self.pending_ratings.get_user_ratings(user_id)}
+        if not pending:
+            return page
+
+        deleted = {film_id for film_id, rating in pending.items() if self.pending_ratings.is_deleted(rating)}
+        items = [
+            item.model_copy(update={'rating': pending[item.film_id].rating}) if item.film_id in pending else item
+            for item in page.items
+            if item.film_id not in deleted
+        ]
+        stored = await self.repository.get_user_ratings_for_films(user_id, list(pending))
+        stored_film_ids = {rating.film_id for rating in stored}
+        new_ratings = [
+            rating for film_id, rating in pending.items()
+            if film_id not in stored_film_ids and film_id not in deleted
+        ]
+        if skip == 0:
+            items = [self._to_response(rating) for rating in new_ratings] + items
+        total = page.total + len(new_ratings) - len(deleted & stored_film_ids)
+        return PaginatedResponse(total=total, items=items)
+
+    @staticmethod
+    def _to_response(film_rating: FilmRating) -> FilmRatingResponse:
+        return FilmRatingResponse(
+            id=str(film_rating.id),
+            user_id=film_rating.user_id,
+            film_id=film_rating.film_id,
+            rating=film_rating.rating,
+            timestamp=film_rating.timestamp,
+        )
+
 
 @lru_cache()
 def get_film_rating_service(
-        repository: FilmRatingRepository = Depends(get_film_rating_repository)
+        repository: FilmRatingRepository = Depends(get_film_rating_repository),
+        pending_ratings: PendingRatings = Depends(get_pending_ratings),
 ) -> FilmRatingService:
-    return FilmRatingService(repository)
+    return FilmRatingService(repository, pending_ratings)
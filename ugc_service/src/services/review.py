@@ -1,12 +1,12 @@
 from functools import lru_cache
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 from fastapi import Depends
 
 from ugc_service.src.core.exceptions import DuplicateException
 from ugc_service.src.models.documents import Review
-from ugc_service.src.models.models import PaginatedResponse, ReviewResponse, ReactionType, \
-    ReviewCreate, ReviewUpdate
+from ugc_service.src.models.models import BulkResponse, CountMode, PaginatedResponse, ReviewResponse, ReactionType, \
+    ReviewBulkItem, ReviewCreate, ReviewUpdate
 from ugc_service.src.repository.review import get_review_repository, ReviewRepository
 
 
@@ -31,6 +31,11 @@ class ReviewService:
 
         return self._to_response(review_doc)
 
+    async def create_reviews_bulk(self, data: List[ReviewBulkItem], user_id: str) -> BulkResponse:
+        review_docs = [Review(user_id=user_id, **item.model_dump()) for item in data]
+        results = await self.repository.bulk_upsert(review_docs, update_fields=['review_text', 'rating'])
+        return BulkResponse(items=results)
+
     async def get_review(self, review_id: str) -> Optional[ReviewResponse]:
         doc = await self.repository.get(review_id)
         if not doc:
@@ -38,14 +43,7 @@ class ReviewService:
         return self._to_response(doc)
 
     async def update_review(self, review_id: str, data: ReviewUpdate) -> Optional[ReviewResponse]:
-        doc = await self.repository.get(review_id)
-        if not doc:
-            return None
-
-        doc.review_text = data.review_text
-        doc.rating = data.rating
-
-        updated = await self.repository.update(review_id, doc)
+        updated = await self.repository.update_fields(review_id, data.model_dump())
         if not updated:
             return None
         return self._to_response(updated)
@@ -59,31 +57,14 @@ class ReviewService:
             skip: int = 0,
             limit: int = 10,
             sort_by: Optional[Dict[str, int]] = None,
+            count_mode: CountMode = CountMode.exact
     ) -> PaginatedResponse[ReviewResponse]:
-        count, docs = await self.repository.find(filters, skip, limit, sort_by)
+        count, docs = await self.repository.find(filters, skip, limit, sort_by, count_mode)
         items = [self._to_response(doc) for doc in docs]
         return PaginatedResponse(total=count, items=items)
 
     async def toggle_reaction(self, review_id: str, user_id: str, reaction: ReactionType) -> bool:
-        doc = await self.repository.get(review_id)
-        if not doc:
-            return False
-
-        if reaction == ReactionType.like:
-            if user_id in doc.likes:
-                doc.likes.remove(user_id)
-            else:
-                doc.likes.add(user_id)
-                doc.dislikes.discard(user_id)
-        elif reaction == ReactionType.dislike:
-            if user_id in doc.dislikes:
-                doc.dislikes.remove(user_id)
-            else:
-                doc.dislikes.add(user_id)
-                doc.likes.discard(user_id)
-
-        await self.repository.update(review_id, doc)
-        return True
+        return await self.repository.toggle_reaction(review_id, user_id, reaction)
 
     def _to_response(self, doc: Review) -> ReviewResponse:
         return ReviewResponse(
@@ -92,8 +73,8 @@ class ReviewService:
             film_id=doc.film_id,
             review_text=doc.review_text,
             rating=doc.rating,
-            likes_count=len(doc.likes),
-            dislikes_count=len(doc.dislikes),
+            likes_count=doc.likes_count,
+            dislikes_count=doc.dislikes_count,
             timestamp=doc.timestamp,
         )
 
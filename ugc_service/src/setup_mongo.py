@@ -4,15 +4,22 @@ import logging
 
 from ugc_service.src.core.config import settings
 from ugc_service.src.core.mongo import mongo_client
-from ugc_service.src.models.documents import Bookmark, FilmRating, Review
+from ugc_service.src.models.documents import Bookmark, FilmRating, FilmRatingStats, Review
+from ugc_service.src.repository.review import get_review_repository
 
 logger = logging.getLogger(__name__)
 
+DOCUMENT_MODELS = [Bookmark, FilmRating, FilmRatingStats, Review]
+
 
 async def init_mongo_and_shard():
-    await init_beanie(database=mongo_client, document_models=[Bookmark, FilmRating, Review])
+    await init_beanie(database=mongo_client, document_models=DOCUMENT_MODELS)
     logger.info('Beanie initialized with database and document models')
 
+    backfilled = await get_review_repository().backfill_reaction_counts()
+    if backfilled:
+        logger.info('Reaction counters filled for %s reviews', backfilled)
+
     sync_client = MongoClient(settings.mongo_url)
     admin_db = sync_client['admin']
 
@@ -24,6 +31,7 @@ async def init_mongo_and_shard():
             ('bookmarks', {'user_id': 1, 'film_id': 1}),
             ('film_ratings', {'user_id': 1, 'film_id': 1}),
             ('reviews', {'user_id': 1, 'film_id': 1}),
+            ('film_rating_stats', {'film_id': 1}),
         ]
 
         for collection_name, shard_key in shard_configurations:
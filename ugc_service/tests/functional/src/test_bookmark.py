@@ -122,6 +122,35 @@ async def test_get_bookmarks_by_user(
         assert fid in returned_film_ids
 
 
+async def test_get_bookmarks_total_exceeds_page(
+        make_post_request,
+        make_get_request,
+        token_factory,
+        unique_bookmark_data
+):
+    test_user_id = f'user_{uuid.uuid4()}'
+    user_token = token_factory(user_id=test_user_id)
+
+    for i in range(3):
+        data = deepcopy(unique_bookmark_data)
+        data['film_id'] = f'film_{i}_{uuid.uuid4()}'
+        _, _, status = await make_post_request(
+            BASE_BOOKMARKS_ENDPOINT,
+            json=data,
+            headers={'Authorization': f'Bearer {user_token}'}
+        )
+        assert status == HTTPStatus.OK
+
+    for skip in (0, 2):
+        response_json, _, status = await make_get_request(
+            f'{BASE_BOOKMARKS_ENDPOINT}/users/{test_user_id}?limit=2&skip={skip}',
+            headers={'Authorization': f'Bearer {user_token}'}
+        )
+        assert status == HTTPStatus.OK
+        assert response_json['total'] == 3
+        assert len(response_json['items']) == (2 if skip == 0 else 1)
+
+
 async def test_search_bookmarks(make_post_request, valid_token, unique_bookmark_data):
     film_ids = []
     for i in range(3):
@@ -136,6 +136,77 @@ async def test_get_average_rating(make_post_request, make_get_request, valid_tok
     )
 
 
+async def test_average_rating_after_delete(make_post_request, make_get_request, make_delete_request,
+                                          valid_token, unique_rating_create_data):
+    film_id = f'film_{uuid.uuid4()}'
+    rating_ids = []
+
+    for rating_val in (2, 8):
+        rating_data = deepcopy(unique_rating_create_data)
+        rating_data['film_id'] = film_id
+        rating_data['user_id'] = f'user_{uuid.uuid4()}'
+        rating_data['rating'] = rating_val
+
+        create_response, _, status = await make_post_request(
+            BASE_RATINGS_ENDPOINT,
+            json=rating_data,
+            headers={'Authorization': f'Bearer {valid_token}'}
+        )
+        assert status == HTTPStatus.OK, f'Expected {HTTPStatus.OK}, got {status}'
+        rating_ids.append(create_response['id'])
+
+    _, _, del_status = await make_delete_request(
+        f'{BASE_RATINGS_ENDPOINT}/{rating_ids[0]}',
+        headers={'Authorization': f'Bearer {valid_token}'}
+    )
+    assert del_status == HTTPStatus.NO_CONTENT, f'Expected {HTTPStatus.NO_CONTENT}, got {del_status}'
+
+    response_json, _, status = await make_get_request(
+        f'{BASE_RATINGS_ENDPOINT}/{film_id}/average',
+        headers={'Authorization': f'Bearer {valid_token}'}
+    )
+    assert status == HTTPStatus.OK, f'Expected {HTTPStatus.OK}, got {status}'
+    assert response_json['avg_rating'] == 8, f'Expected avg_rating=8, got {response_json["avg_rating"]}'
+    assert response_json['total_ratings'] == 1, f'Expected total_ratings=1, got {response_json["total_ratings"]}'
+    assert response_json['histogram'] == {'8': 1}, f'Unexpected histogram {response_json["histogram"]}'
+
+
+async def test_create_ratings_bulk(make_post_request, make_get_request, token_factory,
+                                   unique_rating_create_data):
+    user_id = f'user_{uuid.uuid4()}'
+    headers = {'Authorization': f'Bearer {token_factory(user_id=user_id)}'}
+    film_id, other_film_id = f'film_{uuid.uuid4()}', f'film_{uuid.uuid4()}'
+    others_rating = {**unique_rating_create_data, 'film_id': film_id, 'rating': 2}
+    own_rating = {'user_id': user_id, 'film_id': film_id, 'rating': 4}
+    for data in (others_rating, own_rating):
+        _, _, status = await make_post_request(BASE_RATINGS_ENDPOINT, json=data, headers=headers)
+        assert status == HTTPStatus.OK, f'Expected {HTTPStatus.OK}, got {status}'
+
+    # user_id of the items is ignored, the ratings belong to the token owner
+    items = [
+        {'user_id': others_rating['user_id'], 'film_id': film_id, 'rating': 6},
+        {'film_id': other_film_id, 'rating': 10},
+        {'film_id': other_film_id, 'rating': 1},
+    ]
+    response_json, _, status = await make_post_request(
+        f'{BASE_RATINGS_ENDPOINT}/bulk',
+        json={'items': items},
+        headers=headers
+    )
+    assert status == HTTPStatus.OK, f'Expected {HTTPStatus.OK}, got {status}'
+    statuses = [item['status'] for item in response_json['items']]
+    assert statuses == ['updated', 'created', 'failed'], f'Unexpected statuses {statuses}'
+    assert response_json['items'][1]['id'], 'Missing id of the created rating'
+
+    response_json, _, status = await make_get_request(
+        f'{BASE_RATINGS_ENDPOINT}/{film_id}/average',
+        headers=headers
+    )
+    assert status == HTTPStatus.OK, f'Expected {HTTPStatus.OK}, got {status}'
+    assert response_json['histogram'] == {'2': 1, '6': 1}, f'Unexpected histogram {response_json["histogram"]}'
+    assert response_json['total_ratings'] == 2, f'Expected total_ratings=2, got {response_json["total_ratings"]}'
+
+
 async def test_get_ratings_by_user(make_post_request, make_get_request, valid_token,
                                    unique_rating_create_data):
     test_user_id = f'user_{uuid.uuid4()}'
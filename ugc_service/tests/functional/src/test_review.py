@@ -144,6 +144,35 @@ async def test_react_to_review(make_patch_request, make_post_request, valid_toke
     assert status == HTTPStatus.NO_CONTENT, f'Expected {HTTPStatus.NO_CONTENT}, got {status}'
 
 
+async def test_reaction_counters(make_patch_request, make_post_request, make_get_request, valid_token,
+                                 unique_review_create_data):
+    create_response, _, _ = await make_post_request(
+        BASE_ENDPOINT,
+        json=unique_review_create_data,
+        headers={'Authorization': f'Bearer {valid_token}'}
+    )
+    review_id = create_response['id']
+
+    expected_counts = [(1, 0), (0, 1), (0, 0)]
+    for reaction, (likes_count, dislikes_count) in zip(['like', 'dislike', 'dislike'], expected_counts):
+        _, _, status = await make_patch_request(
+            f'{BASE_ENDPOINT}/{review_id}/reaction',
+            json={'reaction': reaction},
+            headers={'Authorization': f'Bearer {valid_token}'}
+        )
+        assert status == HTTPStatus.NO_CONTENT, f'Expected {HTTPStatus.NO_CONTENT}, got {status}'
+
+        response, _, status = await make_get_request(
+            f'{BASE_ENDPOINT}/{review_id}',
+            headers={'Authorization': f'Bearer {valid_token}'}
+        )
+        assert status == HTTPStatus.OK, f'Expected {HTTPStatus.OK}, got {status}'
+        assert response['likes_count'] == likes_count, f'Expected {likes_count} likes, got {response["likes_count"]}'
+        assert response['dislikes_count'] == dislikes_count, (
+            f'Expected {dislikes_count} dislikes, got {response["dislikes_count"]}'
+        )
+
+
 async def test_get_reviews_by_user(make_get_request, make_post_request, valid_token,
                                    unique_review_create_data):
     test_user_id = str(uuid.uuid4())
@@ -0,0 +1,15 @@
+import os
+
+# settings are read on import, unit tests need no real services
+for name, value in {
+    'MONGO_URL': 'mongodb://localhost:27017',
+    'MONGO_DB': 'ugc_unit_tests',
+    'AUTH_SERVICE_URL': 'http://localhost/api/v1/auth/users/check-permission',
+    'DOCS_TOKEN_URL': 'http://localhost/api/v1/auth/docs-login',
+    'ENV': 'test',
+}.items():
+    os.environ.setdefault(name, value)
+
+pytest_plugins = [
+    'ugc_service.tests.unit.fixtures.mongo',
+]
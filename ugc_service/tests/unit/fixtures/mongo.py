@@ -0,0 +1,15 @@
+import pytest_asyncio
+from beanie import init_beanie
+from mongomock_motor import AsyncMongoMockClient
+
+from ugc_service.src.setup_mongo import DOCUMENT_MODELS
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def beanie_database():
+    """
+    Documents can only be built once beanie is initialized, an in-memory database is enough for that.
+    """
+    database = AsyncMongoMockClient()['ugc_unit_tests']
+    await init_beanie(database=database, document_models=DOCUMENT_MODELS)
+    yield database
@@ -0,0 +1,136 @@
+import uuid
+
+import pytest
+from beanie import PydanticObjectId
+
+from ugc_service.src.core.exceptions import DuplicateException
+from ugc_service.src.models.documents import FilmRating
+from ugc_service.src.models.models import BulkItemStatus, FilmRatingBulkItem, FilmRatingCreate
+from ugc_service.src.repository.film_rating import FilmRatingRepository
+from ugc_service.src.repository.pending_ratings import PendingRatings
+from ugc_service.src.services import film_rating as film_rating_service_module
+from ugc_service.src.services.film_rating import FilmRatingService
+
+pytestmark = pytest.mark.asyncio
+
+
+class RecordingProducer:
+    def __init__(self):
+        self.sent = []
+
+    async def send_rating(self, rating: dict):
+        self.sent.append(rating)
+
+    async def send_ratings(self, ratings: list):
+        self.sent.extend(ratings)
+
+
+@pytest.fixture
+def producer(monkeypatch):
+    producer = RecordingProducer()
+    monkeypatch.setattr(film_rating_service_module, 'rating_producer', producer)
+    monkeypatch.setattr(film_rating_service_module.settings, 'rating_write_mode', 'write_behind')
+    return producer
+
+
+@pytest.fixture
+def user_id() -> str:
+    return f'user_{uuid.uuid4()}'
+
+
+@pytest.fixture
+def service() -> FilmRatingService:
+    return FilmRatingService(FilmRatingRepository(), PendingRatings(ttl=60))
+
+
+async def test_user_ratings_overlay_replaces_and_adds_pending_ratings(service, user_id):
+    for film_id, rating in (('film_1', 3), ('film_2', 5)):
+        await FilmRating(user_id=user_id, film_id=film_id, rating=rating).insert()
+    service.pending_ratings.add(FilmRating(id=PydanticObjectId(), user_id=user_id, film_id='film_1', rating=9))
+    service.pending_ratings.add(FilmRating(id=PydanticObjectId(), user_id=user_id, film_id='film_3', rating=7))
+
+    first_page = await service.get_user_ratings(user_id, skip=0, limit=10, sort_by={'film_id': 1})
+
+    assert first_page.total == 3
+    assert [(item.film_id, item.rating) for item in first_page.items] == [
+        ('film_3', 7), ('film_1', 9), ('film_2', 5),
+    ]
+
+    second_page = await service.get_user_ratings(user_id, skip=1, limit=10, sort_by={'film_id': 1})
+
+    assert second_page.total == 3
+    assert [(item.film_id, item.rating) for item in second_page.items] == [('film_2', 5)]
+
+
+async def test_user_ratings_without_pending_ratings(service, user_id):
+    await FilmRating(user_id=user_id, film_id='film_1', rating=4).insert()
+
+    page = await service.get_user_ratings(user_id)
+
+    assert page.total == 1
+    assert [(item.film_id, item.rating) for item in page.items] == [('film_1', 4)]
+
+
+async def test_write_behind_submission_of_rated_film_is_a_conflict(service, producer, user_id):
+    await FilmRating(user_id=user_id, film_id='film_1', rating=2).insert()
+    await service.create_rating(FilmRatingCreate(user_id=user_id, film_id='film_2', rating=3))
+
+    for film_id in ('film_1', 'film_2'):
+        with pytest.raises(DuplicateException):
+            await service.create_rating(FilmRatingCreate(user_id=user_id, film_id=film_id, rating=8))
+    assert len(producer.sent) == 1
+
+
+async def test_write_behind_update_goes_through_kafka(service, producer, user_id):
+    stored = await FilmRating(user_id=user_id, film_id='film_1', rating=2).insert()
+
+    response = await service.update_rating(
+        str(stored.id), FilmRatingCreate(user_id=user_id, film_id='film_1', rating=8)
+    )
+
+    assert response.id == str(stored.id)
+    assert [(rating['id'], rating['rating']) for rating in producer.sent] == [(str(stored.id), 8)]
+    assert (await service.get_rating(str(stored.id))).rating == 8
+    assert (await FilmRating.get(stored.id)).rating == 2
+
+
+async def test_write_behind_delete_hides_stored_rating(service, producer, user_id):
+    stored = await FilmRating(user_id=user_id, film_id='film_1', rating=2).insert()
+
+    await service.delete_rating(str(stored.id))
+
+    assert producer.sent == [{'user_id': user_id, 'film_id': 'film_1', 'deleted': True}]
+    assert await service.get_rating(str(stored.id)) is None
+    page = await service.get_user_ratings(user_id)
+    assert (page.total, page.items) == (0, [])
+
+    response = await service.create_rating(FilmRatingCreate(user_id=user_id, film_id='film_1', rating=5))
+    assert response.id != str(stored.id)
+
+
+async def test_delete_of_pending_rating_is_sent_after_it(service, producer, user_id):
+    response = await service.create_rating(FilmRatingCreate(user_id=user_id, film_id='film_1', rating=3))
+
+    await service.delete_rating(response.id)
+
+    assert [rating.get('deleted', False) for rating in producer.sent] == [False, True]
+    assert await service.get_rating(response.id) is None
+    assert (await service.get_user_ratings(user_id)).total == 0
+
+
+async def test_write_behind_bulk_keeps_existing_ids(service, producer, user_id):
+    stored = await FilmRating(user_id=user_id, film_id='film_1', rating=2).insert()
+    ratings = [
+        FilmRatingBulkItem(film_id='film_1', rating=8),
+        FilmRatingBulkItem(film_id='film_2', rating=4),
+        FilmRatingBulkItem(film_id='film_2', rating=5),
+    ]
+
+    response = await service.create_ratings_bulk(ratings, user_id)
+
+    assert [item.status for item in response.items] == [
+        BulkItemStatus.updated, BulkItemStatus.created, BulkItemStatus.failed,
+    ]
+    assert response.items[0].id == str(stored.id)
+    assert [(rating['film_id'], rating['rating']) for rating in producer.sent] == [('film_1', 8), ('film_2', 4)]
+    assert (await service.get_rating(response.items[1].id)).rating == 4
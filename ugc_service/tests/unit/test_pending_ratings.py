@@ -0,0 +1,71 @@
+import pytest
+from beanie import PydanticObjectId
+
+from ugc_service.src.models.documents import FilmRating
+from ugc_service.src.repository import pending_ratings as pending_ratings_module
+from ugc_service.src.repository.pending_ratings import PendingRatings
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(pending_ratings_module.time, 'monotonic', lambda: now[0])
+    return now
+
+
+def make_rating(user_id: str, film_id: str, rating: int) -> FilmRating:
+    return FilmRating(id=PydanticObjectId(), user_id=user_id, film_id=film_id, rating=rating)
+
+
+def test_pending_rating_is_found_by_id_and_user(clock):
+    pending = PendingRatings(ttl=60)
+    rating = make_rating('user', 'film', 7)
+
+    pending.add(rating)
+
+    assert pending.get(str(rating.id)) is rating
+    assert pending.get_user_rating('user', 'film') is rating
+    assert pending.get_user_ratings('user') == [rating]
+    assert pending.get_user_ratings('other_user') == []
+
+
+def test_new_rating_of_same_film_replaces_pending_one(clock):
+    pending = PendingRatings(ttl=60)
+    first, second = make_rating('user', 'film', 3), make_rating('user', 'film', 9)
+
+    pending.add(first)
+    pending.add(second)
+
+    assert pending.get(str(first.id)) is None
+    assert pending.get_user_ratings('user') == [second]
+
+
+def test_expired_ratings_are_purged(clock):
+    pending = PendingRatings(ttl=60)
+    old, recent = make_rating('user', 'old_film', 3), make_rating('user', 'recent_film', 9)
+
+    pending.add(old)
+    clock[0] += 30
+    pending.add(recent)
+    clock[0] += 31
+
+    assert pending.get(str(old.id)) is None
+    assert pending.get_user_rating('user', 'old_film') is None
+    assert pending.get_user_ratings('user') == [recent]
+
+    clock[0] += 30
+    assert pending.get_user_ratings('user') == []
+    assert pending.get(str(recent.id)) is None
+
+
+def test_pending_deletion_replaces_rating(clock):
+    pending = PendingRatings(ttl=60)
+    rating = make_rating('user', 'film', 7)
+
+    pending.add(rating)
+    pending.add(rating, deleted=True)
+
+    assert pending.is_deleted(pending.get(str(rating.id)))
+
+    pending.add(make_rating('user', 'film', 4))
+    assert not pending.is_deleted(pending.get_user_rating('user', 'film'))
@@ -0,0 +1,56 @@
+import json
+from types import SimpleNamespace
+
+from ugc_service.src.rating_consumer import parse_ratings
+
+
+def make_messages(*values) -> list:
+    return [
+        SimpleNamespace(value=value if isinstance(value, bytes) else json.dumps(value).encode(), offset=offset)
+        for offset, value in enumerate(values)
+    ]
+
+
+def test_parse_ratings_keeps_last_rating_of_user_and_film():
+    messages = make_messages(
+        {'user_id': 'user', 'film_id': 'film', 'rating': 3},
+        {'user_id': 'other_user', 'film_id': 'film', 'rating': 5},
+        {'user_id': 'user', 'film_id': 'film', 'rating': 8},
+    )
+
+    ratings, deleted = parse_ratings(messages)
+
+    assert deleted == []
+    assert {(rating.user_id, rating.film_id): rating.rating for rating in ratings} == {
+        ('user', 'film'): 8,
+        ('other_user', 'film'): 5,
+    }
+
+
+def test_parse_ratings_skips_malformed_messages():
+    messages = make_messages(
+        b'{not json',
+        {'user_id': 'user', 'film_id': 'film', 'rating': 11},
+        {'user_id': 'user', 'film_id': 'film'},
+        {'user_id': 'user', 'film_id': 'film', 'rating': 4},
+    )
+
+    ratings, deleted = parse_ratings(messages)
+
+    assert [(rating.user_id, rating.film_id, rating.rating) for rating in ratings] == [('user', 'film', 4)]
+    assert deleted == []
+
+
+def test_parse_ratings_applies_deletions_in_order():
+    messages = make_messages(
+        {'user_id': 'user', 'film_id': 'deleted_film', 'rating': 3},
+        {'user_id': 'user', 'film_id': 'deleted_film', 'deleted': True},
+        {'user_id': 'user', 'film_id': 'rated_again_film', 'deleted': True},
+        {'user_id': 'user', 'film_id': 'rated_again_film', 'rating': 6},
+        {'film_id': 'film', 'deleted': True},
+    )
+
+    ratings, deleted = parse_ratings(messages)
+
+    assert [(rating.film_id, rating.rating) for rating in ratings] == [('rated_again_film', 6)]
+    assert set(deleted) == {('user', 'deleted_film'), ('user', 'rated_again_film')}